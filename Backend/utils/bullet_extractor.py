@@ -1,7 +1,59 @@
-import ollama
+import asyncio
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-def extract_bullets_with_ollama(raw_text):
-    prompt = f"""
+from Backend.utils.llm_cache import LLMResponseCache
+from Backend.utils.ollama_client import get_ollama_client
+from config import (
+    LLM_CACHE_ENABLED, LLM_CACHE_PATH, LLM_CACHE_MAX_MB,
+    BULLET_CHUNK_TOKENS, BULLET_MAX_PARALLEL, OLLAMA_NUM_CTX, OLLAMA_NUM_PREDICT,
+)
+
+BULLET_PROMPT_VERSION = "1"  # Bump when build_bullet_prompt changes, so cached bullets are not reused
+
+CHARS_PER_TOKEN = 4  # Rough average for English/Dutch text with Mistral's tokenizer
+BULLET_LINE = re.compile(r"^[-•*–]\s+(.+)$")  # One marker followed by whitespace (not **Heading**)
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_bullet_cache():
+    """Get the process-wide bullet cache, opening it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache(LLM_CACHE_PATH, max_bytes=LLM_CACHE_MAX_MB * 1024 * 1024)
+        return _cache
+
+
+def get_bullet_cache_stats():
+    """Get hit/miss metrics of the bullet cache."""
+    return get_bullet_cache().stats()
+
+
+def _cache_key(raw_text):
+    client = get_ollama_client()
+    return LLMResponseCache.make_key(raw_text, client.model, BULLET_PROMPT_VERSION, client.cache_options)
+
+
+def _cached_bullets(raw_text, use_cache):
+    """Cache key and cached bullets (None on a miss or when the cache is bypassed)."""
+    if not (use_cache and LLM_CACHE_ENABLED):
+        return None, None
+    key = _cache_key(raw_text)
+    return key, get_bullet_cache().get(key)
+
+
+def _store_bullets(key, bullets):
+    if key is not None and bullets:
+        get_bullet_cache().put(key, bullets)
+
+
+def build_bullet_prompt(raw_text):
+    """Build the bullet-extraction prompt for a raw CV text."""
+    return f"""
     You will receive raw text extracted from a CV. This text may be messy, contain headings,
     long lines, or irrelevant information.
 
@@ -29,9 +81,240 @@ def extract_bullets_with_ollama(raw_text):
     {raw_text}
     """
 
-    response = ollama.generate(
-        model="mistral",   # or "llama3.1"
-        prompt=prompt
-    )
 
-    return response["response"]
+def extract_bullets_with_ollama(raw_text, use_cache=True):
+    """
+    Rewrite raw CV text into bullet points.
+    Repeat uploads of the same CV are answered from the LLM cache; pass
+    use_cache=False (or set LLM_CACHE_ENABLED=False) to always call Ollama.
+    """
+    key, cached = _cached_bullets(raw_text, use_cache)
+    if cached is not None:
+        return cached
+
+    response = get_ollama_client().generate(build_bullet_prompt(raw_text))
+
+    _store_bullets(key, response)
+    return response
+
+
+async def extract_bullets_with_ollama_async(raw_text, use_cache=True):
+    """
+    Async version of extract_bullets_with_ollama.
+    Uses Ollama's async HTTP client, so the event loop is not blocked while
+    the model generates.
+    """
+    key, cached = _cached_bullets(raw_text, use_cache)
+    if cached is not None:
+        return cached
+
+    response = await get_ollama_client().agenerate(build_bullet_prompt(raw_text))
+
+    _store_bullets(key, response)
+    return response
+
+
+def stream_bullets_with_ollama(raw_text, use_cache=True):
+    """
+    Streaming version of extract_bullets_with_ollama.
+    Yields the bullet text chunk by chunk as the model generates it; a cached
+    result is yielded as a single chunk. Only complete generations are cached.
+    """
+    key, cached = _cached_bullets(raw_text, use_cache)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    for chunk in get_ollama_client().stream(build_bullet_prompt(raw_text)):
+        parts.append(chunk)
+        yield chunk
+
+    _store_bullets(key, "".join(parts))
+
+
+async def stream_bullets_with_ollama_async(raw_text, use_cache=True):
+    """
+    Async streaming version of extract_bullets_with_ollama.
+    Yields the bullet text chunk by chunk without blocking the event loop.
+    """
+    key, cached = _cached_bullets(raw_text, use_cache)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    async for chunk in get_ollama_client().astream(build_bullet_prompt(raw_text)):
+        parts.append(chunk)
+        yield chunk
+
+    _store_bullets(key, "".join(parts))
+
+
+def estimate_tokens(text):
+    """Approximate token count of a text."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def chunk_token_budget():
+    """
+    Tokens of CV text per request: BULLET_CHUNK_TOKENS, or by default what
+    fits in the context window next to the prompt and the generated bullets.
+    """
+    if BULLET_CHUNK_TOKENS:
+        return BULLET_CHUNK_TOKENS
+    return max(1, OLLAMA_NUM_CTX - OLLAMA_NUM_PREDICT - estimate_tokens(build_bullet_prompt("")))
+
+
+def split_cv_text(raw_text, max_tokens=None):
+    """
+    Split raw CV text into chunks within a token budget (chunk_token_budget() by default).
+    Breaks at blank lines (sections / pages) where possible, then at lines,
+    and only splits inside a line if that line alone exceeds the budget.
+    """
+    max_chars = (max_tokens or chunk_token_budget()) * CHARS_PER_TOKEN
+
+    pieces = []
+    for block in re.split(r"\n\s*\n", raw_text):
+        block = block.strip()
+        if not block:
+            continue
+        if len(block) <= max_chars:
+            pieces.append(block)
+            continue
+        for line in block.splitlines():
+            line = line.strip()
+            while len(line) > max_chars:
+                cut = line.rfind(" ", 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                pieces.append(line[:cut])
+                line = line[cut:].strip()
+            if line:
+                pieces.append(line)
+
+    chunks = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(piece) + 2 > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _bullet_lines(response):
+    """Bullet points of one response (all non-empty lines if it has no bullet markers)."""
+    lines = [line.strip() for line in response.splitlines() if line.strip()]
+    bullets = [match.group(1).strip() for match in map(BULLET_LINE.match, lines) if match]
+    return bullets or lines
+
+
+def merge_bullets(responses, seen=None):
+    """
+    Merge the bullet points of several responses, dropping duplicates.
+
+    Args:
+        responses: Model responses, in document order
+        seen: Optional set of normalized bullets already emitted (updated in place)
+
+    Returns:
+        Merged bullets as "- ..." lines
+    """
+    seen = set() if seen is None else seen
+    merged = []
+    for response in responses:
+        for bullet in _bullet_lines(response):
+            key = re.sub(r"[^a-z0-9]+", " ", bullet.lower()).strip()
+            if key and key not in seen:
+                seen.add(key)
+                merged.append(f"- {bullet}\n")
+    return "".join(merged)
+
+
+def _end_of_streamed_chunk(streamed, seen):
+    """
+    Record the bullets of the token-streamed first chunk as seen and return
+    the separator needed before the merged bullets of the next chunks.
+    """
+    merge_bullets([streamed], seen)
+    return "" if not streamed or streamed.endswith("\n") else "\n"
+
+
+def stream_bullets_chunked(raw_text, max_tokens=None,
+                           max_parallel=BULLET_MAX_PARALLEL, use_cache=True):
+    """
+    Map-reduce bullet extraction for CVs longer than the context budget.
+    Texts that fit in one request are streamed token by token as usual.
+    Longer texts are split into chunks: the first chunk is streamed token by
+    token while the others are sent to Ollama concurrently (at most
+    max_parallel requests at a time); the deduplicated bullets of each later
+    chunk are yielded in document order as soon as it and all chunks before
+    it are done.
+    """
+    chunks = split_cv_text(raw_text, max_tokens)
+    if len(chunks) <= 1:
+        yield from stream_bullets_with_ollama(raw_text, use_cache)
+        return
+
+    seen = set()
+    workers = max(1, min(max_parallel - 1, len(chunks) - 1))
+    executor = ThreadPoolExecutor(workers, thread_name_prefix="bullet-chunk")
+    try:
+        futures = [executor.submit(extract_bullets_with_ollama, chunk, use_cache) for chunk in chunks[1:]]
+        streamed = ""
+        for part in stream_bullets_with_ollama(chunks[0], use_cache):
+            streamed += part
+            yield part
+        separator = _end_of_streamed_chunk(streamed, seen)
+        for future in futures:
+            merged = merge_bullets([future.result()], seen)
+            if merged:
+                yield separator + merged
+                separator = ""
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_bullets_chunked(raw_text, max_tokens=None,
+                            max_parallel=BULLET_MAX_PARALLEL, use_cache=True):
+    """Blocking version of stream_bullets_chunked; returns the merged bullets."""
+    return "".join(stream_bullets_chunked(raw_text, max_tokens, max_parallel, use_cache))
+
+
+async def stream_bullets_chunked_async(raw_text, max_tokens=None,
+                                       max_parallel=BULLET_MAX_PARALLEL, use_cache=True):
+    """
+    Async version of stream_bullets_chunked.
+    """
+    chunks = split_cv_text(raw_text, max_tokens)
+    if len(chunks) <= 1:
+        async for chunk in stream_bullets_with_ollama_async(raw_text, use_cache):
+            yield chunk
+        return
+
+    # One request slot is taken by the streamed first chunk
+    semaphore = asyncio.Semaphore(max(1, max_parallel - 1))
+
+    async def extract(chunk):
+        async with semaphore:
+            return await extract_bullets_with_ollama_async(chunk, use_cache)
+
+    seen = set()
+    tasks = [asyncio.ensure_future(extract(chunk)) for chunk in chunks[1:]]
+    try:
+        streamed = ""
+        async for part in stream_bullets_with_ollama_async(chunks[0], use_cache):
+            streamed += part
+            yield part
+        separator = _end_of_streamed_chunk(streamed, seen)
+        for task in tasks:
+            merged = merge_bullets([await task], seen)
+            if merged:
+                yield separator + merged
+                separator = ""
+    finally:
+        for task in tasks:
+            task.cancel()
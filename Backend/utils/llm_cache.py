@@ -0,0 +1,166 @@
+"""
+LLM Response Cache
+Persistent SQLite cache of LLM completions keyed by normalized input text,
+model, prompt version and generation options, with size-based eviction
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# Configuration
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+EVICTION_TARGET = 0.9  # After eviction the cache holds at most this share of max_bytes
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so re-extracted PDFs with different line breaks share a key."""
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+class LLMResponseCache:
+    """
+    Caches LLM responses on disk.
+
+    Entries are evicted least recently used first once the stored responses
+    exceed max_bytes. Safe to share between threads.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Open (or create) the cache.
+
+        Args:
+            path: SQLite file of the cache
+            max_bytes: Maximum total size of the stored responses
+        """
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(text: str, model: str, prompt_version: str, options: Optional[Dict] = None) -> str:
+        """
+        Build the cache key of a completion.
+
+        Args:
+            text: Input text (normalized before hashing)
+            model: LLM model name
+            prompt_version: Version of the prompt template
+            options: Generation options that change the output
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        digest = hashlib.sha256()
+        for part in (model, prompt_version, json.dumps(options or {}, sort_keys=True), normalize_text(text)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str):
+        """Store a response and evict old entries if the cache is over its size."""
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now)
+            )
+            self.stores += 1
+            self._evict()
+            self._conn.commit()
+
+    def _total_bytes(self) -> int:
+        """Total size of the stored responses. Caller holds the lock."""
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _evict(self):
+        """Drop least recently used entries down to the eviction target. Caller holds the lock."""
+        total = self._total_bytes()
+        if total <= self.max_bytes:
+            return
+
+        target = self.max_bytes * EVICTION_TARGET
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= target:
+                break
+            doomed.append((key,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+
+    def stats(self) -> Dict:
+        """Get hit/miss counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "entries": self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0],
+                "total_bytes": self._total_bytes(),
+                "max_bytes": self.max_bytes,
+                "path": self.path,
+            }
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
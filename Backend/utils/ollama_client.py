@@ -0,0 +1,235 @@
+"""
+Ollama Client
+One configured, reusable Ollama client per process: pooled HTTP
+connections, keep-alive, model options, warm-up and latency metrics
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+import ollama
+
+from config import (
+    OLLAMA_HOST, OLLAMA_MODEL, OLLAMA_KEEP_ALIVE,
+    OLLAMA_NUM_CTX, OLLAMA_NUM_PREDICT, OLLAMA_NUM_THREAD,
+)
+
+# Options that do not change the generated text (left out of cache keys)
+RUNTIME_ONLY_OPTIONS = ("num_thread",)
+
+
+class LatencyStats:
+    """Thread-safe call counter with latency totals (seconds)."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, error: bool = False):
+        """Record one call."""
+        with self._lock:
+            self.calls += 1
+            self.errors += int(error)
+            self.total += seconds
+            self.max = max(self.max, seconds)
+            self.last = seconds
+
+    def snapshot(self) -> Dict:
+        """Get the counters and mean/max/last latency in milliseconds."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "mean_ms": round(self.total / self.calls * 1000, 1) if self.calls else 0.0,
+                "max_ms": round(self.max * 1000, 1),
+                "last_ms": round(self.last * 1000, 1),
+            }
+
+
+class OllamaGenerator:
+    """
+    Configured Ollama text generation client.
+
+    Reuses one HTTP client (and its connection pool) for all calls, sends the
+    same model, keep_alive and options with every request so the model stays
+    loaded between requests, and records per-call latency, time to first
+    token and model load time reported by the server.
+    """
+
+    def __init__(self, host: Optional[str] = OLLAMA_HOST, model: str = OLLAMA_MODEL,
+                 keep_alive=OLLAMA_KEEP_ALIVE, options: Optional[Dict] = None):
+        """
+        Args:
+            host: Ollama server URL (e.g. a local stub server in tests)
+            model: Model to generate with
+            keep_alive: How long the server keeps the model loaded ("30m", seconds, -1 = forever)
+            options: Model options (defaults to the num_ctx/num_predict/num_thread settings)
+        """
+        self.host = host
+        self.model = model
+        self.keep_alive = keep_alive
+        if options is None:
+            options = {"num_ctx": OLLAMA_NUM_CTX, "num_predict": OLLAMA_NUM_PREDICT}
+            if OLLAMA_NUM_THREAD:
+                options["num_thread"] = OLLAMA_NUM_THREAD
+        self.options = options
+
+        self.client = ollama.Client(host=host)
+        self._async_client = None
+        self._async_loop = None
+        self._async_lock = threading.Lock()
+
+        self.latency = LatencyStats()
+        self.first_token = LatencyStats()
+        self.load_seconds = 0.0
+        self.warmed_up = False
+
+    @property
+    def cache_options(self) -> Dict:
+        """Options that affect the output, for use in cache keys."""
+        return {k: v for k, v in self.options.items() if k not in RUNTIME_ONLY_OPTIONS}
+
+    def _request(self, prompt: str, stream: bool = False) -> Dict:
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": self.options,
+            "keep_alive": self.keep_alive,
+        }
+
+    def _record_load(self, response):
+        """Keep the model load time the server reported for a request (ns)."""
+        load_duration = getattr(response, "load_duration", None)
+        if load_duration:
+            self.load_seconds += load_duration / 1e9
+
+    def _get_async_client(self):
+        """Async client bound to the running event loop (httpx pools are per loop)."""
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            if self._async_client is None or self._async_loop is not loop:
+                self._async_client = ollama.AsyncClient(host=self.host)
+                self._async_loop = loop
+            return self._async_client
+
+    def generate(self, prompt: str) -> str:
+        """Generate a full completion."""
+        started = time.perf_counter()
+        try:
+            response = self.client.generate(**self._request(prompt))
+        except Exception:
+            self.latency.observe(time.perf_counter() - started, error=True)
+            raise
+        self.latency.observe(time.perf_counter() - started)
+        self._record_load(response)
+        return response["response"]
+
+    def stream(self, prompt: str):
+        """Generate a completion, yielding text chunks as they arrive."""
+        started = time.perf_counter()
+        first = True
+        try:
+            for chunk in self.client.generate(**self._request(prompt, stream=True)):
+                if first:
+                    self.first_token.observe(time.perf_counter() - started)
+                    first = False
+                self._record_load(chunk)
+                yield chunk["response"]
+        except Exception:
+            self.latency.observe(time.perf_counter() - started, error=True)
+            raise
+        self.latency.observe(time.perf_counter() - started)
+
+    async def agenerate(self, prompt: str) -> str:
+        """Async version of generate()."""
+        started = time.perf_counter()
+        try:
+            response = await self._get_async_client().generate(**self._request(prompt))
+        except Exception:
+            self.latency.observe(time.perf_counter() - started, error=True)
+            raise
+        self.latency.observe(time.perf_counter() - started)
+        self._record_load(response)
+        return response["response"]
+
+    async def astream(self, prompt: str):
+        """Async version of stream()."""
+        started = time.perf_counter()
+        first = True
+        try:
+            async for chunk in await self._get_async_client().generate(**self._request(prompt, stream=True)):
+                if first:
+                    self.first_token.observe(time.perf_counter() - started)
+                    first = False
+                self._record_load(chunk)
+                yield chunk["response"]
+        except Exception:
+            self.latency.observe(time.perf_counter() - started, error=True)
+            raise
+        self.latency.observe(time.perf_counter() - started)
+
+    def warm_up(self) -> bool:
+        """
+        Load the model on the server ahead of the first request.
+        An empty prompt makes Ollama load the model without generating.
+
+        Returns:
+            True if the server answered
+        """
+        started = time.perf_counter()
+        try:
+            response = self.client.generate(model=self.model, prompt="", keep_alive=self.keep_alive)
+        except Exception as e:
+            print(f"WARNING: Ollama warm-up failed: {e}")
+            return False
+        self._record_load(response)
+        self.warmed_up = True
+        print(f"✓ Ollama model '{self.model}' warmed up in {time.perf_counter() - started:.2f}s")
+        return True
+
+    def stats(self) -> Dict:
+        """Get latency metrics and the client configuration."""
+        return {
+            "host": self.host,
+            "model": self.model,
+            "keep_alive": self.keep_alive,
+            "options": dict(self.options),
+            "warmed_up": self.warmed_up,
+            "model_load_seconds": round(self.load_seconds, 3),
+            "latency": self.latency.snapshot(),
+            "first_token": self.first_token.snapshot(),
+        }
+
+
+_client: Optional[OllamaGenerator] = None
+_client_lock = threading.Lock()
+
+
+def get_ollama_client() -> OllamaGenerator:
+    """Get the process-wide Ollama client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OllamaGenerator()
+        return _client
+
+
+def warm_up_ollama(background: bool = True):
+    """
+    Warm up the shared client's model at startup.
+
+    Args:
+        background: Run in a daemon thread so startup is not blocked
+    """
+    if background:
+        threading.Thread(target=lambda: get_ollama_client().warm_up(),
+                         name="ollama-warm-up", daemon=True).start()
+    else:
+        get_ollama_client().warm_up()
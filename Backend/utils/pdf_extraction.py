@@ -0,0 +1,250 @@
+"""
+PDF Text Extraction
+Shared PDF-to-text extraction for resume ingestion and CV uploads, with a
+persistent cache keyed by the SHA-256 of the PDF bytes and the extractor
+version, so unchanged files are parsed only once
+"""
+
+import hashlib
+import io
+import sqlite3
+import threading
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import PyPDF2
+    HAS_PYPDF2 = True
+except ImportError:
+    HAS_PYPDF2 = False
+
+try:
+    import pdfplumber
+    HAS_PDFPLUMBER = True
+except ImportError:
+    HAS_PDFPLUMBER = False
+
+# Configuration
+EXTRACTOR_VERSION = "1"  # Bump when the extracted text changes for the same PDF
+DEFAULT_MAX_PAGES = 20
+DEFAULT_MAX_ENTRIES = 50000
+EVICT_EVERY = 100  # Stores between eviction passes
+
+
+def pdf_digest(data: bytes) -> str:
+    """SHA-256 of the PDF bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def extraction_methods(use_pdfplumber: bool = True) -> List[str]:
+    """Installed extraction libraries in the order they are tried."""
+    methods = []
+    if use_pdfplumber and HAS_PDFPLUMBER:
+        methods.append("pdfplumber")
+    if HAS_PYPDF2:
+        methods.append("pypdf2")
+    if not methods:
+        raise ImportError("Neither PyPDF2 nor pdfplumber installed. Install with: pip install PyPDF2 pdfplumber")
+    return methods
+
+
+def _page_texts(pages, max_pages: int) -> Optional[str]:
+    """Join the text of the first max_pages pages (unreadable pages are skipped)."""
+    text_parts = []
+    for page in islice(pages, max_pages):
+        try:
+            text = page.extract_text()
+        except MemoryError:
+            raise
+        except Exception:
+            continue
+        if text:
+            text_parts.append(text)
+    return "\n".join(text_parts) if text_parts else None
+
+
+def extract_text_pdfplumber(data: bytes, max_pages: int = DEFAULT_MAX_PAGES) -> Optional[str]:
+    """Extract text using pdfplumber (better for formatted PDFs)."""
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return _page_texts(pdf.pages, max_pages)
+
+
+def extract_text_pypdf2(data: bytes, max_pages: int = DEFAULT_MAX_PAGES) -> Optional[str]:
+    """Extract text using PyPDF2 (fallback method)."""
+    return _page_texts(PyPDF2.PdfReader(io.BytesIO(data)).pages, max_pages)
+
+
+_extractors = {"pdfplumber": extract_text_pdfplumber, "pypdf2": extract_text_pypdf2}
+
+
+def extract_text(data: bytes, max_pages: int = DEFAULT_MAX_PAGES, use_pdfplumber: bool = True) -> Optional[str]:
+    """
+    Extract text from PDF bytes using the best available method.
+
+    Args:
+        data: PDF file content
+        max_pages: Only the first pages of longer PDFs are read
+        use_pdfplumber: Try pdfplumber before PyPDF2 if it is installed
+
+    Returns:
+        Extracted text, or None if the PDF has no text (e.g. scanned images)
+
+    Raises:
+        The last parser error if every method failed to open the PDF
+    """
+    error = None
+    for method in extraction_methods(use_pdfplumber):
+        try:
+            text = _extractors[method](data, max_pages)
+        except MemoryError:
+            raise
+        except Exception as e:
+            error = e
+            continue
+        if text:
+            return text
+        error = None  # The PDF was readable, it just has no text
+    if error is not None:
+        raise error
+    return None
+
+
+class ExtractionCache:
+    """
+    SQLite cache of extracted text by key. Safe to share between threads;
+    worker processes open their own instance on the same file.
+    """
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            path: SQLite file of the cache
+            max_entries: Least recently used entries above this number are evicted
+        """
+        self.path = str(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._stores = 0
+
+        self.hits = 0
+        self.misses = 0
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")  # Extraction workers write concurrently
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS texts ("
+            "key TEXT PRIMARY KEY, text TEXT, last_access REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Tuple[bool, Optional[str]]:
+        """
+        Look up a key.
+
+        Returns:
+            (found, text) - text is None for PDFs known to have no text
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM texts WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            self._conn.execute("UPDATE texts SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return True, row[0]
+
+    def put(self, key: str, text: Optional[str]):
+        """Store the extracted text (None = no text) of a key."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO texts (key, text, last_access) VALUES (?, ?, ?)",
+                (key, text, time.time())
+            )
+            self._stores += 1
+            if self._stores % EVICT_EVERY == 0:
+                self._conn.execute(
+                    "DELETE FROM texts WHERE key NOT IN "
+                    "(SELECT key FROM texts ORDER BY last_access DESC LIMIT ?)",
+                    (self.max_entries,)
+                )
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        """Get hit/miss counters and the number of entries."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM texts").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class PdfTextExtractor:
+    """
+    Cached extraction with fixed settings.
+
+    The cache key is the SHA-256 of the PDF bytes, EXTRACTOR_VERSION, the
+    methods tried and the page cap, so changing any of them re-extracts.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, max_pages: int = DEFAULT_MAX_PAGES,
+                 use_pdfplumber: bool = True):
+        """
+        Args:
+            cache_path: SQLite file of the cache (None = no caching)
+            max_pages: Only the first pages of longer PDFs are read
+            use_pdfplumber: Try pdfplumber before PyPDF2 if it is installed
+        """
+        self.max_pages = max_pages
+        self.use_pdfplumber = use_pdfplumber
+        self.methods = extraction_methods(use_pdfplumber)
+        self.cache = ExtractionCache(cache_path) if cache_path else None
+
+    def key(self, digest: str) -> str:
+        """Cache key of a PDF digest under the current settings."""
+        return f"{digest}|v{EXTRACTOR_VERSION}|{'+'.join(self.methods)}|p{self.max_pages}"
+
+    def lookup(self, digest: str) -> Tuple[bool, Optional[str]]:
+        """Cached text of a PDF digest as (found, text)."""
+        if self.cache is None:
+            return False, None
+        return self.cache.get(self.key(digest))
+
+    def store(self, digest: str, text: Optional[str]):
+        """Cache the text of a PDF digest."""
+        if self.cache is not None:
+            self.cache.put(self.key(digest), text)
+
+    def extract_uncached(self, data: bytes) -> Optional[str]:
+        """Parse the PDF with these settings, bypassing the cache."""
+        return extract_text(data, self.max_pages, self.use_pdfplumber)
+
+    def extract(self, data: bytes, digest: Optional[str] = None) -> Optional[str]:
+        """
+        Extract text, from the cache when the same PDF was extracted before.
+
+        Args:
+            data: PDF file content
+            digest: pdf_digest(data), if already computed
+
+        Returns:
+            Extracted text, or None if the PDF has no text
+        """
+        digest = digest or pdf_digest(data)
+        found, text = self.lookup(digest)
+        if found:
+            return text
+        text = self.extract_uncached(data)
+        self.store(digest, text)
+        return text
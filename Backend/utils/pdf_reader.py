@@ -1,20 +1,138 @@
-import PyPDF2
+import multiprocessing
+import os
+import queue
+import threading
+
+from config import (
+    PDF_EXTRACT_TIMEOUT_SECONDS, PDF_EXTRACT_MEMORY_MB, PDF_MAX_PAGES,
+    PDF_EXTRACT_WORKERS, PDF_QUARANTINE_PATH, PDF_TEXT_CACHE_ENABLED, PDF_TEXT_CACHE_PATH,
+)
+from Backend.utils.pdf_extraction import PdfTextExtractor, extract_text, pdf_digest
+from Backend.utils.supervisor import SupervisedWorkers, Quarantine
+
+
+class PdfExtractionError(RuntimeError):
+    """A PDF could not be read within the time, memory and page limits."""
+
+
+def _read_source(source) -> bytes:
+    """Raw bytes of a path (str / Path), bytes or binary file-like object."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, "read"):
+        position = source.tell()
+        data = source.read()
+        source.seek(position)
+        return data
+    with open(os.fspath(source), "rb") as f:
+        return f.read()
+
+
+def _extract_task(task):
+    """Worker side: text of the first max_pages pages of a PDF given as bytes."""
+    data, max_pages = task
+    return extract_text(data, max_pages)
+
+
+# The app process already runs threads (executors, embedding dispatcher, asyncio), so
+# workers come from a fork server started by exec instead of forking the app itself.
+# Preloading __main__ and this module lets new workers start without re-importing them.
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+FORKSERVER_PRELOAD = ["__main__", __name__]
+
+# One single-worker supervisor per concurrent extraction; workers stay up between requests
+_supervisors = None
+_supervisors_lock = threading.Lock()
+_quarantine = None
+_text_extractors = {}
+
+
+def _get_supervisors() -> "queue.Queue":
+    global _supervisors
+    with _supervisors_lock:
+        if _supervisors is None:
+            if START_METHOD == "forkserver":
+                multiprocessing.get_context(START_METHOD).set_forkserver_preload(FORKSERVER_PRELOAD)
+            _supervisors = queue.Queue()
+            for _ in range(PDF_EXTRACT_WORKERS):
+                _supervisors.put(SupervisedWorkers(
+                    _extract_task, timeout=PDF_EXTRACT_TIMEOUT_SECONDS, memory_mb=PDF_EXTRACT_MEMORY_MB,
+                    start_method=START_METHOD
+                ))
+        return _supervisors
+
+
+def get_quarantine() -> Quarantine:
+    """Get the list of PDFs that failed extraction."""
+    global _quarantine
+    with _supervisors_lock:
+        if _quarantine is None:
+            _quarantine = Quarantine(PDF_QUARANTINE_PATH)
+        return _quarantine
+
+
+def get_text_extractor(max_pages: int = PDF_MAX_PAGES) -> PdfTextExtractor:
+    """Get the cached extractor for a page cap (same cache file as resume ingestion)."""
+    with _supervisors_lock:
+        if max_pages not in _text_extractors:
+            _text_extractors[max_pages] = PdfTextExtractor(
+                PDF_TEXT_CACHE_PATH if PDF_TEXT_CACHE_ENABLED else None, max_pages=max_pages
+            )
+        return _text_extractors[max_pages]
+
+
+def extract_pdf_text(source, max_pages: int = PDF_MAX_PAGES):
+    """
+    Extracts the text of a PDF CV without writing any intermediate file.
+    Works for any PDF that contains real text (not scanned images).
+
+    Parsing runs in a supervised worker process with a wall-clock timeout
+    and a memory cap, so a malformed or huge PDF cannot stall the caller.
+    PDFs that exceed the memory cap or that the parsers cannot read are
+    quarantined and rejected immediately when uploaded again; a timeout may
+    be caused by server load, so it is reported without quarantining. The
+    text of PDFs read before (uploaded or ingested) comes from the cache.
+
+    source: path (str / Path), raw PDF bytes, or a binary file-like object.
+    max_pages: only the first pages of longer PDFs are read.
+
+    Raises PdfExtractionError if the PDF cannot be read within the limits.
+    """
+    data = _read_source(source)
+    digest = pdf_digest(data)
+    name = os.fspath(source) if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "upload")
+
+    reason = get_quarantine().reason_for(digest)
+    if reason is not None:
+        raise PdfExtractionError(f"This PDF could not be read earlier ({reason})")
+
+    text_extractor = get_text_extractor(max_pages)
+    found, text = text_extractor.lookup(digest)
+    if found:
+        return text or ""
+
+    supervisors = _get_supervisors()
+    supervisor = supervisors.get()
+    try:
+        result = supervisor.run((data, max_pages))
+    finally:
+        supervisors.put(supervisor)
+
+    if result.timed_out:
+        raise PdfExtractionError(f"Reading the PDF took too long ({result.error}), please try again")
+    if result.error is not None:
+        get_quarantine().add(digest, name, result.error)
+        raise PdfExtractionError(f"Could not read the PDF: {result.error}")
+    text_extractor.store(digest, result.value)
+    return result.value or ""
+
 
 def pdf_to_text(pdf_path, output_txt_path):
     """
     Converts a PDF CV to a .txt file.
     Works for any PDF that contains real text (not scanned images).
     """
-    reader = PyPDF2.PdfReader(pdf_path)
-    full_text = ""
-
-    for page in reader.pages:
-        try:
-            page_text = page.extract_text()
-            if page_text:
-                full_text += page_text + "\n"
-        except:
-            pass
+    full_text = extract_pdf_text(pdf_path)
 
     with open(output_txt_path, "w", encoding="utf-8") as f:
         f.write(full_text)
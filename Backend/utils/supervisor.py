@@ -0,0 +1,300 @@
+"""
+Supervised Workers
+Runs a function over tasks in child processes with a per-task wall-clock
+timeout and an optional memory cap; hung or crashed workers are killed
+and replaced, and failed inputs can be recorded in a quarantine list
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, NamedTuple, Optional
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:  # Windows: no address-space limits
+    HAS_RESOURCE = False
+
+# Configuration
+DEFAULT_TIMEOUT_SECONDS = 30.0
+KILL_GRACE_SECONDS = 1.0
+
+
+class TaskResult(NamedTuple):
+    """Outcome of one task (error is None on success)."""
+    task: Any
+    value: Any
+    error: Optional[str]
+    seconds: float
+    timed_out: bool = False  # The error is the wall-clock timeout (may depend on load)
+
+
+def _address_space_bytes() -> int:
+    """Current virtual memory size of this process (0 if unknown)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def _limit_memory(memory_mb: Optional[int]):
+    """
+    Cap the worker's address space at its size at start plus memory_mb,
+    so allocations beyond the cap raise MemoryError inside the worker.
+    """
+    if not memory_mb or not HAS_RESOURCE:
+        return
+    limit = _address_space_bytes() + memory_mb * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _worker_main(conn, func: Callable, initializer: Optional[Callable], memory_mb: Optional[int]):
+    """Worker loop: receive chunks of tasks, send back one (value, error, seconds) per task."""
+    _limit_memory(memory_mb)
+    if initializer is not None:
+        initializer()
+
+    while True:
+        try:
+            chunk = conn.recv()
+        except EOFError:
+            return
+        if chunk is None:
+            return
+        for task in chunk:
+            started = time.perf_counter()
+            try:
+                value, error = func(task), None
+            except MemoryError:
+                value, error = None, f"memory limit exceeded ({memory_mb} MB)"
+            except Exception as e:
+                value, error = None, f"{type(e).__name__}: {e}"
+            conn.send((value, error, time.perf_counter() - started))
+
+
+class _Worker:
+    """One child process and the tasks it has been sent."""
+
+    def __init__(self, context, func, initializer, memory_mb):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn, func, initializer, memory_mb), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.pending = deque()  # (index, task) sent and not answered yet, in order
+        self.deadline = None
+
+    def kill(self):
+        """Stop the process, forcefully if it does not react."""
+        self.process.terminate()
+        self.process.join(KILL_GRACE_SECONDS)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+    def close(self):
+        """Ask the process to exit after its current work."""
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(KILL_GRACE_SECONDS)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class SupervisedWorkers:
+    """
+    Pool of supervised worker processes.
+
+    Every task gets `timeout` seconds from the moment its worker starts on
+    it. A worker that exceeds the timeout or dies is killed and replaced;
+    its current task is reported as failed and the rest of its chunk is
+    sent again. Results stream back as they complete, or in task order.
+
+    Workers are forked by default, which is only safe from a process that
+    has not started any threads yet (e.g. an offline script). Long-running
+    threaded processes should pass start_method="forkserver" or "spawn".
+    """
+
+    def __init__(self, func: Callable, workers: int = 1, timeout: float = DEFAULT_TIMEOUT_SECONDS,
+                 memory_mb: Optional[int] = None, initializer: Optional[Callable] = None,
+                 start_method: Optional[str] = None):
+        """
+        Args:
+            func: Module-level function called with each task
+            workers: Number of worker processes
+            timeout: Wall-clock seconds allowed per task
+            memory_mb: Memory a worker may allocate on top of its start size (None = no cap)
+            initializer: Module-level function run once in each new worker
+            start_method: multiprocessing start method (None = "fork", or "spawn" on Windows)
+        """
+        self.func = func
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.initializer = initializer
+        self._context = multiprocessing.get_context(start_method or ("fork" if HAS_RESOURCE else "spawn"))
+        self._idle = []  # Started workers kept between imap() calls
+
+        self.restarts = 0
+
+    def _start_worker(self) -> _Worker:
+        return _Worker(self._context, self.func, self.initializer, self.memory_mb)
+
+    def imap(self, tasks: Iterable, chunksize: int = 1, ordered: bool = False) -> Iterator[TaskResult]:
+        """
+        Run func over tasks.
+
+        Args:
+            tasks: Task arguments
+            chunksize: Tasks sent to a worker at once
+            ordered: Yield results in task order instead of completion order
+
+        Yields:
+            TaskResult per task
+        """
+        tasks = list(enumerate(tasks))
+        queue = deque(tasks[i:i + chunksize] for i in range(0, len(tasks), max(1, chunksize)))
+        busy = []
+        done: Dict[int, TaskResult] = {}
+        next_index = 0
+
+        try:
+            while queue or busy:
+                # Hand out chunks to idle (or new) workers
+                while queue and len(busy) < self.workers:
+                    worker = self._idle.pop() if self._idle else self._start_worker()
+                    chunk = queue.popleft()
+                    worker.conn.send([task for _, task in chunk])
+                    worker.pending.extend(chunk)
+                    worker.deadline = time.monotonic() + self.timeout
+                    busy.append(worker)
+
+                now = time.monotonic()
+                ready = wait([w.conn for w in busy], timeout=max(0.0, min(w.deadline for w in busy) - now))
+                now = time.monotonic()
+
+                finished = []
+                for worker in list(busy):
+                    index, task = worker.pending[0]
+                    if worker.conn in ready:
+                        try:
+                            value, error, seconds = worker.conn.recv()
+                        except (EOFError, OSError):
+                            worker.process.join(KILL_GRACE_SECONDS)
+                            error = f"worker crashed (exit code {worker.process.exitcode})"
+                            seconds = now - (worker.deadline - self.timeout)
+                            finished.append((index, TaskResult(task, None, error, seconds)))
+                            self._replace(worker, busy, queue)
+                            continue
+                        finished.append((index, TaskResult(task, value, error, seconds)))
+                        worker.pending.popleft()
+                        worker.deadline = now + self.timeout
+                        if not worker.pending:
+                            busy.remove(worker)
+                            self._idle.append(worker)
+                    elif now >= worker.deadline:
+                        error = f"timed out after {self.timeout:g}s"
+                        finished.append((index, TaskResult(task, None, error, self.timeout, timed_out=True)))
+                        self._replace(worker, busy, queue)
+
+                for index, result in finished:
+                    if ordered:
+                        done[index] = result
+                    else:
+                        yield result
+                while next_index in done:
+                    yield done.pop(next_index)
+                    next_index += 1
+        finally:
+            # Abandoned iteration: workers still busy cannot be reused
+            for worker in busy:
+                worker.kill()
+
+    def _replace(self, worker: _Worker, busy: list, queue: deque):
+        """Kill a failed worker and re-queue the rest of its chunk."""
+        worker.pending.popleft()
+        if worker.pending:
+            queue.appendleft(list(worker.pending))
+        busy.remove(worker)
+        worker.kill()
+        self.restarts += 1
+
+    def run(self, task) -> TaskResult:
+        """Run func on a single task."""
+        return next(self.imap([task]))
+
+    def close(self):
+        """Stop the idle workers."""
+        while self._idle:
+            self._idle.pop().close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Quarantine:
+    """
+    Append-only JSON-lines list of inputs that failed supervised processing,
+    keyed by content digest so a file is recognized under any name.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: JSON-lines file of the quarantine list
+        """
+        self.path = Path(path)
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            self._entries = {}
+            if self.path.exists():
+                with open(self.path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            self._entries[entry["digest"]] = entry
+        return self._entries
+
+    def reason_for(self, digest: str) -> Optional[str]:
+        """Why a digest was quarantined, or None if it was not."""
+        with self._lock:
+            entry = self._load().get(digest)
+            return entry["reason"] if entry else None
+
+    def __contains__(self, digest: str) -> bool:
+        return self.reason_for(digest) is not None
+
+    def add(self, digest: str, name: str, reason: str):
+        """Record a failed input."""
+        entry = {"digest": digest, "name": name, "reason": reason, "time": time.time()}
+        with self._lock:
+            self._load()[digest] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
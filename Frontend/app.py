@@ -11,7 +11,9 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 # Import service functions
-from services.cv_processor import process_cv
+from services.cv_processor import aiter_process_cv
+from Backend.utils.ollama_client import warm_up_ollama
+from config import MAX_CONCURRENT_REQUESTS, OLLAMA_WARM_UP
 
 
 # Gradio UI with custom CSS
@@ -101,13 +103,21 @@ with gr.Blocks(title="AI Career Coach", css=custom_css, theme=gr.themes.Soft())
     </center>
     """)
 
-    # Button logic
+    # Button logic (async generator: bullets stream in as Ollama generates them and each
+    # analysis tab updates when its stage finishes, without holding a worker thread)
     submit_btn.click(
-        process_cv,
+        aiter_process_cv,
         inputs=[pdf_input, job_input],
-        outputs=[output_text, download_btn, improvement_output, interview_output]
+        outputs=[output_text, download_btn, improvement_output, interview_output],
+        concurrency_limit=MAX_CONCURRENT_REQUESTS
     )
 
 
-# Launch Gradio (disable API docs to avoid Gradio bug)
-app.launch(show_api=False)
+# Guarded so PDF extraction workers (forkserver / spawn) can import this module
+if __name__ == "__main__":
+    # Load the Ollama model in the background so the first CV does not pay for it
+    if OLLAMA_WARM_UP:
+        warm_up_ollama()
+
+    # Launch Gradio (disable API docs to avoid Gradio bug)
+    app.launch(show_api=False)
@@ -0,0 +1,95 @@
+"""
+Vector Backend Benchmark
+Compares query latency and recall of the NumPy exact index against
+ChromaDB's resumes_col.query
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from chroma_setup import get_or_create_db
+from vector_backends import ChromaIndex, NumpyIndex
+
+# Configuration
+N_QUERIES = 200
+N_RESULTS = 10
+
+
+def time_queries(index, queries: List[List[float]], n_results: int,
+                 where: Optional[Dict] = None) -> Dict:
+    """Run each query separately and collect latency percentiles (ms)."""
+    latencies = []
+    hits = []
+    for query in queries:
+        start = time.perf_counter()
+        result = index.query([query], n_results=n_results, where=where)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits.append(result["ids"][0])
+
+    latencies = np.array(latencies)
+    return {
+        "mean_ms": float(latencies.mean()),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "hits": hits,
+    }
+
+
+def recall(approx: List[List[str]], exact: List[List[str]]) -> float:
+    """Average overlap of the approximate top-k with the exact top-k."""
+    scores = [
+        len(set(a) & set(e)) / len(e)
+        for a, e in zip(approx, exact) if e
+    ]
+    return float(np.mean(scores)) if scores else 0.0
+
+
+def run_benchmark(n_queries: int = N_QUERIES, n_results: int = N_RESULTS,
+                  category: Optional[str] = None):
+    """
+    Benchmark both backends on the resumes collection.
+    
+    Stored resume embeddings are used as queries, so no model is needed.
+    
+    Args:
+        n_queries: Number of queries to run
+        n_results: Top-k per query
+        category: Optional category filter to benchmark the masked path
+    """
+    client, resumes_col, jobs_col = get_or_create_db()
+    
+    print(f"Loading NumPy index from '{resumes_col.name}'...")
+    start = time.perf_counter()
+    numpy_index = NumpyIndex.from_collection(resumes_col)
+    print(f"  ✓ {numpy_index.count()} docs loaded in {time.perf_counter() - start:.2f}s")
+    
+    if numpy_index.count() == 0:
+        print("✗ Collection is empty - ingest resumes first")
+        return
+    
+    sample = random.Random(42).sample(range(numpy_index.count()), min(n_queries, numpy_index.count()))
+    queries = [numpy_index.embeddings[i].tolist() for i in sample]
+    where = {"category": {"$eq": category}} if category else None
+    
+    chroma = time_queries(ChromaIndex(resumes_col), queries, n_results, where)
+    exact = time_queries(numpy_index, queries, n_results, where)
+    
+    print(f"\n--- {len(queries)} queries, top-{n_results}"
+          f"{f', category={category}' if category else ''} ---")
+    print(f"{'Backend':<10}{'mean':>10}{'p50':>10}{'p95':>10}")
+    for name, stats in (("chroma", chroma), ("numpy", exact)):
+        print(f"{name:<10}{stats['mean_ms']:>9.2f}ms{stats['p50_ms']:>8.2f}ms{stats['p95_ms']:>8.2f}ms")
+    
+    print(f"\nSpeedup (mean): {chroma['mean_ms'] / max(exact['mean_ms'], 1e-9):.1f}x")
+    print(f"Chroma HNSW recall@{n_results} vs exact: {recall(chroma['hits'], exact['hits']):.3f}")
+
+
+if __name__ == "__main__":
+    run_benchmark(category=sys.argv[1] if len(sys.argv) > 1 else None)
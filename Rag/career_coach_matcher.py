@@ -3,12 +3,30 @@ ChromaDB Query Helper
 Simplified interface for common matching and search operations
 """
 
-from typing import List, Dict, Optional, Tuple
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from chroma_setup import get_or_create_db
-from chroma_ingestion import ChromaEmbedder, EMBEDDING_MODEL
+from chroma_ingestion import ChromaEmbedder, EMBEDDING_MODEL, EMBEDDING_BACKEND
+from vector_backends import create_index
+from collection_stats import CollectionStats, stats_path_for
+from embedding_dispatcher import EmbeddingDispatcher, DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_WAIT_MS
+from interview_index import InterviewQuestionIndex, load_interview_index
 import chromadb
 
+if TYPE_CHECKING:
+    from term_index import TermIndex
+
+# Adaptive overfetch: pages grow by this factor up to the candidate cap
+ADAPTIVE_GROWTH = 2
+ADAPTIVE_MAX_CANDIDATES = 200
+
+# Bounded executors behind the async API (encoding is CPU-bound, queries are I/O + CPU)
+ENCODE_WORKERS = 2
+QUERY_WORKERS = 4
+
 
 @dataclass
 class SearchResult:
@@ -20,56 +38,183 @@ class SearchResult:
     similarity_score: float  # 1 - distance (0 to 1 scale)
 
 
+class SearchResultList(list):
+    """List of SearchResult objects that also reports how much was fetched."""
+    
+    def __init__(self, results=(), candidates_scanned: int = 0, pages_fetched: int = 1):
+        super().__init__(results)
+        self.candidates_scanned = candidates_scanned
+        self.pages_fetched = pages_fetched
+
+
+def build_job_query(job_title: str, job_description: str) -> str:
+    """Combine title and description into the text used for resume search."""
+    return f"{job_title}. {job_description}"
+
+
+class QueryContext:
+    """
+    Request-scoped cache of query embeddings.
+    
+    Each distinct query text is encoded at most once for the lifetime of the
+    context, so the analysis stages of one request can share embeddings.
+    """
+    
+    def __init__(self, embedder, cv_text: str = "", job_title: str = ""):
+        """
+        Create an empty context.
+        
+        Args:
+            embedder: ChromaEmbedder used to encode missing texts
+            cv_text: CV text the request is about
+            job_title: Target job title of the request
+        """
+        self.embedder = embedder
+        self.cv_text = cv_text
+        self.job_title = job_title
+        self.embeddings: Dict[str, List[float]] = {}
+        self.encode_calls = 0
+    
+    def prefetch(self, texts: List[str]):
+        """Encode all texts not yet in the context with a single batch call."""
+        missing = list(dict.fromkeys(t for t in texts if t not in self.embeddings))
+        if not missing:
+            return
+        
+        vectors = self.embedder.generate_embeddings(missing)
+        self.encode_calls += 1
+        self.embeddings.update(zip(missing, vectors))
+    
+    def embed(self, text: str) -> List[float]:
+        """Get the embedding of a text, encoding it on first use."""
+        if text not in self.embeddings:
+            self.prefetch([text])
+        return self.embeddings[text]
+
+
 class CareerCoachMatcher:
     """
     High-level API for resume-job matching in the Career Coach.
     """
     
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, backend: str = "chroma",
+                 embedding_backend: str = EMBEDDING_BACKEND,
+                 max_candidates: int = ADAPTIVE_MAX_CANDIDATES,
+                 micro_batching: bool = False,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
         """
         Initialize the matcher with ChromaDB and embedder.
         
         Args:
             db_path: Optional custom path to ChromaDB
+            backend: Vector search backend, "chroma" (HNSW) or "numpy"
+                     (exact in-memory search, loaded from a .npy snapshot
+                     or from the collections)
+            embedding_backend: Embedding inference engine, "torch" or "onnx"
+            max_candidates: Cap on candidates fetched per query in adaptive search
+            micro_batching: Coalesce concurrent embedding requests into batches
+            max_batch_size: Micro-batching flush size
+            max_wait_ms: Micro-batching flush delay in milliseconds
         """
         self.client, self.resumes_col, self.jobs_col = get_or_create_db(db_path)
-        self.embedder = ChromaEmbedder(EMBEDDING_MODEL)
+        self.backend = backend
+        self.max_candidates = max_candidates
+        self.stats = CollectionStats(stats_path_for(db_path))
+        # Snapshots of another stats generation are stale and rebuilt from the collections
+        self.resumes_index = create_index(self.resumes_col, backend, generation=self.stats.generation)
+        self.jobs_index = create_index(self.jobs_col, backend, generation=self.stats.generation)
+        self.embedder = ChromaEmbedder(EMBEDDING_MODEL, backend=embedding_backend)
+        if micro_batching:
+            self.embedder = EmbeddingDispatcher(self.embedder, max_batch_size, max_wait_ms)
+        self.db_path = db_path
+        self._term_indexes: Dict[str, Optional["TermIndex"]] = {}
+        self._question_index: Optional[InterviewQuestionIndex] = None
+        self._question_index_loaded = False
+        self._encode_executor = ThreadPoolExecutor(ENCODE_WORKERS, thread_name_prefix="matcher-encode")
+        self._query_executor = ThreadPoolExecutor(QUERY_WORKERS, thread_name_prefix="matcher-query")
         print("✓ Career Coach Matcher initialized")
     
-    def find_jobs_for_resume(self, resume_text: str, n_results: int = 10, 
-                            min_score: float = 0.5) -> List[SearchResult]:
+    def close(self):
         """
-        Find best-matching jobs for a given resume.
+        Release the embedding model and ChromaDB handles held by this matcher.
+        
+        The executors are shut down with wait=True, so call this once no
+        request uses the matcher any more (the matcher registry does). The
+        Chroma client is only dropped: clients for the same path share one
+        process-wide system, which a replacement matcher is still using.
+        """
+        self._encode_executor.shutdown(wait=True)
+        self._query_executor.shutdown(wait=True)
+        embedder = self.embedder
+        if isinstance(embedder, EmbeddingDispatcher):
+            embedder.close()
+            embedder = embedder.embedder
+        if embedder is not None:
+            embedder.close()
+        self.embedder = None
+        self.resumes_index = None
+        self.jobs_index = None
+        self.resumes_col = None
+        self.jobs_col = None
+        self.client = None
+        self._term_indexes = {}
+        self._question_index = None
+    
+    def create_query_context(self, cv_text: str, job_title: str = "") -> QueryContext:
+        """
+        Create a request-scoped query context for a CV.
+        
+        The resume query (CV text) and, when a job title is given, the job
+        query (title + CV text) are encoded together in one batch call.
         
         Args:
-            resume_text: Resume content (full text)
-            n_results: Number of results to return
-            min_score: Minimum similarity score (0-1)
+            cv_text: Cleaned CV text
+            job_title: Optional target job title
         
         Returns:
-            List of SearchResult objects sorted by similarity
+            QueryContext with the query embeddings precomputed
         """
-        # Generate embedding
-        query_embedding = self.embedder.generate_embeddings([resume_text])[0]
+        context = QueryContext(self.embedder, cv_text, job_title)
+        texts = [cv_text]
+        if job_title:
+            texts.append(build_job_query(job_title, cv_text))
+        context.prefetch(texts)
+        return context
+    
+    def _embed_query(self, text: str, query_context: Optional[QueryContext]) -> List[float]:
+        """Embed a query text, reusing the context's embedding when available."""
+        if query_context is not None:
+            return query_context.embed(text)
+        return self.embedder.generate_embeddings([text])[0]
+    
+    @staticmethod
+    def _to_search_results(results: Dict, query_index: int, min_score: float,
+                           n_results: int) -> SearchResultList:
+        """
+        Convert one query's rows of a Chroma result into SearchResult objects.
         
-        # Query jobs collection
-        results = self.jobs_col.query(
-            query_embeddings=[query_embedding],
-            n_results=n_results * 2  # Get extra to filter by min_score
-        )
+        Args:
+            results: Raw result of collection.query()
+            query_index: Which query embedding's rows to convert
+            min_score: Minimum similarity score (0-1)
+            n_results: Number of results to keep
         
-        # Convert to SearchResult objects
+        Returns:
+            List of SearchResult objects sorted by similarity
+        """
         search_results = []
-        for doc, meta, distance in zip(
-            results['documents'][0],
-            results['metadatas'][0],
-            results['distances'][0]
+        for doc_id, doc, meta, distance in zip(
+            results['ids'][query_index],
+            results['documents'][query_index],
+            results['metadatas'][query_index],
+            results['distances'][query_index]
         ):
             similarity = 1 - distance  # Convert distance to similarity (0-1)
             
             if similarity >= min_score:
                 search_results.append(SearchResult(
-                    id=meta.get('job_index', 'unknown'),
+                    id=doc_id,
                     text=doc,
                     metadata=meta,
                     distance=distance,
@@ -79,11 +224,158 @@ class CareerCoachMatcher:
         # Sort by similarity (highest first)
         search_results.sort(key=lambda x: x.similarity_score, reverse=True)
         
-        return search_results[:n_results]
+        return SearchResultList(search_results[:n_results],
+                                candidates_scanned=len(results['ids'][query_index]))
+    
+    def _search(self, index, query_embeddings: List[List[float]], n_results: int,
+                min_score: float, where: Optional[Dict] = None, adaptive: bool = False) -> List[SearchResultList]:
+        """
+        Query an index with one or more embeddings.
+        
+        The fixed mode fetches n_results * 2 candidates once. The adaptive mode
+        starts with n_results candidates and fetches the next, growing page of
+        the ranking (only for the queries still short of hits) until n_results
+        hits pass min_score, the last candidate already scores below min_score,
+        the index is exhausted, or max_candidates is reached.
+        
+        The NumPy backend returns only the new page. Chroma has no offset, so
+        each further page re-fetches the earlier rows; candidates_scanned
+        counts every row transferred, up to about twice max_candidates.
+        
+        Args:
+            index: ChromaIndex or NumpyIndex to search
+            query_embeddings: Query vectors
+            n_results: Number of results to return per query
+            min_score: Minimum similarity score (0-1)
+            where: Optional metadata filter
+            adaptive: Use threshold-aware adaptive overfetch
+        
+        Returns:
+            One SearchResultList per query embedding
+        """
+        if not adaptive:
+            results = index.query(
+                query_embeddings,
+                n_results=n_results * 2,  # Get extra to filter by min_score
+                where=where
+            )
+            return [
+                self._to_search_results(results, i, min_score, n_results)
+                for i in range(len(query_embeddings))
+            ]
+        
+        cap = max(self.max_candidates, n_results)
+        fetched, fetch = 0, max(n_results, 1)
+        pending = list(range(len(query_embeddings)))
+        hits: List[List[SearchResult]] = [[] for _ in query_embeddings]
+        scanned = [0] * len(query_embeddings)
+        pages = [0] * len(query_embeddings)
+        
+        while pending:
+            results = index.query(
+                [query_embeddings[i] for i in pending],
+                n_results=fetch - fetched,
+                where=where,
+                offset=fetched
+            )
+            
+            still_pending = []
+            for row, query_index in enumerate(pending):
+                page = self._to_search_results(results, row, min_score, fetch)
+                hits[query_index].extend(page)
+                distances = results['distances'][row]
+                scanned[query_index] += len(distances) + (0 if index.native_offset else fetched)
+                pages[query_index] += 1
+                
+                done = (
+                    len(hits[query_index]) >= n_results
+                    or len(distances) < fetch - fetched  # Index exhausted
+                    or 1 - distances[-1] < min_score     # Remaining candidates score lower
+                    or fetch >= cap
+                )
+                if not done:
+                    still_pending.append(query_index)
+            
+            pending = still_pending
+            fetched, fetch = fetch, min(fetch * ADAPTIVE_GROWTH, cap)
+        
+        final = []
+        for query_hits, query_scanned, query_pages in zip(hits, scanned, pages):
+            query_hits.sort(key=lambda x: x.similarity_score, reverse=True)
+            final.append(SearchResultList(query_hits[:n_results], candidates_scanned=query_scanned,
+                                          pages_fetched=query_pages))
+        return final
+    
+    def _search_jobs(self, query_embeddings: List[List[float]], n_results: int,
+                     min_score: float, adaptive: bool = False) -> List[SearchResultList]:
+        """Query the jobs collection with one or more embeddings."""
+        return self._search(self.jobs_index, query_embeddings, n_results, min_score, adaptive=adaptive)
+    
+    def _search_resumes(self, query_embeddings: List[List[float]], n_results: int,
+                        category_filter: Optional[str], min_score: float,
+                        adaptive: bool = False) -> List[SearchResultList]:
+        """Query the resumes collection with one or more embeddings."""
+        # Build where filter
+        where_filter = None
+        if category_filter:
+            where_filter = {"category": {"$eq": category_filter}}
+        
+        return self._search(self.resumes_index, query_embeddings, n_results, min_score,
+                            where=where_filter, adaptive=adaptive)
+    
+    def find_jobs_for_resume(self, resume_text: str, n_results: int = 10, 
+                            min_score: float = 0.5,
+                            query_context: Optional[QueryContext] = None,
+                            adaptive: bool = False) -> SearchResultList:
+        """
+        Find best-matching jobs for a given resume.
+        
+        Args:
+            resume_text: Resume content (full text)
+            n_results: Number of results to return
+            min_score: Minimum similarity score (0-1)
+            query_context: Optional request context holding precomputed embeddings
+            adaptive: Fetch candidates in growing pages until n_results pass min_score
+        
+        Returns:
+            List of SearchResult objects sorted by similarity
+            (candidates_scanned tells how many candidates were fetched)
+        """
+        # Generate embedding (or reuse it from the request context)
+        query_embedding = self._embed_query(resume_text, query_context)
+        
+        return self._search_jobs([query_embedding], n_results, min_score, adaptive)[0]
+    
+    def find_jobs_for_resumes(self, resume_texts: List[str], n_results: int = 10,
+                              min_score: float = 0.5,
+                              adaptive: bool = False) -> List[SearchResultList]:
+        """
+        Find best-matching jobs for many resumes at once.
+        
+        All resumes are encoded in one batch and sent to ChromaDB in a single
+        multi-embedding query.
+        
+        Args:
+            resume_texts: List of resume contents
+            n_results: Number of results to return per resume
+            min_score: Minimum similarity score (0-1)
+            adaptive: Fetch candidates in growing pages until n_results pass min_score
+        
+        Returns:
+            One list of SearchResult objects per resume, in input order
+        """
+        if not resume_texts:
+            return []
+        
+        query_embeddings = self.embedder.generate_embeddings(list(resume_texts))
+        
+        return self._search_jobs(query_embeddings, n_results, min_score, adaptive)
     
     def find_resumes_for_job(self, job_title: str, job_description: str,
                             n_results: int = 10, category_filter: Optional[str] = None,
-                            min_score: float = 0.5) -> List[SearchResult]:
+                            min_score: float = 0.5,
+                            query_context: Optional[QueryContext] = None,
+                            adaptive: bool = False) -> SearchResultList:
         """
         Find best-matching resumes for a job description.
         
@@ -93,74 +385,174 @@ class CareerCoachMatcher:
             n_results: Number of results to return
             category_filter: Optional filter by resume category
             min_score: Minimum similarity score (0-1)
+            query_context: Optional request context holding precomputed embeddings
+            adaptive: Fetch candidates in growing pages until n_results pass min_score
         
         Returns:
             List of SearchResult objects sorted by similarity
+            (candidates_scanned tells how many candidates were fetched)
         """
         # Combine title and description for better search
-        combined_text = f"{job_title}. {job_description}"
+        combined_text = build_job_query(job_title, job_description)
         
-        # Generate embedding
-        query_embedding = self.embedder.generate_embeddings([combined_text])[0]
+        # Generate embedding (or reuse it from the request context)
+        query_embedding = self._embed_query(combined_text, query_context)
         
-        # Build where filter
-        where_filter = None
-        if category_filter:
-            where_filter = {"category": {"$eq": category_filter}}
+        return self._search_resumes([query_embedding], n_results, category_filter, min_score, adaptive)[0]
+    
+    def find_resumes_for_jobs(self, queries: List[Tuple[str, str]], n_results: int = 10,
+                              category_filter: Optional[str] = None,
+                              min_score: float = 0.5,
+                              adaptive: bool = False) -> List[SearchResultList]:
+        """
+        Find best-matching resumes for many job descriptions at once.
         
-        # Query resumes collection
-        results = self.resumes_col.query(
-            query_embeddings=[query_embedding],
-            n_results=n_results * 2,
-            where=where_filter
-        )
+        All queries are encoded in one batch and sent to ChromaDB in a single
+        multi-embedding query.
         
-        # Convert to SearchResult objects
-        search_results = []
-        for doc_id, doc, meta, distance in zip(
-            results['ids'][0],
-            results['documents'][0],
-            results['metadatas'][0],
-            results['distances'][0]
-        ):
-            similarity = 1 - distance
-            
-            if similarity >= min_score:
-                search_results.append(SearchResult(
-                    id=doc_id,
-                    text=doc,
-                    metadata=meta,
-                    distance=distance,
-                    similarity_score=similarity
-                ))
+        Args:
+            queries: List of (job_title, job_description) tuples
+            n_results: Number of results to return per job
+            category_filter: Optional filter by resume category
+            min_score: Minimum similarity score (0-1)
+            adaptive: Fetch candidates in growing pages until n_results pass min_score
         
-        # Sort by similarity (highest first)
-        search_results.sort(key=lambda x: x.similarity_score, reverse=True)
+        Returns:
+            One list of SearchResult objects per job, in input order
+        """
+        if not queries:
+            return []
+        
+        combined_texts = [build_job_query(title, desc) for title, desc in queries]
+        query_embeddings = self.embedder.generate_embeddings(combined_texts)
         
-        return search_results[:n_results]
+        return self._search_resumes(query_embeddings, n_results, category_filter, min_score, adaptive)
     
-    def get_all_categories(self) -> List[str]:
-        """Get list of all resume categories in the database."""
-        # Query all resumes and collect unique categories
-        all_resumes = self.resumes_col.get()
-        categories = set()
+    # ---- Async API: encoding and vector queries run on bounded executors ----
+    
+    async def _run(self, executor: ThreadPoolExecutor, func, *args, **kwargs):
+        """Run a blocking call on one of the matcher's executors."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+    
+    async def acreate_query_context(self, cv_text: str, job_title: str = "") -> QueryContext:
+        """Async version of create_query_context()."""
+        return await self._run(self._encode_executor, self.create_query_context, cv_text, job_title)
+    
+    async def afind_jobs_for_resume(self, resume_text: str, n_results: int = 10,
+                                    min_score: float = 0.5,
+                                    query_context: Optional[QueryContext] = None,
+                                    adaptive: bool = False) -> SearchResultList:
+        """Async version of find_jobs_for_resume()."""
+        query_embedding = await self._run(self._encode_executor, self._embed_query,
+                                          resume_text, query_context)
+        results = await self._run(self._query_executor, self._search_jobs,
+                                  [query_embedding], n_results, min_score, adaptive)
+        return results[0]
+    
+    async def afind_jobs_for_resumes(self, resume_texts: List[str], n_results: int = 10,
+                                     min_score: float = 0.5,
+                                     adaptive: bool = False) -> List[SearchResultList]:
+        """Async version of find_jobs_for_resumes()."""
+        if not resume_texts:
+            return []
+        query_embeddings = await self._run(self._encode_executor, self.embedder.generate_embeddings,
+                                           list(resume_texts))
+        return await self._run(self._query_executor, self._search_jobs,
+                               query_embeddings, n_results, min_score, adaptive)
+    
+    async def afind_resumes_for_job(self, job_title: str, job_description: str,
+                                    n_results: int = 10, category_filter: Optional[str] = None,
+                                    min_score: float = 0.5,
+                                    query_context: Optional[QueryContext] = None,
+                                    adaptive: bool = False) -> SearchResultList:
+        """Async version of find_resumes_for_job()."""
+        combined_text = build_job_query(job_title, job_description)
+        query_embedding = await self._run(self._encode_executor, self._embed_query,
+                                          combined_text, query_context)
+        results = await self._run(self._query_executor, self._search_resumes,
+                                  [query_embedding], n_results, category_filter, min_score, adaptive)
+        return results[0]
+    
+    async def afind_resumes_for_jobs(self, queries: List[Tuple[str, str]], n_results: int = 10,
+                                     category_filter: Optional[str] = None,
+                                     min_score: float = 0.5,
+                                     adaptive: bool = False) -> List[SearchResultList]:
+        """Async version of find_resumes_for_jobs()."""
+        if not queries:
+            return []
+        combined_texts = [build_job_query(title, desc) for title, desc in queries]
+        query_embeddings = await self._run(self._encode_executor, self.embedder.generate_embeddings,
+                                           combined_texts)
+        return await self._run(self._query_executor, self._search_resumes,
+                               query_embeddings, n_results, category_filter, min_score, adaptive)
+    
+    def get_term_index(self, collection: str = "resumes") -> Optional["TermIndex"]:
+        """
+        Get the offline-built term index of a collection (loaded once).
+        
+        The term index module (and scipy) is only imported here, so the
+        matcher works without it and callers fall back to skill counts.
         
-        for meta in all_resumes['metadatas']:
-            if 'category' in meta:
-                categories.add(meta['category'])
+        Args:
+            collection: "resumes" or "jobs"
         
-        return sorted(list(categories))
+        Returns:
+            TermIndex, or None if it has not been built (python Rag/term_index.py)
+        """
+        name = (self.resumes_col if collection == "resumes" else self.jobs_col).name
+        if name not in self._term_indexes:
+            try:
+                from term_index import load_term_index
+                index = load_term_index(name, self.db_path)
+            except Exception as e:
+                print(f"WARNING: Could not load term index for '{name}': {e}")
+                index = None
+            self.stats.refresh()
+            if index is not None and index.generation != self.stats.generation:
+                print(f"WARNING: Term index for '{name}' is older than the collection; "
+                      f"rebuild it with: python Rag/term_index.py")
+            self._term_indexes[name] = index
+        return self._term_indexes[name]
+    
+    def get_question_index(self) -> Optional[InterviewQuestionIndex]:
+        """
+        Get the offline-built interview question index of the jobs (loaded once).
+        
+        Returns:
+            InterviewQuestionIndex, or None if it has not been built (python Rag/interview_index.py)
+        """
+        if not self._question_index_loaded:
+            try:
+                self._question_index = load_interview_index(self.jobs_col.name, self.db_path)
+            except Exception as e:
+                print(f"WARNING: Could not load interview question index: {e}")
+            self.stats.refresh()
+            if self._question_index is not None and self._question_index.generation != self.stats.generation:
+                print("WARNING: Interview question index is older than the job collection; "
+                      "rebuild it with: python Rag/interview_index.py")
+            self._question_index_loaded = True
+        return self._question_index
+    
+    def _summary(self) -> CollectionStats:
+        """Get the stats summary, building it once for collections it does not cover."""
+        for col in (self.resumes_col, self.jobs_col):
+            self.stats.ensure(col)
+        return self.stats
+    
+    def refresh_stats(self):
+        """Recompute the stats summary from the collections (full metadata scan)."""
+        for col in (self.resumes_col, self.jobs_col):
+            self.stats.rebuild(col)
+        self.stats.save()
+    
+    def get_all_categories(self) -> List[str]:
+        """Get list of all resume categories in the database."""
+        return list(self.get_category_stats())
     
     def get_category_stats(self) -> Dict[str, int]:
         """Get count of resumes per category."""
-        all_resumes = self.resumes_col.get()
-        stats = {}
-        
-        for meta in all_resumes['metadatas']:
-            category = meta.get('category', 'unknown')
-            stats[category] = stats.get(category, 0) + 1
-        
-        return dict(sorted(stats.items()))
+        return self._summary().category_counts(self.resumes_col.name)
     
     def get_db_stats(self) -> Dict:
         """Get overall database statistics."""
@@ -170,16 +562,16 @@ class CareerCoachMatcher:
         except:
             embedding_dim = 384
             
+        # Totals straight from the collections (exact and constant time);
+        # the stats summary only provides the category breakdown
         return {
             "total_resumes": self.resumes_col.count(),
             "total_jobs": self.jobs_col.count(),
             "resume_categories": self.get_category_stats(),
+            "stats_generation": self.stats.generation,
             "embedding_model": EMBEDDING_MODEL,
-<<<<<<< HEAD
-            "embedding_dimension": self.embedder.embedding_dim
-=======
+            "vector_backend": self.backend,
             "embedding_dimension": embedding_dim
->>>>>>> 048271b2c61fef9e1612883f053d07c1c0f16d2b
         }
 
 
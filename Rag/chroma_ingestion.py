@@ -10,12 +10,18 @@ import re
 from pathlib import Path
 from typing import List, Dict, Optional
 import pandas as pd
-from sentence_transformers import SentenceTransformer
 import chromadb
 from chroma_setup import get_or_create_db, COLLECTION_RESUMES, COLLECTION_JOBS
+from embedding_cache import EmbeddingCache, EMBEDDING_CACHE_PATH
+from embedding_backends import load_embedding_model
+from collection_stats import CollectionStats
+from ingestion_manifest import IngestionManifest, upsert_changed, prune_removed
+from csv_source import read_csv_chunks, prepare_job_rows, prepare_resume_rows
+from skill_matcher import get_skill_matcher
 
 # Configuration
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"  # 384-dimensional embeddings, fast & efficient
+EMBEDDING_BACKEND = "torch"  # "torch" (sentence-transformers) or "onnx" (onnxruntime)
 BATCH_SIZE = 32
 DATA_PATH = Path(__file__).parent.parent / "Data"
 JOB_CSV_PATH = DATA_PATH / "Job_Descriptions" / "job_title_des_cleaned.csv"
@@ -24,192 +30,213 @@ JOB_CSV_PATH = DATA_PATH / "Job_Descriptions" / "job_title_des_cleaned.csv"
 class ChromaEmbedder:
     """Handles embedding generation and ChromaDB ingestion."""
     
-    def __init__(self, model_name: str = EMBEDDING_MODEL):
+    def __init__(self, model_name: str = EMBEDDING_MODEL,
+                 cache: Optional[EmbeddingCache] = None, use_cache: bool = True,
+                 backend: str = EMBEDDING_BACKEND, quantized: bool = True,
+                 show_progress_bar: bool = False):
         """
         Initialize the embedder with a sentence transformer model.
         
         Args:
             model_name: Name of the sentence-transformers model to use
+            cache: Optional EmbeddingCache (e.g. with a persistent tier)
+            use_cache: Create an in-memory cache when none is given
+            backend: "torch" (sentence-transformers) or "onnx" (onnxruntime,
+                     model exported with Rag/embedding_backends.py)
+            quantized: For the ONNX backend, use the int8 quantized model
+            show_progress_bar: Print a progress bar per encode (for offline
+                               ingestion, not for request-time queries)
         """
-        print(f"Loading embedding model: {model_name}")
-<<<<<<< HEAD
-        self.model = SentenceTransformer(model_name, device='cpu')
-        
-        # CRITICAL: Hardcode dimension to avoid bug with get_sentence_embedding_dimension()
-        if model_name == "all-MiniLM-L6-v2":
-            self.embedding_dim = 384
+        self.model_name = model_name
+        self.backend = backend
+        self.show_progress_bar = show_progress_bar
+        # ONNX vectors differ slightly from torch ones, so cache them separately
+        if backend == "torch":
+            self.cache_model_key = model_name
         else:
-            # For other models, use encode to get dimension
-            test = self.model.encode(["test"], convert_to_numpy=True)
-            self.embedding_dim = test.shape[1]
+            self.cache_model_key = f"{model_name}@{backend}{'-int8' if quantized else ''}"
+        if cache is None and use_cache:
+            cache = EmbeddingCache()
+        self.cache = cache
         
-        print(f"✓ Model loaded. Embedding dimension: {self.embedding_dim}")
-=======
+        print(f"Loading embedding model: {model_name} (backend: {backend})")
         try:
             # Load model with explicit device
-            self.model = SentenceTransformer(model_name, device='cpu')
+            self.model = load_embedding_model(model_name, backend, quantized=quantized)
             
             # Verify it's a proper model object
             if isinstance(self.model, dict):
                 raise RuntimeError("Model loaded as dict, not SentenceTransformer")
             
-            # Get dimension using encode test (more reliable than get_sentence_embedding_dimension)
-            test_emb = self.model.encode(["test"], show_progress_bar=False)
-            self.embedding_dim = test_emb.shape[1] if hasattr(test_emb, 'shape') else len(test_emb[0])
+            # Hardcode the known dimension to avoid a test encode at startup;
+            # other models are probed with encode (more reliable than
+            # get_sentence_embedding_dimension)
+            if model_name == "all-MiniLM-L6-v2":
+                self.embedding_dim = 384
+            else:
+                test_emb = self.model.encode(["test"], show_progress_bar=False)
+                self.embedding_dim = test_emb.shape[1] if hasattr(test_emb, 'shape') else len(test_emb[0])
             
             print(f"✓ Model loaded. Embedding dimension: {self.embedding_dim}")
             
         except Exception as e:
             print(f"❌ Failed to load model: {e}")
             raise RuntimeError(f"Could not initialize embedding model: {e}")
->>>>>>> 048271b2c61fef9e1612883f053d07c1c0f16d2b
+    
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        """Run the model on a batch of texts (no caching)."""
+        if isinstance(self.model, dict):
+            raise RuntimeError("Model object is a dict - cannot generate embeddings")
+        
+        embeddings = self.model.encode(texts, show_progress_bar=self.show_progress_bar, convert_to_numpy=True)
+        return embeddings.tolist()
     
     def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for a batch of texts.
         
+        Cached texts are served from the embedding cache; only the misses
+        are sent to the model, in a single batch.
+        
         Args:
             texts: List of text strings
         
         Returns:
             List of embedding vectors
         """
-        if isinstance(self.model, dict):
-            raise RuntimeError("Model object is a dict - cannot generate embeddings")
+        if self.cache is None:
+            return self._encode(texts)
         
-        embeddings = self.model.encode(texts, show_progress_bar=True, convert_to_numpy=True)
-        return embeddings.tolist()
+        keys = [EmbeddingCache.make_key(self.cache_model_key, text) for text in texts]
+        found = self.cache.get_many(keys)
+        
+        # Encode each missing text once, even if it repeats within the batch
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        
+        if missing:
+            vectors = self._encode(list(missing.values()))
+            new_items = dict(zip(missing.keys(), vectors))
+            self.cache.put_many(new_items)
+            found.update(new_items)
+        
+        return [found[key] for key in keys]
+    
+    def close(self):
+        """Close the embedding cache (the SQLite connection of its persistent tier)."""
+        if self.cache is not None:
+            self.cache.close()
+    
+    def cache_stats(self) -> Dict:
+        """Get hit/miss statistics of the embedding cache."""
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats()}
 
 
-def ingest_job_descriptions(csv_path: str, client: chromadb.Client, embedder: ChromaEmbedder):
+def ingest_job_descriptions(csv_path: str, client: chromadb.Client, embedder: ChromaEmbedder,
+                            stats: Optional[CollectionStats] = None,
+                            manifest: Optional[IngestionManifest] = None):
     """
     Ingest job descriptions from cleaned CSV into ChromaDB.
     
+    Incremental: only new or changed rows are embedded and upserted, and
+    jobs that are no longer in the CSV are deleted, so re-running it on a
+    refreshed feed costs time proportional to the changes.
+    
     Args:
         csv_path: Path to cleaned job descriptions CSV
         client: ChromaDB client
         embedder: ChromaEmbedder instance
+        stats: Collection stats summary to keep up to date (default location if None)
+        manifest: Ingestion manifest of content hashes (default location if None)
     """
     jobs_collection = client.get_collection(COLLECTION_JOBS)
+    stats = stats or CollectionStats()
+    stats.ensure(jobs_collection)  # Count documents from earlier runs once
+    manifest = manifest or IngestionManifest()
+    skill_matcher = get_skill_matcher()  # Skills are stored in the metadata for the services
+    source = Path(csv_path).name
     
     print(f"\n--- Ingesting Job Descriptions from {Path(csv_path).name} ---")
     
-    # Read CSV
-    df = pd.read_csv(csv_path)
-    print(f"Total jobs to process: {len(df)}")
+    # Stream the CSV in chunks; rows are prepared column-wise
+    seen_ids = set()
+    added, updated = 0, 0
     
-    # Prepare batches
-    documents = []
-    metadatas = []
-    ids = []
-    
-    for idx, row in df.iterrows():
-        job_title = str(row.get('Job Title', '')).strip()
-        job_desc = str(row.get('Job Description', '')).strip()
-        
-        if not job_title or not job_desc:
-            continue
+    for chunk in read_csv_chunks(csv_path, ["Job Title", "Job Description"]):
+        ids, documents, metadatas = prepare_job_rows(chunk, skill_matcher, seen_ids, source)
+        seen_ids.update(ids)
         
-        # Create document combining title and description for better search
-        combined_text = f"{job_title}. {job_desc}"
-        
-        documents.append(combined_text)
-        metadatas.append({
-            "job_title": job_title[:100],  # Truncate for metadata
-            "source": Path(csv_path).name,
-            "job_index": str(idx)
-        })
-        ids.append(f"job_{idx}")
-        
-        # Process in batches
-        if len(documents) >= BATCH_SIZE:
-            embeddings = embedder.generate_embeddings(documents)
-            jobs_collection.add(
-                ids=ids,
-                embeddings=embeddings,
-                documents=documents,
-                metadatas=metadatas
-            )
-            print(f"  ✓ Ingested batch: {len(documents)} jobs")
-            documents, metadatas, ids = [], [], []
-    
-    # Process remaining batch
-    if documents:
-        embeddings = embedder.generate_embeddings(documents)
-        jobs_collection.add(
-            ids=ids,
-            embeddings=embeddings,
-            documents=documents,
-            metadatas=metadatas
-        )
-        print(f"  ✓ Ingested final batch: {len(documents)} jobs")
-    
-    print(f"✓ Job ingestion complete. Total jobs: {jobs_collection.count()}")
+        # Process in batches (unchanged rows are skipped)
+        for start in range(0, len(ids), BATCH_SIZE):
+            batch = slice(start, start + BATCH_SIZE)
+            new, changed = upsert_changed(jobs_collection, manifest, source, ids[batch], documents[batch],
+                                          metadatas[batch], embedder.generate_embeddings, stats,
+                                          embedder.cache_model_key)
+            added, updated = added + new, updated + changed
+            if new or changed:
+                print(f"  ✓ Ingested batch: {new} new, {changed} changed jobs")
+        print(f"  Read {len(seen_ids)} jobs...")
+    
+    # Jobs that left the feed
+    removed = prune_removed(jobs_collection, manifest, source, seen_ids, stats)
+    
+    print(f"✓ Job ingestion complete: {added} new, {updated} changed, {removed} removed, "
+          f"{len(seen_ids) - added - updated} unchanged. Total jobs: {jobs_collection.count()}")
 
 
-def ingest_resumes_from_csv(csv_path: str, client: chromadb.Client, embedder: ChromaEmbedder):
+def ingest_resumes_from_csv(csv_path: str, client: chromadb.Client, embedder: ChromaEmbedder,
+                            stats: Optional[CollectionStats] = None,
+                            manifest: Optional[IngestionManifest] = None):
     """
     Ingest resume data from CSV file into ChromaDB.
     
     Note: This assumes resume text has been pre-extracted from PDFs into a CSV.
+    Incremental like ingest_job_descriptions.
     
     Args:
         csv_path: Path to resume CSV with extracted text
         client: ChromaDB client
         embedder: ChromaEmbedder instance
+        stats: Collection stats summary to keep up to date (default location if None)
+        manifest: Ingestion manifest of content hashes (default location if None)
     """
     resumes_collection = client.get_collection(COLLECTION_RESUMES)
+    stats = stats or CollectionStats()
+    stats.ensure(resumes_collection)  # Count documents from earlier runs once
+    manifest = manifest or IngestionManifest()
+    skill_matcher = get_skill_matcher()  # Skills are stored in the metadata for the services
+    source = Path(csv_path).name
     
     print(f"\n--- Ingesting Resumes from {Path(csv_path).name} ---")
     
-    # Read CSV
-    df = pd.read_csv(csv_path)
-    print(f"Total resumes to process: {len(df)}")
-    
-    documents = []
-    metadatas = []
-    ids = []
+    # Stream the CSV in chunks; rows are prepared column-wise
+    seen_ids = set()
+    added, updated = 0, 0
     
-    for idx, row in df.iterrows():
-        resume_id = str(row.get('resume_id', idx))
-        resume_text = str(row.get('resume_text', '')).strip()
-        category = str(row.get('category', 'unknown')).strip()
-        
-        if not resume_text or len(resume_text) < 20:
-            continue
-        
-        documents.append(resume_text)
-        metadatas.append({
-            "resume_id": resume_id,
-            "category": category,
-            "source": Path(csv_path).name
-        })
-        ids.append(f"resume_{resume_id}")
+    for chunk in read_csv_chunks(csv_path, ["resume_id", "resume_text", "category"]):
+        ids, documents, metadatas = prepare_resume_rows(chunk, skill_matcher, seen_ids, source)
+        seen_ids.update(ids)
         
-        # Process in batches
-        if len(documents) >= BATCH_SIZE:
-            embeddings = embedder.generate_embeddings(documents)
-            resumes_collection.add(
-                ids=ids,
-                embeddings=embeddings,
-                documents=documents,
-                metadatas=metadatas
-            )
-            print(f"  ✓ Ingested batch: {len(documents)} resumes")
-            documents, metadatas, ids = [], [], []
-    
-    # Process remaining batch
-    if documents:
-        embeddings = embedder.generate_embeddings(documents)
-        resumes_collection.add(
-            ids=ids,
-            embeddings=embeddings,
-            documents=documents,
-            metadatas=metadatas
-        )
-        print(f"  ✓ Ingested final batch: {len(documents)} resumes")
-    
-    print(f"✓ Resume ingestion complete. Total resumes: {resumes_collection.count()}")
+        # Process in batches (unchanged rows are skipped)
+        for start in range(0, len(ids), BATCH_SIZE):
+            batch = slice(start, start + BATCH_SIZE)
+            new, changed = upsert_changed(resumes_collection, manifest, source, ids[batch], documents[batch],
+                                          metadatas[batch], embedder.generate_embeddings, stats,
+                                          embedder.cache_model_key)
+            added, updated = added + new, updated + changed
+            if new or changed:
+                print(f"  ✓ Ingested batch: {new} new, {changed} changed resumes")
+        print(f"  Read {len(seen_ids)} resumes...")
+    
+    # Resumes that are no longer in the CSV
+    removed = prune_removed(resumes_collection, manifest, source, seen_ids, stats)
+    
+    print(f"✓ Resume ingestion complete: {added} new, {updated} changed, {removed} removed, "
+          f"{len(seen_ids) - added - updated} unchanged. Total resumes: {resumes_collection.count()}")
 
 
 def query_similar_jobs(query_text: str, client: chromadb.Client, embedder: ChromaEmbedder, n_results: int = 5):
@@ -271,7 +298,8 @@ def query_similar_resumes(query_text: str, client: chromadb.Client, embedder: Ch
 if __name__ == "__main__":
     # Initialize
     client, resumes_col, jobs_col = get_or_create_db()
-    embedder = ChromaEmbedder()
+    # Persist embeddings so re-ingestion runs skip unchanged texts
+    embedder = ChromaEmbedder(cache=EmbeddingCache(persist_path=EMBEDDING_CACHE_PATH), show_progress_bar=True)
     
     # Ingest job descriptions
     if JOB_CSV_PATH.exists():
@@ -291,3 +319,5 @@ if __name__ == "__main__":
             print(f"\n  Result {i+1}: {meta.get('job_title', 'Unknown')}")
             print(f"  Distance: {results['distances'][0][i]:.4f}")
             print(f"  Preview: {doc[:150]}...")
+    
+    print(f"\nEmbedding cache: {embedder.cache_stats()}")
@@ -0,0 +1,183 @@
+"""
+Collection Statistics Summary
+Small persisted summary of document and category counts per collection,
+maintained during ingestion so reading stats never scans a collection
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from chroma_setup import CHROMA_DB_PATH
+
+# Configuration
+STATS_FILENAME = "collection_stats.json"
+CATEGORY_FIELD = "category"
+REBUILD_PAGE_SIZE = 1000
+
+
+def stats_path_for(db_path: Optional[str] = None) -> Path:
+    """Location of the stats summary for a ChromaDB directory."""
+    return Path(db_path or CHROMA_DB_PATH) / STATS_FILENAME
+
+
+class CollectionStats:
+    """
+    Persisted per-collection document and category counts.
+
+    Every write bumps a generation counter. Readers reload the file only
+    when it changed on disk, and memoize derived values per generation, so
+    reads take constant time regardless of corpus size.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: JSON file holding the summary (defaults to Data/chromadb)
+        """
+        self.path = Path(path) if path else stats_path_for()
+        self._lock = threading.Lock()
+        self._data = {"generation": 0, "collections": {}}
+        self._mtime = None
+        self._memo: Dict = {}
+        self.refresh()
+
+    @property
+    def generation(self) -> int:
+        """Counter incremented on every change to the summary."""
+        return self._data["generation"]
+
+    def refresh(self):
+        """Reload the summary if the file changed since it was last read."""
+        with self._lock:
+            try:
+                mtime = self.path.stat().st_mtime_ns
+            except FileNotFoundError:
+                return
+            if mtime == self._mtime:
+                return
+
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._data = json.load(f)
+            self._mtime = mtime
+            self._memo.clear()
+
+    def save(self):
+        """Write the summary atomically."""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            self._mtime = self.path.stat().st_mtime_ns
+
+    def _entry(self, collection_name: str) -> Dict:
+        """Get (or create) the summary entry of a collection. Caller holds the lock."""
+        return self._data["collections"].setdefault(
+            collection_name, {"count": 0, "categories": {}}
+        )
+
+    def _bump(self):
+        """Start a new generation. Caller holds the lock."""
+        self._data["generation"] += 1
+        self._memo.clear()
+
+    def record_added(self, collection_name: str, metadatas: List[Dict]):
+        """
+        Account for documents added to a collection.
+
+        Args:
+            collection_name: Name of the collection
+            metadatas: Metadata of the added documents
+        """
+        with self._lock:
+            entry = self._entry(collection_name)
+            entry["count"] += len(metadatas)
+            for meta in metadatas:
+                if meta and CATEGORY_FIELD in meta:
+                    category = meta[CATEGORY_FIELD]
+                    entry["categories"][category] = entry["categories"].get(category, 0) + 1
+            self._bump()
+
+    def record_removed(self, collection_name: str, metadatas: List[Dict]):
+        """
+        Account for documents removed from a collection.
+
+        Args:
+            collection_name: Name of the collection
+            metadatas: Metadata of the removed documents
+        """
+        with self._lock:
+            entry = self._entry(collection_name)
+            entry["count"] = max(0, entry["count"] - len(metadatas))
+            for meta in metadatas:
+                if meta and CATEGORY_FIELD in meta:
+                    category = meta[CATEGORY_FIELD]
+                    remaining = entry["categories"].get(category, 0) - 1
+                    if remaining > 0:
+                        entry["categories"][category] = remaining
+                    else:
+                        entry["categories"].pop(category, None)
+            self._bump()
+
+    def rebuild(self, collection, page_size: int = REBUILD_PAGE_SIZE):
+        """
+        Recompute a collection's summary from its metadata (one paged scan).
+
+        Args:
+            collection: ChromaDB collection
+            page_size: Documents fetched per page
+        """
+        categories: Dict[str, int] = {}
+        total = collection.count()
+        for offset in range(0, total, page_size):
+            page = collection.get(limit=page_size, offset=offset, include=["metadatas"])
+            for meta in page["metadatas"]:
+                if meta and CATEGORY_FIELD in meta:
+                    category = meta[CATEGORY_FIELD]
+                    categories[category] = categories.get(category, 0) + 1
+
+        with self._lock:
+            self._data["collections"][collection.name] = {
+                "count": total,
+                "categories": categories,
+            }
+            self._bump()
+
+    def ensure(self, collection) -> bool:
+        """
+        Build the summary of a collection it does not cover yet.
+
+        Args:
+            collection: ChromaDB collection
+
+        Returns:
+            True if the summary was (re)built
+        """
+        self.refresh()
+        if self.has_collection(collection.name):
+            return False
+        self.rebuild(collection)
+        self.save()
+        return True
+
+    def has_collection(self, collection_name: str) -> bool:
+        """Whether a summary exists for the collection."""
+        return collection_name in self._data["collections"]
+
+    def count(self, collection_name: str) -> int:
+        """Number of documents in a collection."""
+        entry = self._data["collections"].get(collection_name)
+        return entry["count"] if entry else 0
+
+    def category_counts(self, collection_name: str) -> Dict[str, int]:
+        """Documents per category, sorted by category name."""
+        key = ("category_counts", collection_name)
+        with self._lock:
+            if key not in self._memo:
+                entry = self._data["collections"].get(collection_name, {})
+                self._memo[key] = dict(sorted(entry.get("categories", {}).items()))
+            return dict(self._memo[key])
@@ -0,0 +1,144 @@
+"""
+Streaming CSV Source
+Reads ingestion CSVs in bounded chunks of the needed columns, so memory use
+stays flat regardless of file size and rows are prepared column-wise
+"""
+
+import hashlib
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from skill_matcher import format_skills_field, SKILLS_FIELD
+
+# Configuration
+CSV_CHUNK_ROWS = 2000  # Rows held in memory at once
+JOB_ID_HASH_CHARS = 16  # Hex digits of the content hash in job ids
+
+
+def read_csv_chunks(csv_path: str, columns: List[str], chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Stream a CSV in chunks.
+
+    Only the given columns are parsed (missing ones are left out rather than
+    raising). The row index continues across chunks, so it matches the
+    index of a full read_csv.
+
+    Args:
+        csv_path: Path to the CSV file
+        columns: Columns to read
+        chunk_rows: Rows per chunk
+
+    Yields:
+        DataFrame per chunk
+    """
+    wanted = set(columns)
+    yield from pd.read_csv(csv_path, usecols=lambda name: name in wanted, chunksize=chunk_rows)
+
+
+def text_column(chunk: pd.DataFrame, name: str, default: str = "", strip: bool = True) -> pd.Series:
+    """
+    A column as strings, like str(row.get(name, default)) per row.
+
+    Args:
+        chunk: DataFrame chunk
+        name: Column name
+        default: Value for every row if the column is missing
+        strip: Strip surrounding whitespace
+    """
+    if name not in chunk:
+        return pd.Series(default, index=chunk.index, dtype=object)
+    values = chunk[name].astype(object).map(str)  # Missing values become "nan", as with str()
+    return values.str.strip() if strip else values
+
+
+def index_column(chunk: pd.DataFrame) -> pd.Series:
+    """The row index as strings (fallback ids)."""
+    return pd.Series(chunk.index.astype(str), index=chunk.index)
+
+
+def job_id(document: str) -> str:
+    """
+    Stable id of a job from its title and description, so inserting or
+    removing rows in the feed does not change the ids of the other jobs.
+    """
+    return "job_" + hashlib.sha256(document.encode("utf-8")).hexdigest()[:JOB_ID_HASH_CHARS]
+
+
+def prepare_job_rows(chunk: pd.DataFrame, skill_matcher, seen_ids: Set[str],
+                     source: Optional[str] = None) -> Tuple[List[str], List[str], List[Dict]]:
+    """
+    Build job ids, documents and metadata from a chunk of the job CSV.
+
+    Rows without title or description are skipped; the document combines
+    title and description for better search. Ids are content hashes (see
+    job_id), so repeated jobs are skipped after their first row. Nothing
+    positional is stored, so editing one row of the feed leaves the ids
+    and metadata of the other jobs unchanged.
+
+    Args:
+        chunk: Chunk with "Job Title" and "Job Description" columns
+        skill_matcher: SkillMatcher for the skills metadata field
+        seen_ids: Ids of earlier chunks (not modified)
+        source: Source file name stored in the metadata (left out if None)
+
+    Returns:
+        (ids, documents, metadatas)
+    """
+    titles = text_column(chunk, "Job Title")
+    descriptions = text_column(chunk, "Job Description")
+    keep = (titles != "") & (descriptions != "")
+    titles, descriptions = titles[keep], descriptions[keep]
+
+    documents = (titles + ". " + descriptions).tolist()
+    ids, kept_documents, metadatas = [], [], []
+    chunk_ids = set()
+    for title, document in zip(titles.str[:100].tolist(), documents):
+        doc_id = job_id(document)
+        if doc_id in seen_ids or doc_id in chunk_ids:
+            continue
+        chunk_ids.add(doc_id)
+        meta = {"job_title": title}  # Truncated for metadata
+        if source is not None:
+            meta["source"] = source
+        meta[SKILLS_FIELD] = format_skills_field(skill_matcher.match(document))
+        ids.append(doc_id)
+        kept_documents.append(document)
+        metadatas.append(meta)
+    return ids, kept_documents, metadatas
+
+
+def prepare_resume_rows(chunk: pd.DataFrame, skill_matcher, seen_ids: Set[str],
+                        source: Optional[str] = None) -> Tuple[List[str], List[str], List[Dict]]:
+    """
+    Build resume ids, documents and metadata from a chunk of the resume CSV.
+
+    Rows with less than 20 characters of text are skipped, as are ids seen
+    earlier in the file (the first row wins).
+
+    Args:
+        chunk: Chunk with "resume_id", "resume_text" and "category" columns
+        skill_matcher: SkillMatcher for the skills metadata field
+        seen_ids: Ids of earlier chunks (not modified)
+        source: Source file name stored in the metadata (left out if None)
+
+    Returns:
+        (ids, documents, metadatas)
+    """
+    resume_ids = text_column(chunk, "resume_id", strip=False) if "resume_id" in chunk else index_column(chunk)
+    texts = text_column(chunk, "resume_text")
+    categories = text_column(chunk, "category", default="unknown")
+
+    ids = "resume_" + resume_ids
+    valid = texts.str.len() >= 20
+    keep = valid & ~ids.where(valid).duplicated() & ~ids.isin(seen_ids)
+
+    documents = texts[keep].tolist()
+    metadatas = []
+    for resume_id, category, document in zip(resume_ids[keep].tolist(), categories[keep].tolist(), documents):
+        meta = {"resume_id": resume_id, "category": category}
+        if source is not None:
+            meta["source"] = source
+        meta[SKILLS_FIELD] = format_skills_field(skill_matcher.match(document))
+        metadatas.append(meta)
+    return ids[keep].tolist(), documents, metadatas
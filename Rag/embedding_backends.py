@@ -0,0 +1,262 @@
+"""
+Embedding Model Backends
+Selectable inference engines for sentence embeddings: PyTorch
+(sentence-transformers) or ONNX Runtime with optional int8 quantization
+"""
+
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+# Configuration
+DATA_PATH = Path(__file__).parent.parent / "Data"
+ONNX_MODELS_PATH = DATA_PATH / "onnx_models"
+EMBEDDING_BACKENDS = ("torch", "onnx")
+MAX_SEQ_LENGTH = 256  # Same truncation as all-MiniLM-L6-v2 in sentence-transformers
+ONNX_OPSET = 14
+
+SAMPLE_TEXTS = [
+    "Senior Software Engineer with 10 years of Python and AWS experience",
+    "Registered nurse experienced in intensive care and patient education",
+    "Managed a team of five accountants and reduced closing time by 30%",
+    "Data Scientist: machine learning, NLP, SQL, Spark",
+    "Looking for a marketing manager to lead digital advertising campaigns",
+]
+
+
+def _hf_model_id(model_name: str) -> str:
+    """Map a sentence-transformers short name to its Hugging Face id."""
+    return model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+
+
+def onnx_model_dir(model_name: str) -> Path:
+    """Default export directory of a model."""
+    return ONNX_MODELS_PATH / model_name.replace("/", "__")
+
+
+class OnnxSentenceEncoder:
+    """
+    Sentence encoder running an exported transformer on ONNX Runtime.
+
+    Mirrors the all-MiniLM-L6-v2 sentence-transformers pipeline: tokenize,
+    run the transformer, mean-pool over the attention mask, L2-normalize.
+    Exposes the subset of the SentenceTransformer API used in this project.
+    """
+
+    def __init__(self, model_dir: str, quantized: bool = True,
+                 max_seq_length: int = MAX_SEQ_LENGTH, num_threads: Optional[int] = None):
+        """
+        Load the ONNX model and tokenizer.
+
+        Args:
+            model_dir: Directory written by export_onnx_model()
+            quantized: Use the int8 model (model_int8.onnx) instead of model.onnx
+            max_seq_length: Truncation length in tokens
+            num_threads: Optional intra-op thread count for onnxruntime
+        """
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_dir = Path(model_dir)
+        model_file = model_dir / ("model_int8.onnx" if quantized else "model.onnx")
+        if not model_file.exists():
+            raise FileNotFoundError(
+                f"ONNX model not found: {model_file}. "
+                f"Export it with: python Rag/embedding_backends.py"
+            )
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        self.session = ort.InferenceSession(
+            str(model_file), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {inp.name for inp in self.session.get_inputs()}
+        self.model_file = model_file
+        self._dimension = None
+
+    def get_sentence_embedding_dimension(self) -> int:
+        """Embedding dimension (probed with one encode on first call)."""
+        if self._dimension is None:
+            self._dimension = int(self.encode(["test"]).shape[1])
+        return self._dimension
+
+    def encode(self, texts: List[str], batch_size: int = 32, show_progress_bar: bool = False,
+               convert_to_numpy: bool = True, normalize_embeddings: bool = True, **kwargs) -> np.ndarray:
+        """
+        Encode texts into sentence embeddings.
+
+        Args:
+            texts: List of text strings
+            batch_size: Texts per inference call
+            show_progress_bar: Ignored (kept for API compatibility)
+            convert_to_numpy: Ignored, always returns a NumPy array
+            normalize_embeddings: L2-normalize the pooled embeddings
+
+        Returns:
+            float32 array of shape (len(texts), dim)
+        """
+        if isinstance(texts, str):
+            texts = [texts]
+
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            encodings = self.tokenizer.encode_batch(list(texts[start:start + batch_size]))
+            input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+            feed = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if "token_type_ids" in self.input_names:
+                feed["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+            token_embeddings = self.session.run(None, feed)[0]
+
+            # Mean pooling over real tokens
+            mask = attention_mask[..., None].astype(np.float32)
+            summed = (token_embeddings * mask).sum(axis=1)
+            pooled = summed / np.clip(mask.sum(axis=1), 1e-9, None)
+
+            if normalize_embeddings:
+                pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled.astype(np.float32))
+
+        if not batches:
+            return np.zeros((0, self._dimension or 0), dtype=np.float32)
+        return np.vstack(batches)
+
+
+def load_embedding_model(model_name: str, backend: str = "torch", quantized: bool = True,
+                         model_dir: Optional[str] = None):
+    """
+    Load an embedding model on the selected backend.
+
+    Args:
+        model_name: sentence-transformers model name
+        backend: "torch" (SentenceTransformer) or "onnx" (onnxruntime)
+        quantized: For "onnx", use the int8 dynamically quantized model
+        model_dir: For "onnx", directory of the exported model
+
+    Returns:
+        Model object with an encode(texts, ...) method
+    """
+    if backend == "torch":
+        # Imported lazily: loading torch alone takes seconds
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_name, device='cpu')
+
+    if backend == "onnx":
+        return OnnxSentenceEncoder(model_dir or str(onnx_model_dir(model_name)), quantized=quantized)
+
+    raise ValueError(f"Unknown embedding backend '{backend}'. Choose from: {', '.join(EMBEDDING_BACKENDS)}")
+
+
+def export_onnx_model(model_name: str, output_dir: Optional[str] = None, quantize: bool = True) -> Path:
+    """
+    Export a sentence-transformers model to ONNX (one-time, needs torch).
+
+    Writes model.onnx, tokenizer.json and, if requested, model_int8.onnx
+    produced by onnxruntime dynamic quantization.
+
+    Args:
+        model_name: sentence-transformers model name
+        output_dir: Target directory (defaults to Data/onnx_models/<model>)
+        quantize: Also write the int8 quantized model
+
+    Returns:
+        Path of the output directory
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    output_dir = Path(output_dir) if output_dir else onnx_model_dir(model_name)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"Exporting {model_name} to ONNX at {output_dir}...")
+    tokenizer = AutoTokenizer.from_pretrained(_hf_model_id(model_name))
+    model = AutoModel.from_pretrained(_hf_model_id(model_name))
+    model.eval()
+    tokenizer.save_pretrained(str(output_dir))
+
+    sample = tokenizer(["example sentence"], return_tensors="pt")
+    input_names = ["input_ids", "attention_mask", "token_type_ids"]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"], sample["token_type_ids"]),
+            str(output_dir / "model.onnx"),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=ONNX_OPSET,
+        )
+    print("  ✓ model.onnx written")
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(
+            str(output_dir / "model.onnx"),
+            str(output_dir / "model_int8.onnx"),
+            weight_type=QuantType.QInt8,
+        )
+        print("  ✓ model_int8.onnx written (dynamic int8 quantization)")
+
+    return output_dir
+
+
+def check_onnx_accuracy(model_name: str, texts: Optional[List[str]] = None,
+                        quantized: bool = True, min_cosine: float = 0.99) -> dict:
+    """
+    Compare ONNX embeddings against the PyTorch reference.
+
+    Args:
+        model_name: sentence-transformers model name
+        texts: Texts to compare (defaults to SAMPLE_TEXTS)
+        quantized: Check the int8 model instead of the fp32 one
+        min_cosine: Minimum per-text cosine similarity to pass
+
+    Returns:
+        Dictionary with min/mean cosine similarity, max abs difference and pass flag
+    """
+    texts = texts or SAMPLE_TEXTS
+    reference = load_embedding_model(model_name, "torch").encode(
+        texts, show_progress_bar=False, convert_to_numpy=True, normalize_embeddings=True
+    )
+    candidate = load_embedding_model(model_name, "onnx", quantized=quantized).encode(texts)
+
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    cosine = (reference * candidate).sum(axis=1)
+
+    return {
+        "model": model_name,
+        "quantized": quantized,
+        "texts": len(texts),
+        "min_cosine": float(cosine.min()),
+        "mean_cosine": float(cosine.mean()),
+        "max_abs_diff": float(np.abs(reference - candidate).max()),
+        "passed": bool(cosine.min() >= min_cosine),
+    }
+
+
+if __name__ == "__main__":
+    model_name = sys.argv[1] if len(sys.argv) > 1 else "all-MiniLM-L6-v2"
+
+    export_onnx_model(model_name)
+
+    print("\n--- Accuracy vs PyTorch ---")
+    for quantized in (False, True):
+        report = check_onnx_accuracy(model_name, quantized=quantized)
+        status = "✓ PASS" if report["passed"] else "✗ FAIL"
+        print(f"{status} {'int8' if quantized else 'fp32'}: "
+              f"min cosine {report['min_cosine']:.5f}, mean {report['mean_cosine']:.5f}, "
+              f"max |diff| {report['max_abs_diff']:.5f}")
@@ -0,0 +1,210 @@
+"""
+Embedding Cache
+Content-addressed cache for embeddings with an in-memory LRU tier and an
+optional SQLite tier on disk
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Configuration
+DATA_PATH = Path(__file__).parent.parent / "Data"
+EMBEDDING_CACHE_PATH = DATA_PATH / "embedding_cache.sqlite"
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_DISK_ENTRIES = 200000  # About 300 MB of 384-dimensional vectors
+EVICT_EVERY = 1000  # Stored vectors between eviction passes of the persistent tier
+
+
+class EmbeddingCache:
+    """
+    Caches embeddings keyed by a hash of model name + text.
+
+    Lookups go to the bounded in-memory LRU first and then to the persistent
+    SQLite tier (if enabled); persistent hits are promoted into memory. The
+    persistent tier is bounded too: least recently used vectors above
+    max_disk_entries are evicted every EVICT_EVERY stores.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 persist_path: Optional[str] = None,
+                 max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of embeddings kept in memory
+            persist_path: Optional SQLite file for the persistent tier
+            max_disk_entries: Maximum number of embeddings kept on disk
+        """
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.persist_path = str(persist_path) if persist_path else None
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._stored_since_evict = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+
+        if self.persist_path:
+            Path(self.persist_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.persist_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_access REAL NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(embeddings)")}
+            if "last_access" not in columns:
+                # Older cache file: its vectors count as least recently used
+                self._conn.execute("ALTER TABLE embeddings ADD COLUMN last_access REAL NOT NULL DEFAULT 0")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_last_access ON embeddings (last_access)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        """Build the content-addressed key for a text under a model."""
+        digest = hashlib.sha256()
+        digest.update(model_name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _remember(self, key: str, vector: np.ndarray):
+        """Insert into the memory tier, evicting least recently used entries."""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        """
+        Look up several keys at once.
+
+        Args:
+            keys: Cache keys from make_key()
+
+        Returns:
+            Dictionary with the embeddings of the keys that were found
+        """
+        found = {}
+        with self._lock:
+            pending = []
+            for key in dict.fromkeys(keys):
+                vector = self._memory.get(key)
+                if vector is None:
+                    pending.append(key)
+                    continue
+                self._memory.move_to_end(key)
+                found[key] = vector.tolist()
+                self.hits += 1
+
+            if pending and self._conn is not None:
+                for start in range(0, len(pending), 500):
+                    chunk = pending[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                        chunk
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        self._remember(key, vector)
+                        found[key] = vector.tolist()
+                        self.hits += 1
+                        self.disk_hits += 1
+                    if rows:
+                        now = time.time()
+                        self._conn.executemany(
+                            "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                            [(now, key) for key, _ in rows]
+                        )
+                        self._conn.commit()
+
+            self.misses += sum(1 for key in pending if key not in found)
+        return found
+
+    def put_many(self, items: Dict[str, List[float]]):
+        """
+        Store embeddings in the memory tier and, if enabled, on disk.
+
+        Args:
+            items: Mapping of cache key to embedding vector
+        """
+        with self._lock:
+            rows = []
+            now = time.time()
+            for key, vector in items.items():
+                array = np.asarray(vector, dtype=np.float32)
+                self._remember(key, array)
+                rows.append((key, array.tobytes(), now))
+
+            if rows and self._conn is not None:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, last_access) VALUES (?, ?, ?)",
+                    rows
+                )
+                self._stored_since_evict += len(rows)
+                if self._stored_since_evict >= EVICT_EVERY:
+                    self._evict_disk()
+                self._conn.commit()
+
+    def _evict_disk(self):
+        """Drop least recently used vectors above max_disk_entries. Caller holds the lock."""
+        self._stored_since_evict = 0
+        cursor = self._conn.execute(
+            "DELETE FROM embeddings WHERE key NOT IN "
+            "(SELECT key FROM embeddings ORDER BY last_access DESC LIMIT ?)",
+            (self.max_disk_entries,)
+        )
+        self.disk_evictions += max(cursor.rowcount, 0)
+
+    def stats(self) -> Dict:
+        """Get hit/miss counters and tier sizes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "disk_evictions": self.disk_evictions,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "persist_path": self.persist_path,
+            }
+            if self._conn is not None:
+                stats["disk_entries"] = self._conn.execute(
+                    "SELECT COUNT(*) FROM embeddings"
+                ).fetchone()[0]
+                stats["max_disk_entries"] = self.max_disk_entries
+            return stats
+
+    def clear(self, include_disk: bool = False):
+        """Empty the memory tier (and optionally the persistent tier)."""
+        with self._lock:
+            self._memory.clear()
+            if include_disk and self._conn is not None:
+                self._conn.execute("DELETE FROM embeddings")
+                self._conn.commit()
+
+    def close(self):
+        """Close the persistent tier."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,218 @@
+"""
+Embedding Micro-Batching Dispatcher
+Coalesces small embedding requests from concurrent threads into batched
+calls to a ChromaEmbedder
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Sequence
+
+# Configuration
+DEFAULT_MAX_BATCH_SIZE = 32
+DEFAULT_MAX_WAIT_MS = 5.0
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+QUEUE_WAIT_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100)
+
+
+class Histogram:
+    """Thread-safe fixed-bucket histogram."""
+
+    def __init__(self, buckets: Sequence[float]):
+        """
+        Args:
+            buckets: Upper bounds of the buckets (an overflow bucket is added)
+        """
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Record one value."""
+        with self._lock:
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+            else:
+                self.counts[-1] += 1
+            self.count += 1
+            self.total += value
+            self.max = max(self.max, value)
+
+    def snapshot(self) -> Dict:
+        """Get bucket counts and summary values."""
+        with self._lock:
+            labels = [f"<={bound:g}" for bound in self.buckets] + [f">{self.buckets[-1]:g}"]
+            return {
+                "buckets": dict(zip(labels, self.counts)),
+                "count": self.count,
+                "mean": round(self.total / self.count, 3) if self.count else 0.0,
+                "max": round(self.max, 3),
+            }
+
+
+class EmbeddingDispatcher:
+    """
+    Micro-batching front end for a ChromaEmbedder.
+
+    Callers submit texts from any thread; a single worker thread collects
+    pending texts and flushes them as one generate_embeddings() call when the
+    batch reaches max_batch_size or the oldest text has waited max_wait_ms.
+    Each caller gets back its own vectors. Large batches (e.g. ingestion)
+    bypass the queue.
+
+    Exposes generate_embeddings() and forwards other attributes to the
+    wrapped embedder, so it can be used wherever a ChromaEmbedder is. After
+    close(), generate_embeddings() calls the embedder directly.
+    """
+
+    def __init__(self, embedder, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        """
+        Start the dispatcher.
+
+        Args:
+            embedder: ChromaEmbedder to send batches to
+            max_batch_size: Flush as soon as this many texts are pending
+            max_wait_ms: Flush after the oldest pending text waited this long
+        """
+        self.embedder = embedder
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(QUEUE_WAIT_BUCKETS_MS)
+        self.batches = 0
+        self.bypassed = 0
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._close_lock = threading.Lock()  # No item can be queued behind the stop sentinel
+        self._worker = threading.Thread(target=self._run, name="embedding-dispatcher", daemon=True)
+        self._worker.start()
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on the dispatcher itself
+        return getattr(self.embedder, name)
+
+    def submit(self, text: str) -> Future:
+        """Queue one text; the returned future resolves to its embedding."""
+        future: Future = Future()
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("EmbeddingDispatcher is closed")
+            self._queue.put((text, future, time.perf_counter()))
+        return future
+
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings, coalescing small requests with concurrent ones.
+
+        Args:
+            texts: List of text strings
+
+        Returns:
+            List of embedding vectors, in input order
+        """
+        if len(texts) >= self.max_batch_size or self._closed:
+            self.bypassed += 1
+            return self.embedder.generate_embeddings(texts)
+
+        try:
+            futures = [self.submit(text) for text in texts]
+        except RuntimeError:
+            # Closed meanwhile; texts already queued are still flushed or failed by close()
+            return self.embedder.generate_embeddings(texts)
+        return [future.result() for future in futures]
+
+    def _collect_batch(self) -> Optional[list]:
+        """Block for the next item, then gather more until size or time limit."""
+        first = self._queue.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        deadline = first[2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Close requested: flush what we have, then stop
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        """Worker loop: flush batches until closed."""
+        while True:
+            batch = self._collect_batch()
+            if batch is None:
+                return
+
+            flushed_at = time.perf_counter()
+            for _, _, enqueued_at in batch:
+                self.queue_wait_ms.observe((flushed_at - enqueued_at) * 1000)
+            self.batch_sizes.observe(len(batch))
+            self.batches += 1
+
+            texts = [text for text, _, _ in batch]
+            try:
+                vectors = self.embedder.generate_embeddings(texts)
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future, _), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+    def stats(self) -> Dict:
+        """Get batch-size and queue-wait histograms."""
+        return {
+            "batches": self.batches,
+            "bypassed": self.bypassed,
+            "pending": self._queue.qsize(),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+        }
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """
+        Flush pending requests and stop the worker thread.
+
+        If the worker does not stop within the timeout it keeps running until
+        it reaches the stop sentinel; once stopped, anything still queued is
+        failed so no caller waits forever.
+        """
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join(timeout)
+        if not self._worker.is_alive():
+            self._fail_pending()
+
+    def _fail_pending(self):
+        """Fail the futures of items left in the queue after the worker stopped."""
+        error = RuntimeError("EmbeddingDispatcher is closed")
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None and not item[1].done():
+                item[1].set_exception(error)
@@ -5,57 +5,64 @@ Extracts text from PDF resumes and saves to CSV for ChromaDB ingestion
 
 import os
 import csv
+import sys
+import time
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 import pandas as pd
 
-try:
-    import PyPDF2
-    HAS_PYPDF2 = True
-except ImportError:
-    HAS_PYPDF2 = False
-
-try:
-    import pdfplumber
-    HAS_PDFPLUMBER = True
-except ImportError:
-    HAS_PDFPLUMBER = False
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from Backend.utils.supervisor import SupervisedWorkers, Quarantine
+from Backend.utils.pdf_extraction import (
+    PdfTextExtractor, pdf_digest, extract_text_pdfplumber, extract_text_pypdf2,
+    HAS_PYPDF2, HAS_PDFPLUMBER,
+)
 
 # Configuration
 DATA_PATH = Path(__file__).parent.parent / "Data"
 CV_SAMPLES_PATH = DATA_PATH / "raw" / "cv_samples" / "data" / "data"
 OUTPUT_CSV_PATH = DATA_PATH / "resumes_extracted.csv"
 BATCH_SIZE = 50
+QUARANTINE_PATH = DATA_PATH / "pdf_quarantine.jsonl"  # PDFs that failed extraction (shared with the app)
+TEXT_CACHE_PATH = DATA_PATH / "pdf_text_cache.sqlite"  # Extracted text by PDF hash (shared with the app)
+EXTRACT_WORKERS = os.cpu_count() or 1  # Worker processes
+TASK_CHUNKSIZE = 8  # PDFs sent to a worker per task
+EXTRACT_TIMEOUT_SECONDS = 60  # Wall-clock limit per PDF
+EXTRACT_MEMORY_MB = 1024  # Memory a worker may allocate per PDF on top of its start size
+MAX_PAGES = 20  # Only the first pages of longer PDFs are read
+SLOWEST_FILES_SHOWN = 5
 
 
 class ResumeExtractor:
     """Extracts text from PDF resumes using available libraries."""
     
-    def __init__(self, use_pdfplumber: bool = True):
+    def __init__(self, use_pdfplumber: bool = True, verbose: bool = True, max_pages: int = MAX_PAGES,
+                 cache_path: Optional[str] = TEXT_CACHE_PATH):
         """
         Initialize the extractor.
         
         Args:
             use_pdfplumber: Prefer pdfplumber if available (better for formatted PDFs)
+            verbose: Print the extraction libraries in use
+            max_pages: Only the first pages of longer PDFs are read
+            cache_path: Extracted text cache shared with the app (None = always parse)
         """
         self.use_pdfplumber = use_pdfplumber and HAS_PDFPLUMBER
         self.use_pypdf2 = HAS_PYPDF2
+        self.max_pages = max_pages
         
-        if not (self.use_pdfplumber or self.use_pypdf2):
-            raise ImportError("Neither PyPDF2 nor pdfplumber installed. Install with: pip install PyPDF2 pdfplumber")
+        # Raises ImportError if neither library is installed
+        self.text_extractor = PdfTextExtractor(cache_path, max_pages=max_pages, use_pdfplumber=use_pdfplumber)
         
-        print(f"Using PDF extraction: pdfplumber={self.use_pdfplumber}, PyPDF2={self.use_pypdf2}")
+        if verbose:
+            print(f"Using PDF extraction: pdfplumber={self.use_pdfplumber}, PyPDF2={self.use_pypdf2}")
     
     def extract_text_pdfplumber(self, pdf_path: str) -> Optional[str]:
         """Extract text using pdfplumber (better for formatted PDFs)."""
         try:
-            text_parts = []
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text:
-                        text_parts.append(text)
-            return "\n".join(text_parts) if text_parts else None
+            return extract_text_pdfplumber(Path(pdf_path).read_bytes(), self.max_pages)
+        except MemoryError:
+            raise  # Reported by the supervisor
         except Exception as e:
             print(f"  Error extracting with pdfplumber: {e}")
             return None
@@ -63,44 +70,55 @@ class ResumeExtractor:
     def extract_text_pypdf2(self, pdf_path: str) -> Optional[str]:
         """Extract text using PyPDF2 (fallback method)."""
         try:
-            text_parts = []
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                for page in reader.pages:
-                    text = page.extract_text()
-                    if text:
-                        text_parts.append(text)
-            return "\n".join(text_parts) if text_parts else None
+            return extract_text_pypdf2(Path(pdf_path).read_bytes(), self.max_pages)
+        except MemoryError:
+            raise  # Reported by the supervisor
         except Exception as e:
             print(f"  Error extracting with PyPDF2: {e}")
             return None
     
-    def extract(self, pdf_path: str) -> Optional[str]:
+    def extract_cached(self, pdf_path: str) -> Tuple[Optional[str], bool]:
         """
-        Extract text from PDF using best available method.
+        Extract text from PDF, reusing the cached text of an identical file.
         
         Args:
             pdf_path: Path to PDF file
         
         Returns:
-            Extracted text or None if extraction fails
+            (text or None if extraction fails, whether the text came from the cache)
         """
         if not os.path.exists(pdf_path):
-            return None
+            return None, False
+        
+        data = Path(pdf_path).read_bytes()
+        digest = pdf_digest(data)
+        found, text = self.text_extractor.lookup(digest)
+        if found:
+            return text, True
         
-        # Try preferred method first
-        if self.use_pdfplumber:
-            text = self.extract_text_pdfplumber(pdf_path)
-            if text:
-                return text
+        # pdfplumber first, PyPDF2 as fallback
+        try:
+            text = self.text_extractor.extract_uncached(data)
+        except MemoryError:
+            raise  # Reported by the supervisor
+        except Exception as e:
+            print(f"  Error extracting {pdf_path}: {e}")
+            return None, False
+        
+        self.text_extractor.store(digest, text)
+        return text, False
+    
+    def extract(self, pdf_path: str) -> Optional[str]:
+        """
+        Extract text from PDF using best available method.
         
-        # Fallback to PyPDF2
-        if self.use_pypdf2:
-            text = self.extract_text_pypdf2(pdf_path)
-            if text:
-                return text
+        Args:
+            pdf_path: Path to PDF file
         
-        return None
+        Returns:
+            Extracted text or None if extraction fails
+        """
+        return self.extract_cached(pdf_path)[0]
 
 
 def find_resume_files(cv_path: Optional[str] = None) -> Dict[str, List[Tuple[str, str]]]:
@@ -145,13 +163,88 @@ def find_resume_files(cv_path: Optional[str] = None) -> Dict[str, List[Tuple[str
     return resumes_by_category
 
 
-def extract_all_resumes(output_path: Optional[str] = None, cv_path: Optional[str] = None) -> int:
+# Extractor of the current worker process (created once per process)
+_worker_extractor: Optional[ResumeExtractor] = None
+
+
+def _init_worker():
+    """Worker initializer: create the worker's extractor."""
+    global _worker_extractor
+    _worker_extractor = ResumeExtractor(verbose=False)
+
+
+def _extract_task(task: Tuple[str, str]) -> Tuple[Optional[str], bool]:
+    """
+    Extract one PDF in a worker process.
+    
+    Args:
+        task: (category, pdf_path)
+    
+    Returns:
+        (extracted text or None, whether it came from the cache)
+    """
+    return _worker_extractor.extract_cached(task[1])
+
+
+def _file_digest(pdf_path: str) -> str:
+    """SHA-256 of a file (quarantine key)."""
+    return pdf_digest(Path(pdf_path).read_bytes())
+
+
+def _iter_extracted(tasks: List[Tuple[str, str]], workers: int, chunksize: int, ordered: bool):
+    """
+    Yield extraction results as they become available.
+    
+    PDFs are extracted by supervised worker processes, sent in chunks of
+    `chunksize` tasks. Each PDF gets EXTRACT_TIMEOUT_SECONDS and
+    EXTRACT_MEMORY_MB; a worker that hangs, runs out of memory or crashes is
+    replaced and the rest of its chunk is retried. Results arrive in
+    completion order unless `ordered` is set.
+    
+    Yields:
+        supervisor.TaskResult per PDF (task = (category, pdf_path), value = (text, cached))
+    """
+    with SupervisedWorkers(_extract_task, workers=workers, timeout=EXTRACT_TIMEOUT_SECONDS,
+                           memory_mb=EXTRACT_MEMORY_MB, initializer=_init_worker) as supervisor:
+        yield from supervisor.imap(tasks, chunksize=chunksize, ordered=ordered)
+        if supervisor.restarts:
+            print(f"  ⚠ Replaced {supervisor.restarts} hung or crashed worker(s)")
+
+
+def _print_timings(timings: List[Tuple[str, float]], wall_seconds: float, workers: int):
+    """Print throughput and per-file extraction timings."""
+    if not timings:
+        return
+    
+    seconds = sorted(t for _, t in timings)
+    print(f"⏱  {len(timings)} PDFs in {wall_seconds:.1f}s with {workers} worker(s): "
+          f"{len(timings) / wall_seconds:.1f} PDFs/s")
+    print(f"   Per file: mean {sum(seconds) / len(seconds) * 1000:.0f}ms, "
+          f"p50 {seconds[len(seconds) // 2] * 1000:.0f}ms, "
+          f"p95 {seconds[min(int(len(seconds) * 0.95), len(seconds) - 1)] * 1000:.0f}ms, "
+          f"max {seconds[-1] * 1000:.0f}ms")
+    print(f"   Slowest files:")
+    for pdf_path, t in sorted(timings, key=lambda item: -item[1])[:SLOWEST_FILES_SHOWN]:
+        print(f"     {t * 1000:.0f}ms  {pdf_path}")
+
+
+def extract_all_resumes(output_path: Optional[str] = None, cv_path: Optional[str] = None,
+                        workers: int = EXTRACT_WORKERS, chunksize: int = TASK_CHUNKSIZE,
+                        ordered: bool = False) -> int:
     """
     Extract text from all resume PDFs and save to CSV.
     
+    Rows are written as each PDF finishes, so memory use does not grow with
+    the number of resumes. Unchanged PDFs reuse their cached text. PDFs that
+    time out, exceed the memory cap or crash their worker are added to the
+    quarantine list and skipped on later runs.
+    
     Args:
         output_path: Path to save extracted resumes CSV
         cv_path: Path to CV samples root directory
+        workers: Number of extraction processes
+        chunksize: PDFs sent to a worker per task
+        ordered: Write rows in category/file order instead of completion order
     
     Returns:
         Number of successfully extracted resumes
@@ -166,53 +259,79 @@ def extract_all_resumes(output_path: Optional[str] = None, cv_path: Optional[str
         print("No resume PDFs found!")
         return 0
     
-    # Initialize extractor
+    # Check that an extractor can be created (workers create their own)
     try:
-        extractor = ResumeExtractor()
+        ResumeExtractor()
     except ImportError as e:
         print(f"Error: {e}")
         return 0
     
+    tasks = [task for resumes in resumes_by_category.values() for task in resumes]
+    
+    # Skip PDFs that failed in earlier runs
+    quarantine = Quarantine(QUARANTINE_PATH)
+    if len(quarantine):
+        kept = [task for task in tasks if _file_digest(task[1]) not in quarantine]
+        if len(kept) < len(tasks):
+            print(f"Skipping {len(tasks) - len(kept)} quarantined PDFs (see {QUARANTINE_PATH})")
+        tasks = kept
+    if not tasks:
+        print("No resume PDFs left to extract!")
+        return 0
+    workers = max(1, min(workers, len(tasks)))
+    
     # Extract and save
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
     
     extracted_count = 0
     error_count = 0
+    quarantined_count = 0
+    cached_count = 0
+    timings: List[Tuple[str, float]] = []
+    started = time.perf_counter()
     
     with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
         fieldnames = ['resume_id', 'category', 'file_path', 'resume_text']
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
         writer.writeheader()
         
-        for category, resumes in resumes_by_category.items():
-            print(f"Processing {category}...")
+        print(f"Processing {len(tasks)} PDFs with {workers} worker(s)"
+              f"{' (ordered output)' if ordered else ''}...")
+        
+        for result in _iter_extracted(tasks, workers, chunksize, ordered):
+            (cat, pdf_path), (text, cached) = result.task, result.value or (None, False)
+            timings.append((pdf_path, result.seconds))
+            cached_count += int(cached)
             
-            for resume_id, (cat, pdf_path) in enumerate(resumes, start=1):
-                # Extract text
-                text = extractor.extract(pdf_path)
+            if result.error is not None:
+                quarantine.add(_file_digest(pdf_path), pdf_path, result.error)
+                quarantined_count += 1
+                error_count += 1
+                print(f"  ✗ Quarantined {pdf_path}: {result.error}")
+            elif text and len(text.strip()) > 20:
+                # Write to CSV
+                writer.writerow({
+                    'resume_id': Path(pdf_path).stem,  # Use filename as ID
+                    'category': cat,
+                    'file_path': pdf_path,
+                    'resume_text': text
+                })
+                extracted_count += 1
                 
-                if text and len(text.strip()) > 20:
-                    # Write to CSV
-                    writer.writerow({
-                        'resume_id': Path(pdf_path).stem,  # Use filename as ID
-                        'category': cat,
-                        'file_path': pdf_path,
-                        'resume_text': text
-                    })
-                    extracted_count += 1
-                    
-                    if extracted_count % BATCH_SIZE == 0:
-                        print(f"  ✓ Extracted {extracted_count} resumes...")
-                else:
-                    error_count += 1
-                    if error_count <= 5:  # Show first 5 errors
-                        print(f"  ✗ Failed to extract: {pdf_path}")
+                if extracted_count % BATCH_SIZE == 0:
+                    print(f"  ✓ Extracted {extracted_count} resumes...")
+            else:
+                error_count += 1
+                if error_count <= 5:  # Show first 5 errors
+                    print(f"  ✗ Failed to extract: {pdf_path}")
         
         # Summary
         print(f"\n--- Extraction Summary ---")
         print(f"✓ Successfully extracted: {extracted_count} resumes")
-        print(f"✗ Failed to extract: {error_count} resumes")
+        print(f"✗ Failed to extract: {error_count} resumes ({quarantined_count} quarantined)")
+        print(f"♻ Reused cached text of {cached_count} unchanged PDFs")
+        _print_timings(timings, time.perf_counter() - started, workers)
         print(f"Saved to: {output_file}\n")
     
     return extracted_count
@@ -223,8 +342,12 @@ if __name__ == "__main__":
     print("Resume PDF Text Extraction")
     print("=" * 60)
     
+    # Usage: python extract_resumes.py [--workers N] [--ordered]
+    args = sys.argv[1:]
+    workers = int(args[args.index("--workers") + 1]) if "--workers" in args else EXTRACT_WORKERS
+    
     # Extract all resumes
-    count = extract_all_resumes()
+    count = extract_all_resumes(workers=workers, ordered="--ordered" in args)
     
     if count > 0:
         print(f"✓ Extraction complete! {count} resumes ready for ChromaDB ingestion")
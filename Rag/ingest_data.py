@@ -17,13 +17,18 @@ import chromadb
 print("Step 2: Importing Pandas...")
 import pandas as pd
 
-print("Step 3: Importing Sentence Transformers (this may take a minute)...")
-from sentence_transformers import SentenceTransformer
+print("Step 3: Importing embedding backend...")
+from embedding_backends import load_embedding_model
+from collection_stats import CollectionStats, stats_path_for
+from ingestion_manifest import IngestionManifest, manifest_path_for, upsert_changed, prune_removed
+from skill_matcher import get_skill_matcher
+from csv_source import read_csv_chunks, prepare_job_rows, prepare_resume_rows
 
 print("\n✓ All imports successful!\n")
 
 # Configuration
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+EMBEDDING_BACKEND = "torch"  # "torch" or "onnx" (see embedding_backends.py)
 BATCH_SIZE = 32
 DATA_PATH = Path(__file__).parent.parent / "Data"
 DB_PATH = DATA_PATH / "chromadb"
@@ -47,16 +52,20 @@ def main():
     
     print(f"   - Resumes collection: {resumes_col.count()} documents")
     print(f"   - Jobs collection: {jobs_col.count()} documents")
+    stats = CollectionStats(stats_path_for(str(DB_PATH)))
+    stats.ensure(resumes_col)
+    stats.ensure(jobs_col)
+    manifest = IngestionManifest(manifest_path_for(str(DB_PATH)))
     
     # Load embedding model
-    print(f"\n3. Loading embedding model: {EMBEDDING_MODEL}")
-    model = SentenceTransformer(EMBEDDING_MODEL)
+    print(f"\n3. Loading embedding model: {EMBEDDING_MODEL} (backend: {EMBEDDING_BACKEND})")
+    model = load_embedding_model(EMBEDDING_MODEL, EMBEDDING_BACKEND)
     print(f"   ✓ Model loaded. Embedding dimension: {model.get_sentence_embedding_dimension()}")
     
     # Ingest resumes
     print(f"\n4. Ingesting resumes from {RESUMES_CSV.name}...")
     if RESUMES_CSV.exists():
-        ingest_resumes(resumes_col, model, RESUMES_CSV)
+        ingest_resumes(resumes_col, model, RESUMES_CSV, stats, manifest)
         print(f"   ✓ Total resumes in DB: {resumes_col.count()}")
     else:
         print(f"   ✗ File not found: {RESUMES_CSV}")
@@ -64,7 +73,7 @@ def main():
     # Ingest jobs
     print(f"\n5. Ingesting jobs from {JOBS_CSV.name}...")
     if JOBS_CSV.exists():
-        ingest_jobs(jobs_col, model, JOBS_CSV)
+        ingest_jobs(jobs_col, model, JOBS_CSV, stats, manifest)
         print(f"   ✓ Total jobs in DB: {jobs_col.count()}")
     else:
         print(f"   ✗ File not found: {JOBS_CSV}")
@@ -77,116 +86,98 @@ def main():
     print(f"Database location: {DB_PATH}")
 
 
-def ingest_resumes(collection, model, csv_path):
-    """Ingest resumes from CSV file."""
-    df = pd.read_csv(csv_path)
-    print(f"   Total resume records to process: {len(df)}")
+def _model_version() -> str:
+    """Embedding model identifier stored in the content hashes."""
+    return EMBEDDING_MODEL if EMBEDDING_BACKEND == "torch" else f"{EMBEDDING_MODEL}@{EMBEDDING_BACKEND}"
+
+
+def _ingest_rows(collection, rows, prepare, skill_matcher, seen_ids, manifest, source, encode, stats):
+    """
+    Embed and upsert the new or changed rows of a DataFrame.
+    Ids are added to seen_ids only once all rows are written.
     
-    documents = []
-    metadatas = []
-    ids = []
-    processed = 0
+    Returns:
+        (number of rows prepared, number of new or changed rows)
+    """
+    ids, documents, metadatas = prepare(rows, skill_matcher, seen_ids)
+    changed = 0
     
-    for idx, row in df.iterrows():
-        try:
-            resume_id = str(row.get('resume_id', idx))
-            resume_text = str(row.get('resume_text', '')).strip()
-            category = str(row.get('category', 'unknown')).strip()
-            
-            if not resume_text or len(resume_text) < 20:
-                continue
-            
-            documents.append(resume_text)
-            metadatas.append({
-                "resume_id": resume_id,
-                "category": category,
-            })
-            ids.append(f"resume_{resume_id}")
-            
-            # Process in batches
-            if len(documents) >= BATCH_SIZE:
-                embeddings = model.encode(documents, show_progress_bar=False)
-                collection.add(
-                    ids=ids,
-                    embeddings=embeddings.tolist(),
-                    documents=documents,
-                    metadatas=metadatas
-                )
-                processed += len(documents)
-                print(f"     Processed {processed}/{len(df)} resumes...")
-                documents, metadatas, ids = [], [], []
-        except Exception as e:
-            print(f"     Error processing resume {idx}: {e}")
-            continue
+    # Process in batches (unchanged rows are skipped)
+    for start in range(0, len(ids), BATCH_SIZE):
+        batch = slice(start, start + BATCH_SIZE)
+        changed += sum(upsert_changed(collection, manifest, source, ids[batch], documents[batch],
+                                      metadatas[batch], encode, stats, _model_version()))
+    seen_ids.update(ids)
+    return len(ids), changed
+
+
+def _ingest_csv(collection, model, csv_path, columns, prepare, label, stats=None, manifest=None):
+    """
+    Stream a CSV into a collection in chunks.
     
-    # Process remaining batch
-    if documents:
-        embeddings = model.encode(documents, show_progress_bar=False)
-        collection.add(
-            ids=ids,
-            embeddings=embeddings.tolist(),
-            documents=documents,
-            metadatas=metadatas
-        )
-        processed += len(documents)
-        print(f"     Final batch processed. Total: {processed} resumes")
-
-
-def ingest_jobs(collection, model, csv_path):
-    """Ingest job descriptions from CSV file."""
-    df = pd.read_csv(csv_path)
-    print(f"   Total job records to process: {len(df)}")
+    A chunk that fails is retried row by row, so one malformed row only
+    loses itself. If any row failed, removed rows are not pruned, since the
+    failed rows would otherwise be deleted from the collection.
+    """
+    skill_matcher = get_skill_matcher()  # Skills are stored in the metadata for the services
+    manifest = manifest or IngestionManifest(manifest_path_for(str(DB_PATH)))
+    encode = lambda texts: model.encode(texts, show_progress_bar=False).tolist()
+    source = Path(csv_path).name
     
-    documents = []
-    metadatas = []
-    ids = []
+    seen_ids = set()
     processed = 0
+    changed = 0
+    failed = 0
     
-    for idx, row in df.iterrows():
+    # Stream the CSV in chunks; rows are prepared column-wise
+    for chunk in read_csv_chunks(csv_path, columns):
         try:
-            job_title = str(row.get('Job Title', '')).strip()
-            job_desc = str(row.get('Job Description', '')).strip()
-            
-            if not job_title or not job_desc:
-                continue
-            
-            # Combine title and description
-            combined_text = f"{job_title}. {job_desc}"
-            
-            documents.append(combined_text)
-            metadatas.append({
-                "job_title": job_title[:100],
-                "job_index": str(idx)
-            })
-            ids.append(f"job_{idx}")
-            
-            # Process in batches
-            if len(documents) >= BATCH_SIZE:
-                embeddings = model.encode(documents, show_progress_bar=False)
-                collection.add(
-                    ids=ids,
-                    embeddings=embeddings.tolist(),
-                    documents=documents,
-                    metadatas=metadatas
-                )
-                processed += len(documents)
-                print(f"     Processed {processed}/{len(df)} jobs...")
-                documents, metadatas, ids = [], [], []
+            chunk_processed, chunk_changed = _ingest_rows(collection, chunk, prepare, skill_matcher, seen_ids,
+                                                          manifest, source, encode, stats)
+            processed += chunk_processed
+            changed += chunk_changed
         except Exception as e:
-            print(f"     Error processing job {idx}: {e}")
-            continue
+            print(f"     Error processing {label} {chunk.index[0]}-{chunk.index[-1]}: {e}; retrying row by row")
+            for position in range(len(chunk)):
+                try:
+                    row_processed, row_changed = _ingest_rows(collection, chunk.iloc[[position]], prepare,
+                                                              skill_matcher, seen_ids, manifest, source,
+                                                              encode, stats)
+                    processed += row_processed
+                    changed += row_changed
+                except Exception as row_error:
+                    print(f"     Error processing {label} row {chunk.index[position]}: {row_error}")
+                    failed += 1
+        print(f"     Processed {processed} {label} ({changed} new or changed)...")
+    
+    if failed:
+        print(f"     {failed} {label} rows failed; not removing {label} missing from {source} in this run")
+        return
+    removed = prune_removed(collection, manifest, source, seen_ids, stats)
+    if removed:
+        print(f"     Removed {removed} {label} no longer in {source}")
+
+
+def ingest_resumes(collection, model, csv_path, stats=None, manifest=None):
+    """
+    Ingest resumes from CSV file (stats: optional CollectionStats to update).
+    
+    Only new or changed rows are embedded and upserted; resumes no longer in
+    the CSV are deleted (manifest: IngestionManifest, default location if None).
+    """
+    _ingest_csv(collection, model, csv_path, ["resume_id", "resume_text", "category"],
+                prepare_resume_rows, "resumes", stats, manifest)
+
+
+def ingest_jobs(collection, model, csv_path, stats=None, manifest=None):
+    """
+    Ingest job descriptions from CSV file (stats: optional CollectionStats to update).
     
-    # Process remaining batch
-    if documents:
-        embeddings = model.encode(documents, show_progress_bar=False)
-        collection.add(
-            ids=ids,
-            embeddings=embeddings.tolist(),
-            documents=documents,
-            metadatas=metadatas
-        )
-        processed += len(documents)
-        print(f"     Final batch processed. Total: {processed} jobs")
+    Only new or changed rows are embedded and upserted; jobs no longer in
+    the CSV are deleted (manifest: IngestionManifest, default location if None).
+    """
+    _ingest_csv(collection, model, csv_path, ["Job Title", "Job Description"],
+                prepare_job_rows, "jobs", stats, manifest)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,245 @@
+"""
+Ingestion Manifest
+Document and metadata hashes per ingested document id, so re-running
+ingestion embeds only new or changed documents, updates changed metadata in
+place and deletes rows that left the source
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from chroma_setup import CHROMA_DB_PATH
+
+# Configuration
+MANIFEST_FILENAME = "ingestion_manifest.sqlite"
+LOOKUP_PAGE_SIZE = 500  # Ids per SQL / Chroma lookup or delete
+
+
+def manifest_path_for(db_path: Optional[str] = None) -> Path:
+    """Location of the ingestion manifest for a ChromaDB directory."""
+    return Path(db_path or CHROMA_DB_PATH) / MANIFEST_FILENAME
+
+
+def _hash_parts(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def document_hash(document: str, version: str = "") -> str:
+    """
+    Hash of what determines a row's embedding.
+
+    Args:
+        document: Document text
+        version: Embedding model identifier (a new model re-embeds everything)
+    """
+    return _hash_parts(version, document)
+
+
+def metadata_hash(metadata: Dict) -> str:
+    """Hash of a row's metadata (a change only needs a metadata update)."""
+    return _hash_parts(json.dumps(metadata, sort_keys=True))
+
+
+def _legacy_content_hash(document: str, metadata: Dict, version: str = "") -> str:
+    """Combined hash recorded by manifests written before the split hashes."""
+    return _hash_parts(version, document, json.dumps(metadata, sort_keys=True))
+
+
+def _pages(items: List, size: int = LOOKUP_PAGE_SIZE) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class IngestionManifest:
+    """
+    SQLite table of (collection, document id) -> source, document hash,
+    metadata hash and metadata of the ingested rows. The metadata is kept so
+    removed or replaced rows can be subtracted from the collection stats
+    without reading them back from Chroma.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: SQLite file of the manifest (defaults to Data/chromadb)
+        """
+        self.path = Path(path) if path else manifest_path_for()
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "collection TEXT NOT NULL, doc_id TEXT NOT NULL, source TEXT NOT NULL, "
+            "document_hash TEXT NOT NULL, metadata_hash TEXT, metadata TEXT NOT NULL, "
+            "PRIMARY KEY (collection, doc_id))"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(documents)")}
+        if "content_hash" in columns:
+            # Older manifest with one combined hash: its rows keep a NULL metadata hash
+            self._conn.execute("ALTER TABLE documents RENAME COLUMN content_hash TO document_hash")
+            self._conn.execute("ALTER TABLE documents ADD COLUMN metadata_hash TEXT")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS documents_source ON documents (collection, source)"
+        )
+        self._conn.commit()
+
+    def get_many(self, collection_name: str, doc_ids: List[str]) -> Dict[str, Tuple[str, Optional[str], Dict]]:
+        """Recorded (document hash, metadata hash, metadata) of the given ids that are in the manifest."""
+        found = {}
+        with self._lock:
+            for page in _pages(doc_ids):
+                rows = self._conn.execute(
+                    f"SELECT doc_id, document_hash, metadata_hash, metadata FROM documents "
+                    f"WHERE collection = ? AND doc_id IN ({','.join('?' * len(page))})",
+                    [collection_name, *page]
+                ).fetchall()
+                for doc_id, doc_digest, meta_digest, metadata in rows:
+                    found[doc_id] = (doc_digest, meta_digest, json.loads(metadata))
+        return found
+
+    def put_many(self, collection_name: str, source: str, rows: List[Tuple[str, str, str, Dict]]):
+        """Record (doc id, document hash, metadata hash, metadata) rows of a source."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO documents "
+                "(collection, doc_id, source, document_hash, metadata_hash, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(collection_name, doc_id, source, doc_digest, meta_digest, json.dumps(metadata))
+                 for doc_id, doc_digest, meta_digest, metadata in rows]
+            )
+            self._conn.commit()
+
+    def ids_for_source(self, collection_name: str, source: str) -> Set[str]:
+        """Ids recorded for one source of a collection."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT doc_id FROM documents WHERE collection = ? AND source = ?",
+                (collection_name, source)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def remove_many(self, collection_name: str, doc_ids: List[str]):
+        """Forget the given ids."""
+        with self._lock:
+            for page in _pages(doc_ids):
+                self._conn.execute(
+                    f"DELETE FROM documents WHERE collection = ? AND doc_id IN ({','.join('?' * len(page))})",
+                    [collection_name, *page]
+                )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def upsert_changed(collection, manifest: IngestionManifest, source: str,
+                   ids: List[str], documents: List[str], metadatas: List[Dict],
+                   encode: Callable[[List[str]], List[List[float]]],
+                   stats=None, version: str = "") -> Tuple[int, int]:
+    """
+    Write the rows of a batch that are new or changed.
+
+    Rows whose document and metadata hashes match the manifest are skipped.
+    New rows and rows with a changed document are embedded and upserted;
+    rows where only the metadata changed (e.g. new skills) get a metadata
+    update without being embedded again. Ids that are in the collection but
+    not in the manifest (ingested before the manifest existed) are treated
+    as changed, so they are neither duplicated nor counted twice in the stats.
+
+    Args:
+        collection: ChromaDB collection
+        manifest: Ingestion manifest
+        source: Name of the source the rows come from (e.g. the CSV file name)
+        ids, documents, metadatas: Rows of the batch
+        encode: Function returning embeddings for a list of texts
+        stats: Optional CollectionStats to update
+        version: Embedding model identifier, part of the document hash
+
+    Returns:
+        (number of new rows, number of changed rows)
+    """
+    doc_hashes = [document_hash(doc, version) for doc in documents]
+    meta_hashes = [metadata_hash(meta) for meta in metadatas]
+    known = manifest.get_many(collection.name, ids)
+
+    reembed, relabel = [], []
+    for i, doc_id in enumerate(ids):
+        if doc_id not in known:
+            reembed.append(i)
+            continue
+        old_doc_hash, old_meta_hash, old_meta = known[doc_id]
+        if old_meta_hash is None:
+            same_document = old_doc_hash == _legacy_content_hash(documents[i], old_meta, version)
+        else:
+            same_document = old_doc_hash == doc_hashes[i]
+        if not same_document:
+            reembed.append(i)
+        elif old_meta_hash != meta_hashes[i]:
+            relabel.append(i)
+    changed = reembed + relabel
+    if not changed:
+        return 0, 0
+
+    # Previous metadata of replaced rows (from Chroma for rows the manifest does not know)
+    old_metadatas = {ids[i]: known[ids[i]][2] for i in changed if ids[i] in known}
+    unknown = [ids[i] for i in reembed if ids[i] not in known]
+    for page in _pages(unknown):
+        existing = collection.get(ids=page, include=["metadatas"])
+        for doc_id, meta in zip(existing["ids"], existing["metadatas"]):
+            old_metadatas[doc_id] = meta or {}
+
+    if reembed:
+        collection.upsert(
+            ids=[ids[i] for i in reembed],
+            embeddings=encode([documents[i] for i in reembed]),
+            documents=[documents[i] for i in reembed],
+            metadatas=[metadatas[i] for i in reembed]
+        )
+    if relabel:
+        collection.update(ids=[ids[i] for i in relabel], metadatas=[metadatas[i] for i in relabel])
+    if stats is not None:
+        if old_metadatas:
+            stats.record_removed(collection.name, list(old_metadatas.values()))
+        stats.record_added(collection.name, [metadatas[i] for i in changed])
+        stats.save()
+    manifest.put_many(collection.name, source,
+                      [(ids[i], doc_hashes[i], meta_hashes[i], metadatas[i]) for i in changed])
+
+    updated = len(old_metadatas)
+    return len(changed) - updated, updated
+
+
+def prune_removed(collection, manifest: IngestionManifest, source: str, seen_ids: Set[str],
+                  stats=None) -> int:
+    """
+    Delete the rows of a source that were not seen in the latest run.
+
+    Args:
+        collection: ChromaDB collection
+        manifest: Ingestion manifest
+        source: Name of the source that was ingested
+        seen_ids: Ids produced by the source in this run
+        stats: Optional CollectionStats to update
+
+    Returns:
+        Number of deleted rows
+    """
+    removed = sorted(manifest.ids_for_source(collection.name, source) - seen_ids)
+    for page in _pages(removed):
+        old_metadatas = [meta for _, _, meta in manifest.get_many(collection.name, page).values()]
+        collection.delete(ids=page)
+        if stats is not None:
+            stats.record_removed(collection.name, old_metadatas)
+            stats.save()
+        manifest.remove_many(collection.name, page)
+    return len(removed)
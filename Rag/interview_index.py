@@ -0,0 +1,277 @@
+"""
+Interview Question Index
+Offline stage over the job_descriptions collection: extracts skills and
+requirement phrases per job and stores candidate interview questions by
+job id, so question generation at request time is a lookup
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+
+from chroma_setup import CHROMA_DB_PATH
+from skill_matcher import get_skill_matcher
+
+if TYPE_CHECKING:
+    from term_index import TermIndex
+
+# Configuration
+INTERVIEW_INDEX_DIRNAME = "interview_index"
+SKILLS_PER_JOB = 3
+REQUIREMENTS_PER_JOB = 4
+QUESTIONS_PER_JOB = 6
+LLM_BATCH_SIZE = 5
+BUILD_PAGE_SIZE = 500
+
+# Requirement phrases: the cue and the question template for what follows it
+REQUIREMENT_PATTERNS = [
+    (r"(?:experience|expertise) (?:with|in|of)", "Tell me about your experience with {}. What did you deliver and what was the result?"),
+    (r"(?:knowledge|understanding) of", "How have you applied your knowledge of {} in practice?"),
+    (r"(?:proficien(?:t|cy)|skilled|fluent) (?:in|with)", "How would you rate your proficiency in {}, and what is the hardest problem you solved with it?"),
+    (r"familiar(?:ity)? with", "Which projects have you used {} in, and what was your role?"),
+    (r"ability to", "Give an example that shows your ability to {}."),
+    (r"responsible for", "This role is responsible for {}. How have you handled similar responsibilities?"),
+    (r"degree in", "How has your background in {} prepared you for this role?"),
+]
+SKILL_QUESTION = "Walk me through a project where you used {}. What would you do differently today?"
+
+_requirement_res = [
+    (re.compile(rf"\b{cue}\s+([^.;:\n•●]{{3,80}})", re.IGNORECASE), template)
+    for cue, template in REQUIREMENT_PATTERNS
+]
+
+
+def interview_index_path_for(collection_name: str, db_path: Optional[str] = None) -> Path:
+    """Location of a collection's question index inside the ChromaDB directory."""
+    return Path(db_path or CHROMA_DB_PATH) / INTERVIEW_INDEX_DIRNAME / f"{collection_name}.json"
+
+
+def _clean_phrase(phrase: str, max_words: int = 8) -> str:
+    """Trim a matched phrase to a short, question-friendly object."""
+    # Stop where the next requirement starts ("... and the ability to ...")
+    phrase = re.split(r"(?:,|\s(?:and|or))\s+(?:the\s+)?(?:ability|experience|knowledge|understanding|familiarity)\b",
+                      phrase, maxsplit=1)[0]
+    words = phrase.strip(" ,-()").split()
+    return " ".join(words[:max_words]).rstrip(",")
+
+
+def extract_requirements(text: str, limit: int = REQUIREMENTS_PER_JOB) -> List[Dict[str, str]]:
+    """
+    Find requirement phrases in a job description.
+
+    Args:
+        text: Job description
+        limit: Maximum number of phrases
+
+    Returns:
+        List of {"phrase", "question"} dictionaries, in text order, without duplicates
+    """
+    found = []
+    for pattern, template in _requirement_res:
+        for match in pattern.finditer(text):
+            phrase = _clean_phrase(match.group(1))
+            if len(phrase) >= 3:
+                found.append((match.start(), phrase, template.format(phrase)))
+
+    seen = set()
+    requirements = []
+    for _, phrase, question in sorted(found):
+        key = phrase.lower()
+        if key not in seen:
+            seen.add(key)
+            requirements.append({"phrase": phrase, "question": question})
+        if len(requirements) >= limit:
+            break
+    return requirements
+
+
+def top_terms(term_index: "TermIndex", doc_id: str, k: int = SKILLS_PER_JOB) -> List[str]:
+    """Highest count x IDF terms of one indexed document."""
+    row = term_index.row_of.get(doc_id)
+    if row is None:
+        return []
+    start, end = term_index.counts.indptr[row], term_index.counts.indptr[row + 1]
+    columns = term_index.counts.indices[start:end]
+    scores = term_index.counts.data[start:end] * term_index.idf[columns]
+    best = columns[np.argsort(-scores, kind="stable")[:k]]
+    return [term_index.terms[i] for i in best]
+
+
+class InterviewQuestionIndex:
+    """Candidate interview questions, skills and requirements per job id."""
+
+    def __init__(self, jobs: Dict[str, Dict], generation: Optional[int] = None):
+        """
+        Args:
+            jobs: job id -> {"title", "skills", "requirements", "questions"}
+            generation: Collection stats generation the index was built at
+        """
+        self.jobs = jobs
+        self.generation = generation
+
+    def lookup(self, job_ids: List[str], max_questions: int = QUESTIONS_PER_JOB) -> Dict[str, List[str]]:
+        """
+        Merge the entries of the retrieved jobs.
+
+        Questions are taken round-robin across jobs (best match first) so each
+        job contributes; duplicates are dropped.
+
+        Args:
+            job_ids: Ids of the retrieved jobs, best match first
+            max_questions: Maximum number of questions
+
+        Returns:
+            Dictionary with "questions", "skills" and "titles" lists
+        """
+        entries = [self.jobs[job_id] for job_id in job_ids if job_id in self.jobs]
+
+        questions: List[str] = []
+        seen = set()
+        for rank in range(max((len(e["questions"]) for e in entries), default=0)):
+            for entry in entries:
+                if rank < len(entry["questions"]) and len(questions) < max_questions:
+                    question = entry["questions"][rank]
+                    if question.lower() not in seen:
+                        seen.add(question.lower())
+                        questions.append(question)
+
+        skills = list(dict.fromkeys(skill for entry in entries for skill in entry["skills"]))
+        titles = [entry["title"] for entry in entries]
+        return {"questions": questions, "skills": skills, "titles": titles}
+
+    def save(self, path: str):
+        """Write the index as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"generation": self.generation, "jobs": self.jobs}, f)
+
+    @classmethod
+    def load(cls, path: str) -> "InterviewQuestionIndex":
+        """Load an index written by save()."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["jobs"], data.get("generation"))
+
+
+def _generate_llm_questions(entries: List[Dict], per_job: int = 3) -> Dict[str, List[str]]:
+    """
+    Ask Ollama for questions for a batch of jobs in one prompt.
+
+    Args:
+        entries: Dictionaries with "id", "title", "skills" and "requirements" (phrases)
+        per_job: Questions requested per job
+
+    Returns:
+        job id -> generated questions (jobs the model skipped are missing)
+    """
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from Backend.utils.ollama_client import get_ollama_client
+
+    lines = []
+    for entry in entries:
+        focus = ", ".join(entry["skills"] + entry["requirements"])
+        lines.append(f"[{entry['id']}] {entry['title']} | focus: {focus}")
+    prompt = (
+        f"Write {per_job} specific technical or behavioural interview questions for each job below.\n"
+        "Answer with one question per line in the form: [job id] question\n"
+        "Do not add anything else.\n\n" + "\n".join(lines)
+    )
+
+    questions: Dict[str, List[str]] = {}
+    for line in get_ollama_client().generate(prompt).splitlines():
+        match = re.match(r"\s*\[([^\]]+)\]\s*(.+\?)\s*$", line)
+        if match:
+            questions.setdefault(match.group(1).strip(), []).append(match.group(2).strip())
+    return questions
+
+
+def build_interview_index(collection, term_index: Optional["TermIndex"] = None, use_llm: bool = False,
+                          generation: Optional[int] = None,
+                          page_size: int = BUILD_PAGE_SIZE) -> InterviewQuestionIndex:
+    """
+    Build the question index from all jobs of a collection (one paged scan).
+
+    Args:
+        collection: ChromaDB job_descriptions collection
+        term_index: Term index of the collection, for per-job skills when the skill matcher finds none
+        use_llm: Also generate questions with Ollama, in batches of LLM_BATCH_SIZE jobs
+        generation: Collection stats generation to record
+        page_size: Documents fetched per page
+
+    Returns:
+        InterviewQuestionIndex
+    """
+    jobs: Dict[str, Dict] = {}
+    skill_matcher = get_skill_matcher()
+    total = collection.count()
+    for offset in range(0, total, page_size):
+        page = collection.get(limit=page_size, offset=offset, include=["documents", "metadatas"])
+        for doc_id, doc, meta in zip(page["ids"], page["documents"], page["metadatas"]):
+            meta = meta or {}
+            skills = sorted(skill_matcher.document_skills(doc or "", meta))[:SKILLS_PER_JOB]
+            if not skills and term_index is not None:
+                skills = top_terms(term_index, doc_id)
+            requirements = extract_requirements(doc or "")
+            questions = [r["question"] for r in requirements] + [SKILL_QUESTION.format(s) for s in skills]
+            jobs[doc_id] = {
+                "title": meta.get("job_title", "Unknown"),
+                "skills": skills,
+                "requirements": [r["phrase"] for r in requirements],
+                "questions": questions[:QUESTIONS_PER_JOB],
+            }
+        print(f"  ✓ Indexed {min(offset + page_size, total)}/{total} jobs")
+
+    if use_llm:
+        ids = list(jobs)
+        for start in range(0, len(ids), LLM_BATCH_SIZE):
+            batch = [dict(jobs[job_id], id=job_id) for job_id in ids[start:start + LLM_BATCH_SIZE]]
+            try:
+                generated = _generate_llm_questions(batch)
+            except Exception as e:
+                print(f"WARNING: LLM question generation failed for batch at {start}: {e}")
+                continue
+            for job_id, questions in generated.items():
+                if job_id in jobs:
+                    # LLM questions first, rule-based ones fill up the rest
+                    merged = list(dict.fromkeys(questions + jobs[job_id]["questions"]))
+                    jobs[job_id]["questions"] = merged[:QUESTIONS_PER_JOB]
+            print(f"  ✓ LLM questions for {min(start + LLM_BATCH_SIZE, len(ids))}/{len(ids)} jobs")
+
+    return InterviewQuestionIndex(jobs, generation)
+
+
+def load_interview_index(collection_name: str, db_path: Optional[str] = None) -> Optional[InterviewQuestionIndex]:
+    """Load a collection's question index, or None if it has not been built."""
+    path = interview_index_path_for(collection_name, db_path)
+    if not path.exists():
+        return None
+    return InterviewQuestionIndex.load(str(path))
+
+
+if __name__ == "__main__":
+    from chroma_setup import get_or_create_db
+    from collection_stats import CollectionStats, stats_path_for
+    from term_index import TermIndex, load_term_index, term_index_dir_for
+
+    use_llm = "--llm" in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != "--llm"]
+    db_path = args[0] if args else None
+
+    client, resumes_col, jobs_col = get_or_create_db(db_path)
+    stats = CollectionStats(stats_path_for(db_path))
+    stats.ensure(jobs_col)
+
+    term_index = load_term_index(jobs_col.name, db_path)
+    if term_index is None or term_index.generation != stats.generation:
+        term_index = TermIndex.from_collection(jobs_col, generation=stats.generation)
+        term_index.save(str(term_index_dir_for(jobs_col.name, db_path)))
+
+    print(f"--- Building interview question index for '{jobs_col.name}'{' (with Ollama)' if use_llm else ''} ---")
+    index = build_interview_index(jobs_col, term_index, use_llm=use_llm, generation=stats.generation)
+    index.save(str(interview_index_path_for(jobs_col.name, db_path)))
+    print(f"✓ Question index written: {len(index.jobs)} jobs -> {interview_index_path_for(jobs_col.name, db_path)}")
@@ -0,0 +1,307 @@
+"""
+Skill Matcher
+Aho-Corasick automaton over a skill taxonomy (seed skills plus skills
+mined from the job corpus) that finds normalized skills in a text in one
+linear pass
+"""
+
+import hashlib
+import json
+import re
+import sys
+import threading
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from chroma_setup import CHROMA_DB_PATH
+
+# Configuration
+VOCABULARY_FILENAME = "skill_vocabulary.json"
+SKILLS_FIELD = "skills"  # Metadata field holding the comma-separated skills of a document
+MIN_SKILL_DOC_FREQ = 5  # Mined skills must occur in at least this many job descriptions
+MAX_SKILL_WORDS = 3
+CACHE_MAX_ENTRIES = 10000
+MINE_PAGE_SIZE = 500
+
+# Canonical skill -> aliases (ambiguous words like "go", "react" or "excel"
+# only appear in unambiguous forms)
+SEED_SKILLS: Dict[str, List[str]] = {
+    # Software and data
+    "python": [], "java": [], "javascript": ["js"], "typescript": [], "c++": ["cpp"], "c#": ["csharp"],
+    "golang": [], "ruby": [], "php": [], "scala": [], "r programming": [], "sql": [],
+    "nosql": [], "html": [], "css": [], "react.js": ["reactjs", "react js"], "angular": ["angularjs"],
+    "node.js": ["nodejs", "node js"], "django": [], "flask": [], "spring boot": ["spring framework"],
+    "rest api": ["rest apis", "restful api", "restful apis"], "microservices": [],
+    "git": [], "linux": [], "docker": [], "kubernetes": ["k8s"], "terraform": [],
+    "aws": ["amazon web services"], "azure": ["microsoft azure"], "gcp": ["google cloud", "google cloud platform"],
+    "ci/cd": ["continuous integration", "continuous delivery"], "devops": [], "agile": [], "scrum": [],
+    "machine learning": ["ml"], "deep learning": [], "natural language processing": ["nlp"],
+    "computer vision": [], "data analysis": ["data analytics"], "data science": [],
+    "data visualization": [], "statistics": ["statistical analysis"], "big data": [],
+    "spark": ["apache spark", "pyspark"], "hadoop": [], "tableau": [], "power bi": ["powerbi"],
+    "microsoft excel": ["ms excel", "excel spreadsheets"], "pandas": [], "tensorflow": [], "pytorch": [],
+    "etl": [], "data warehousing": ["data warehouse"], "oracle": [], "sap": [], "salesforce": [],
+    "network security": [], "cyber security": ["cybersecurity", "information security"],
+    # Business and other domains
+    "project management": [], "product management": [], "stakeholder management": [],
+    "budgeting": ["budget management"], "financial analysis": [], "financial reporting": [],
+    "accounting": [], "bookkeeping": [], "auditing": ["audit"], "payroll": [], "recruiting": ["recruitment"],
+    "customer service": ["customer support"], "sales": [], "business development": [],
+    "digital marketing": [], "seo": ["search engine optimization"], "social media": [],
+    "content writing": ["copywriting"], "graphic design": [], "adobe photoshop": ["photoshop"],
+    "autocad": [], "supply chain": ["supply chain management"], "logistics": [], "procurement": [],
+    "negotiation": [], "leadership": ["team leadership"], "communication": ["communication skills"],
+    "problem solving": ["problem-solving"], "teamwork": ["team player"], "time management": [],
+    "patient care": [], "nursing": [], "teaching": [], "curriculum development": [],
+}
+
+# Words stripped from the start of mined phrases ("strong knowledge of the ...")
+_LEADING_FILLER = {
+    "a", "an", "the", "all", "any", "various", "our", "your", "their", "strong", "good", "excellent",
+    "basic", "solid", "working", "advanced", "modern", "relevant", "related", "using", "with", "in", "of",
+}
+_MINE_CUE = re.compile(
+    r"\b(?:experience (?:with|in|using)|knowledge of|proficien(?:t|cy) (?:in|with)|"
+    r"familiar(?:ity)? with|skills? in|expertise in)\s+([^.;:\n]{3,160})",
+    re.IGNORECASE,
+)
+_ITEM_SPLIT = re.compile(r",|;|\band\b|\bor\b|\betc\b|\(|\)")
+_SEPARATORS = re.compile(r"[\s\-_/]+")
+
+
+def normalize_skill_text(text: str) -> str:
+    """Lowercase and unify separators (whitespace, hyphens, slashes) to single spaces."""
+    return _SEPARATORS.sub(" ", (text or "").lower()).strip()
+
+
+def vocabulary_path_for(db_path: Optional[str] = None) -> Path:
+    """Location of the mined skill vocabulary inside the ChromaDB directory."""
+    return Path(db_path or CHROMA_DB_PATH) / VOCABULARY_FILENAME
+
+
+class SkillMatcher:
+    """
+    Multi-pattern skill matcher.
+
+    All surface forms (canonical names and aliases) are compiled into one
+    Aho-Corasick automaton; match() walks a document once and reports the
+    canonical names of the skills found on word boundaries. Results are
+    cached by document content.
+    """
+
+    def __init__(self, vocabulary: Dict[str, Iterable[str]], cache_size: int = CACHE_MAX_ENTRIES):
+        """
+        Compile the automaton.
+
+        Args:
+            vocabulary: Canonical skill -> aliases
+            cache_size: Number of documents whose matches are cached
+        """
+        self.vocabulary = {canonical: list(aliases) for canonical, aliases in vocabulary.items()}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List] = [[]]  # (pattern length, canonical) ending at each state
+
+        for canonical, aliases in self.vocabulary.items():
+            for form in {canonical, *aliases}:
+                pattern = normalize_skill_text(form)
+                if pattern:
+                    self._add(pattern, canonical)
+        self._link()
+
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, FrozenSet[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _add(self, pattern: str, canonical: str):
+        """Insert one pattern into the trie."""
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[node][ch] = nxt
+            node = nxt
+        self._out[node].append((len(pattern), canonical))
+
+    def _link(self):
+        """Compute failure links breadth-first and merge outputs along them."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def match(self, text: str) -> FrozenSet[str]:
+        """
+        Find the skills in a text (one pass, no caching).
+
+        Args:
+            text: Any document text
+
+        Returns:
+            Canonical names of the skills found
+        """
+        text = normalize_skill_text(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        last = len(text) - 1
+        found = set()
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, canonical in out[node]:
+                start = i - length + 1
+                # Whole words only; a leading "." keeps "js" from matching inside "node.js"
+                if (start == 0 or not (text[start - 1].isalnum() or text[start - 1] == ".")) and \
+                        (i == last or not text[i + 1].isalnum()):
+                    found.add(canonical)
+        return frozenset(found)
+
+    def match_cached(self, text: str) -> FrozenSet[str]:
+        """match() with a content-addressed LRU cache of recent documents."""
+        key = hashlib.sha1((text or "").encode("utf-8")).hexdigest()
+        with self._lock:
+            skills = self._cache.get(key)
+            if skills is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return skills
+            self.cache_misses += 1
+
+        skills = self.match(text)
+        with self._lock:
+            self._cache[key] = skills
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return skills
+
+    def document_skills(self, text: str, metadata: Optional[Dict] = None) -> FrozenSet[str]:
+        """
+        Skills of a stored document: read from its metadata when ingestion
+        recorded them, matched (and cached) otherwise.
+        """
+        if metadata and SKILLS_FIELD in metadata:
+            return parse_skills_field(metadata[SKILLS_FIELD])
+        return self.match_cached(text)
+
+    def stats(self) -> Dict:
+        """Get automaton size and cache counters."""
+        with self._lock:
+            return {
+                "skills": len(self.vocabulary),
+                "states": len(self._goto),
+                "cache_entries": len(self._cache),
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+            }
+
+
+def format_skills_field(skills: Iterable[str]) -> str:
+    """Metadata value for a skill set (Chroma metadata only holds scalars)."""
+    return ",".join(sorted(skills))
+
+
+def parse_skills_field(value: str) -> FrozenSet[str]:
+    """Inverse of format_skills_field()."""
+    return frozenset(skill for skill in (value or "").split(",") if skill)
+
+
+def _mined_items(text: str) -> Iterable[str]:
+    """Candidate skill phrases following requirement cues in one document."""
+    for match in _MINE_CUE.finditer(text):
+        for item in _ITEM_SPLIT.split(match.group(1)):
+            words = normalize_skill_text(item).split()
+            while words and words[0] in _LEADING_FILLER:
+                words = words[1:]
+            if 1 <= len(words) <= MAX_SKILL_WORDS and any(ch.isalpha() for ch in words[0]):
+                yield " ".join(words)
+
+
+def mine_skill_vocabulary(documents: Iterable[str], min_doc_freq: int = MIN_SKILL_DOC_FREQ) -> Dict[str, List[str]]:
+    """
+    Mine skills from job descriptions.
+
+    Args:
+        documents: Job description texts
+        min_doc_freq: Minimum number of documents a phrase must appear in
+
+    Returns:
+        Canonical skill -> aliases (mined phrases have no aliases)
+    """
+    doc_freq: Dict[str, int] = {}
+    for doc in documents:
+        for item in set(_mined_items(doc or "")):
+            doc_freq[item] = doc_freq.get(item, 0) + 1
+    return {item: [] for item, count in sorted(doc_freq.items()) if count >= min_doc_freq}
+
+
+def build_vocabulary(mined: Optional[Dict[str, List[str]]] = None) -> Dict[str, List[str]]:
+    """Seed taxonomy plus mined skills that are not already a seed skill or alias."""
+    vocabulary = {canonical: list(aliases) for canonical, aliases in SEED_SKILLS.items()}
+    known = {normalize_skill_text(form) for c, a in SEED_SKILLS.items() for form in [c, *a]}
+    for skill, aliases in (mined or {}).items():
+        if normalize_skill_text(skill) not in known:
+            vocabulary[skill] = list(aliases)
+    return vocabulary
+
+
+def save_vocabulary(mined: Dict[str, List[str]], path: str):
+    """Write the mined vocabulary as JSON."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"skills": mined}, f, indent=1, sort_keys=True)
+
+
+def load_mined_vocabulary(db_path: Optional[str] = None) -> Dict[str, List[str]]:
+    """Load the mined vocabulary ({} if it has not been mined yet)."""
+    path = vocabulary_path_for(db_path)
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["skills"]
+
+
+_matchers: Dict[str, SkillMatcher] = {}
+_matchers_lock = threading.Lock()
+
+
+def get_skill_matcher(db_path: Optional[str] = None) -> SkillMatcher:
+    """Get the process-wide skill matcher (seed + mined skills), compiled on first use."""
+    key = str(vocabulary_path_for(db_path))
+    with _matchers_lock:
+        if key not in _matchers:
+            _matchers[key] = SkillMatcher(build_vocabulary(load_mined_vocabulary(db_path)))
+        return _matchers[key]
+
+
+if __name__ == "__main__":
+    from chroma_setup import get_or_create_db
+
+    db_path = sys.argv[1] if len(sys.argv) > 1 else None
+    client, resumes_col, jobs_col = get_or_create_db(db_path)
+
+    # Mine the skill vocabulary from all job descriptions (one paged scan)
+    documents = []
+    total = jobs_col.count()
+    for offset in range(0, total, MINE_PAGE_SIZE):
+        documents.extend(jobs_col.get(limit=MINE_PAGE_SIZE, offset=offset, include=["documents"])["documents"])
+
+    mined = mine_skill_vocabulary(documents)
+    save_vocabulary(mined, str(vocabulary_path_for(db_path)))
+    vocabulary = build_vocabulary(mined)
+    print(f"✓ Mined {len(mined)} skills from {total} jobs; vocabulary has {len(vocabulary)} skills "
+          f"-> {vocabulary_path_for(db_path)}")
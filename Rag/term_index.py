@@ -0,0 +1,200 @@
+"""
+Corpus Term Index
+Offline-built per-document term counts and corpus IDF, stored as sparse
+arrays next to the Chroma data, for keyword statistics without
+re-tokenizing documents at query time
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+from scipy import sparse
+
+from chroma_setup import CHROMA_DB_PATH
+
+# Configuration
+TERM_INDEX_DIRNAME = "term_index"
+TOKEN_PATTERN = r"[a-z][a-z0-9+#]{2,}"  # Lowercase words of 3+ chars (keeps c++, c#)
+MIN_DOC_FREQ = 2  # Terms in fewer documents are dropped at build time
+BUILD_PAGE_SIZE = 1000
+
+_token_re = re.compile(TOKEN_PATTERN)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into index terms (same rules as the offline build)."""
+    return _token_re.findall((text or "").lower())
+
+
+def term_index_dir_for(collection_name: str, db_path: Optional[str] = None) -> Path:
+    """Location of a collection's term index inside the ChromaDB directory."""
+    return Path(db_path or CHROMA_DB_PATH) / TERM_INDEX_DIRNAME / collection_name
+
+
+class TermIndex:
+    """
+    Sparse document-term count matrix with corpus IDF.
+
+    Rows are documents (by Chroma id), columns are terms. English stopwords
+    and rare terms are left out at build time.
+    """
+
+    def __init__(self, doc_ids: List[str], terms: List[str], counts: sparse.csr_matrix,
+                 idf: np.ndarray, generation: Optional[int] = None):
+        """
+        Args:
+            doc_ids: Chroma id of each row
+            terms: Term of each column
+            counts: CSR matrix (documents x terms) of term counts
+            idf: Smoothed inverse document frequency per term
+            generation: Collection stats generation the index was built at
+        """
+        self.doc_ids = doc_ids
+        self.terms = terms
+        self.counts = counts.tocsr()
+        self.idf = idf
+        self.generation = generation
+        self.row_of: Dict[str, int] = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+        self.term_id: Dict[str, int] = {term: i for i, term in enumerate(terms)}
+
+    @classmethod
+    def build(cls, doc_ids: List[str], documents: Iterable[str],
+              min_doc_freq: int = MIN_DOC_FREQ, generation: Optional[int] = None) -> "TermIndex":
+        """
+        Tokenize documents once and build the index.
+
+        Args:
+            doc_ids: Chroma ids of the documents
+            documents: Document texts, in the same order
+            min_doc_freq: Minimum number of documents a term must appear in
+            generation: Collection stats generation to record
+
+        Returns:
+            TermIndex
+        """
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        vectorizer = CountVectorizer(
+            lowercase=True,
+            token_pattern=TOKEN_PATTERN,
+            stop_words="english",
+            min_df=min(min_doc_freq, max(len(doc_ids), 1)),
+            dtype=np.int32,
+        )
+        counts = vectorizer.fit_transform(documents).tocsr()
+        terms = vectorizer.get_feature_names_out().tolist()
+
+        # Smoothed IDF, as in scikit-learn's TfidfTransformer
+        doc_freq = np.bincount(counts.indices, minlength=len(terms))
+        idf = np.log((1 + counts.shape[0]) / (1 + doc_freq)) + 1
+
+        return cls(list(doc_ids), terms, counts, idf.astype(np.float32), generation)
+
+    @classmethod
+    def from_collection(cls, collection, page_size: int = BUILD_PAGE_SIZE,
+                        generation: Optional[int] = None) -> "TermIndex":
+        """Build the index from all documents of a Chroma collection (paged)."""
+        doc_ids: List[str] = []
+        documents: List[str] = []
+        total = collection.count()
+        for offset in range(0, total, page_size):
+            page = collection.get(limit=page_size, offset=offset, include=["documents"])
+            doc_ids.extend(page["ids"])
+            documents.extend(doc or "" for doc in page["documents"])
+        return cls.build(doc_ids, documents, generation=generation)
+
+    def save(self, directory: str):
+        """Write counts.npz, idf.npy and terms.json to a directory."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        sparse.save_npz(directory / "counts.npz", self.counts)
+        np.save(directory / "idf.npy", self.idf)
+        with open(directory / "terms.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "token_pattern": TOKEN_PATTERN,
+                "generation": self.generation,
+                "doc_ids": self.doc_ids,
+                "terms": self.terms,
+            }, f)
+
+    @classmethod
+    def load(cls, directory: str) -> "TermIndex":
+        """Load an index written by save()."""
+        directory = Path(directory)
+        with open(directory / "terms.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("token_pattern") != TOKEN_PATTERN:
+            raise ValueError(f"Term index at {directory} was built with another tokenizer; rebuild it")
+        counts = sparse.load_npz(directory / "counts.npz").tocsr()
+        idf = np.load(directory / "idf.npy")
+        return cls(meta["doc_ids"], meta["terms"], counts, idf, meta.get("generation"))
+
+    def term_ids(self, text: str) -> Set[int]:
+        """Column ids of the indexed terms that occur in a text."""
+        return {self.term_id[t] for t in tokenize(text) if t in self.term_id}
+
+    def keyword_gap(self, doc_ids: List[str], user_text: str, top_k: int = 10,
+                    min_docs: int = 2) -> List[str]:
+        """
+        Terms that are frequent in the given documents but absent from a text.
+
+        The retrieved rows are summed as one sparse operation; terms are
+        ranked by count x IDF so corpus-wide boilerplate ranks low.
+
+        Args:
+            doc_ids: Ids of the retrieved documents (ids missing from the index are skipped)
+            user_text: Text whose terms are excluded (e.g. the user's CV)
+            top_k: Number of terms to return
+            min_docs: Minimum number of retrieved documents a term must occur in
+
+        Returns:
+            Terms, best first
+        """
+        rows = [self.row_of[doc_id] for doc_id in doc_ids if doc_id in self.row_of]
+        if not rows:
+            return []
+
+        sub = self.counts[rows]
+        term_counts = np.asarray(sub.sum(axis=0)).ravel()
+        docs_with_term = np.bincount(sub.indices, minlength=len(self.terms))
+
+        scores = term_counts * self.idf
+        scores[docs_with_term < min(min_docs, len(rows))] = 0
+        excluded = list(self.term_ids(user_text))
+        if excluded:
+            scores[excluded] = 0
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [self.terms[i] for i in ranked]
+
+
+def load_term_index(collection_name: str, db_path: Optional[str] = None) -> Optional[TermIndex]:
+    """Load a collection's term index, or None if it has not been built."""
+    directory = term_index_dir_for(collection_name, db_path)
+    if not (directory / "terms.json").exists():
+        return None
+    return TermIndex.load(str(directory))
+
+
+if __name__ == "__main__":
+    from chroma_setup import get_or_create_db
+    from collection_stats import CollectionStats, stats_path_for
+
+    db_path = sys.argv[1] if len(sys.argv) > 1 else None
+    client, resumes_col, jobs_col = get_or_create_db(db_path)
+    stats = CollectionStats(stats_path_for(db_path))
+
+    # Build the term indexes of both collections
+    for col in (resumes_col, jobs_col):
+        stats.ensure(col)
+        index = TermIndex.from_collection(col, generation=stats.generation)
+        index.save(str(term_index_dir_for(col.name, db_path)))
+        print(f"✓ Term index written for '{col.name}': {len(index.doc_ids)} docs, "
+              f"{len(index.terms)} terms -> {term_index_dir_for(col.name, db_path)}")
@@ -0,0 +1,301 @@
+"""
+Vector Search Backends
+Pluggable search engines behind CareerCoachMatcher: ChromaDB (HNSW) or an
+exact in-memory NumPy index
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Configuration
+DATA_PATH = Path(__file__).parent.parent / "Data"
+SNAPSHOT_PATH = DATA_PATH / "vector_snapshots"
+BACKENDS = ("chroma", "numpy")
+MASK_FIELDS = ("category",)  # Metadata fields with precomputed filter masks
+LOAD_PAGE_SIZE = 1000
+RESULT_FIELDS = ("ids", "documents", "metadatas", "distances")
+
+
+class ChromaIndex:
+    """
+    Vector index that forwards queries to a ChromaDB collection.
+
+    Chroma has no result offset, so a query with an offset fetches the
+    skipped rows again and drops them.
+    """
+
+    native_offset = False
+
+    def __init__(self, collection):
+        """
+        Args:
+            collection: ChromaDB collection to search
+        """
+        self.collection = collection
+        self.name = collection.name
+
+    def count(self) -> int:
+        """Number of indexed documents."""
+        return self.collection.count()
+
+    def query(self, query_embeddings: List[List[float]], n_results: int,
+              where: Optional[Dict] = None, offset: int = 0) -> Dict:
+        """Run a (multi-embedding) query; returns Chroma's result format."""
+        results = self.collection.query(
+            query_embeddings=query_embeddings,
+            n_results=offset + n_results,
+            where=where
+        )
+        if offset:
+            results = {field: [rows[offset:] for rows in results[field]] for field in RESULT_FIELDS}
+        return results
+
+
+class NumpyIndex:
+    """
+    Exact cosine-similarity search over a contiguous float32 matrix.
+
+    Rows are L2-normalized once at build time, so a query is a single
+    matrix product followed by an argpartition top-k. Results use the same
+    format (and cosine distance) as a Chroma query.
+    """
+
+    native_offset = True
+
+    def __init__(self, name: str, ids: List[str], embeddings: np.ndarray,
+                 documents: List[str], metadatas: List[Dict],
+                 normalized: bool = False, generation: Optional[int] = None):
+        """
+        Build the index.
+
+        Args:
+            name: Collection name (for reporting)
+            ids: Document ids
+            embeddings: Matrix of shape (n_docs, dim)
+            documents: Document texts
+            metadatas: Document metadata dictionaries
+            normalized: Whether embeddings rows are already unit length
+            generation: Collection stats generation the index was built at
+        """
+        self.name = name
+        self.generation = generation
+        self.ids = list(ids)
+        self.documents = list(documents)
+        self.metadatas = [meta or {} for meta in metadatas]
+
+        if normalized:
+            self.embeddings = embeddings
+        else:
+            matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self.embeddings = matrix / norms
+
+        # Precompute boolean masks for the common metadata filters
+        self._masks: Dict[str, Dict[str, np.ndarray]] = {}
+        for field in MASK_FIELDS:
+            values = np.array([str(meta.get(field, "")) for meta in self.metadatas], dtype=object)
+            self._masks[field] = {
+                value: values == value for value in set(values.tolist())
+            }
+
+    @classmethod
+    def from_collection(cls, collection, page_size: int = LOAD_PAGE_SIZE,
+                        generation: Optional[int] = None) -> "NumpyIndex":
+        """Load all embeddings, documents and metadata from a Chroma collection."""
+        total = collection.count()
+        ids, documents, metadatas, blocks = [], [], [], []
+
+        for offset in range(0, total, page_size):
+            page = collection.get(
+                limit=page_size,
+                offset=offset,
+                include=["embeddings", "documents", "metadatas"]
+            )
+            ids.extend(page["ids"])
+            documents.extend(page["documents"])
+            metadatas.extend(page["metadatas"])
+            blocks.append(np.asarray(page["embeddings"], dtype=np.float32))
+
+        embeddings = np.vstack(blocks) if blocks else np.zeros((0, 0), dtype=np.float32)
+        return cls(collection.name, ids, embeddings, documents, metadatas, generation=generation)
+
+    def save(self, snapshot_dir: str):
+        """
+        Write a snapshot: normalized embeddings.npy plus records.json.
+
+        Args:
+            snapshot_dir: Directory to write the snapshot to
+        """
+        path = Path(snapshot_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        # Written next to the snapshot and swapped in, so memory-mapped readers keep a valid file
+        with open(path / "embeddings.npy.tmp", "wb") as f:
+            np.save(f, np.ascontiguousarray(self.embeddings, dtype=np.float32))
+        os.replace(path / "embeddings.npy.tmp", path / "embeddings.npy")
+        with open(path / "records.json.tmp", "w", encoding="utf-8") as f:
+            json.dump({
+                "name": self.name,
+                "generation": self.generation,
+                "ids": self.ids,
+                "documents": self.documents,
+                "metadatas": self.metadatas,
+            }, f)
+        os.replace(path / "records.json.tmp", path / "records.json")
+
+    @classmethod
+    def load(cls, snapshot_dir: str, mmap: bool = True) -> "NumpyIndex":
+        """
+        Load a snapshot written by save().
+
+        Args:
+            snapshot_dir: Snapshot directory
+            mmap: Memory-map the embedding matrix instead of reading it
+        """
+        path = Path(snapshot_dir)
+        embeddings = np.load(path / "embeddings.npy", mmap_mode="r" if mmap else None)
+        with open(path / "records.json", "r", encoding="utf-8") as f:
+            records = json.load(f)
+
+        return cls(records["name"], records["ids"], embeddings,
+                   records["documents"], records["metadatas"], normalized=True,
+                   generation=records.get("generation"))
+
+    def count(self) -> int:
+        """Number of indexed documents."""
+        return len(self.ids)
+
+    def _mask_for(self, where: Optional[Dict]) -> Optional[np.ndarray]:
+        """Translate a simple Chroma where filter into a boolean row mask."""
+        if not where:
+            return None
+
+        mask = np.ones(len(self.ids), dtype=bool)
+        for field, condition in where.items():
+            if isinstance(condition, dict):
+                if set(condition) != {"$eq"}:
+                    raise ValueError(f"Unsupported filter for NumPy backend: {where}")
+                value = condition["$eq"]
+            else:
+                value = condition
+
+            if field in self._masks:
+                field_mask = self._masks[field].get(str(value))
+                if field_mask is None:
+                    return np.zeros(len(self.ids), dtype=bool)
+            else:
+                field_mask = np.array([meta.get(field) == value for meta in self.metadatas], dtype=bool)
+            mask &= field_mask
+
+        return mask
+
+    def query(self, query_embeddings: Sequence[Sequence[float]], n_results: int,
+              where: Optional[Dict] = None, offset: int = 0) -> Dict:
+        """
+        Run an exact (multi-embedding) query; returns Chroma's result format.
+
+        Only the rows ranked offset to offset + n_results are returned, so
+        paging through the ranking does not copy earlier rows again.
+        """
+        results = {field: [] for field in RESULT_FIELDS}
+        if len(query_embeddings) == 0:
+            return results
+
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        queries = queries / norms
+
+        # One product for all queries: (n_queries, n_docs)
+        scores = queries @ self.embeddings.T
+
+        mask = self._mask_for(where)
+        if mask is not None:
+            scores[:, ~mask] = -np.inf
+            available = int(mask.sum())
+        else:
+            available = len(self.ids)
+
+        k = min(offset + n_results, available)
+        for row in scores:
+            if k <= offset:
+                top = np.array([], dtype=int)
+            elif k < len(row):
+                top = np.argpartition(-row, k - 1)[:k]
+                top = top[np.argsort(-row[top])][offset:]
+            else:
+                top = np.argsort(-row)[offset:k]
+
+            results["ids"].append([self.ids[i] for i in top])
+            results["documents"].append([self.documents[i] for i in top])
+            results["metadatas"].append([self.metadatas[i] for i in top])
+            results["distances"].append([float(1.0 - row[i]) for i in top])
+
+        return results
+
+
+def snapshot_dir_for(collection_name: str) -> Path:
+    """Default snapshot directory of a collection."""
+    return SNAPSHOT_PATH / collection_name
+
+
+def create_index(collection, backend: str = "chroma", snapshot_dir: Optional[str] = None,
+                 generation: Optional[int] = None):
+    """
+    Create the vector index for a collection.
+
+    Args:
+        collection: ChromaDB collection
+        backend: "chroma" (HNSW via Chroma) or "numpy" (exact, in memory)
+        snapshot_dir: For "numpy", load this .npy snapshot instead of reading
+                      the collection (defaults to the collection's snapshot dir
+                      when it exists)
+        generation: Current collection stats generation. A snapshot taken at
+                    another generation, or whose size differs from the
+                    collection, is stale: the index is rebuilt from the
+                    collection and the snapshot rewritten.
+
+    Returns:
+        ChromaIndex or NumpyIndex
+    """
+    if backend == "chroma":
+        return ChromaIndex(collection)
+
+    if backend == "numpy":
+        path = Path(snapshot_dir) if snapshot_dir else snapshot_dir_for(collection.name)
+        if (path / "embeddings.npy").exists():
+            index = NumpyIndex.load(str(path))
+            if index.count() == collection.count() and (generation is None or index.generation == generation):
+                print(f"✓ Loaded NumPy index for '{collection.name}' from snapshot ({index.count()} docs)")
+                return index
+            print(f"WARNING: NumPy snapshot for '{collection.name}' is older than the collection; rebuilding")
+            index = NumpyIndex.from_collection(collection, generation=generation)
+            try:
+                index.save(str(path))
+            except OSError as e:
+                print(f"WARNING: Could not rewrite the snapshot for '{collection.name}': {e}")
+        else:
+            index = NumpyIndex.from_collection(collection, generation=generation)
+        print(f"✓ Built NumPy index for '{collection.name}' from ChromaDB ({index.count()} docs)")
+        return index
+
+    raise ValueError(f"Unknown vector backend '{backend}'. Choose from: {', '.join(BACKENDS)}")
+
+
+if __name__ == "__main__":
+    from chroma_setup import get_or_create_db
+    from collection_stats import CollectionStats
+
+    # Write .npy snapshots of both collections
+    client, resumes_col, jobs_col = get_or_create_db()
+    stats = CollectionStats()
+    for col in (resumes_col, jobs_col):
+        stats.ensure(col)
+    for col in (resumes_col, jobs_col):
+        index = NumpyIndex.from_collection(col, generation=stats.generation)
+        index.save(str(snapshot_dir_for(col.name)))
+        print(f"✓ Snapshot written for '{col.name}': {index.count()} docs -> {snapshot_dir_for(col.name)}")
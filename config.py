@@ -19,8 +19,18 @@ TEMP_DIR.mkdir(exist_ok=True)
 
 # Model configurations
 OLLAMA_MODEL = "mistral"
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+OLLAMA_KEEP_ALIVE = "30m"  # Keep the model loaded between requests (-1 = forever)
+OLLAMA_NUM_CTX = 4096  # Context window in tokens (prompt + completion)
+OLLAMA_NUM_PREDICT = 1024  # Maximum tokens generated per request
+OLLAMA_NUM_THREAD = None  # CPU threads used by Ollama (None = server default)
+OLLAMA_WARM_UP = True  # Load the model when the app starts
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"
 EMBEDDING_DIMENSION = 384
+EMBEDDING_BACKEND = "torch"  # "torch" or "onnx" (export with Rag/embedding_backends.py)
+EMBEDDING_MICRO_BATCHING = True  # Coalesce concurrent embedding requests
+EMBEDDING_MAX_BATCH_SIZE = 32
+EMBEDDING_MAX_WAIT_MS = 5
 
 # ChromaDB configurations
 CHROMADB_PATH = DATA_DIR / "chromadb"
@@ -31,6 +41,40 @@ COLLECTION_JOBS = "jobs"
 BATCH_SIZE = 32
 RAG_DEFAULT_RESULTS = 10
 RAG_MIN_SIMILARITY = 0.5
+RAG_ADAPTIVE_SEARCH = True  # Fetch candidates in growing pages instead of a fixed 2x overfetch
+RAG_VECTOR_BACKEND = "chroma"  # "chroma" (HNSW) or "numpy" (exact, in memory)
+
+# Serving configurations
+MAX_CONCURRENT_REQUESTS = 8  # CV requests handled at once by the async pipeline
+PIPELINE_WORKERS = 8  # Threads running independent process_cv stages
+
+# Temp file configurations
+TEMP_FILE_TTL_SECONDS = 3600  # Per-request download files are removed after this age
+TEMP_JANITOR_INTERVAL_SECONDS = 300
+
+# LLM cache configurations
+LLM_CACHE_ENABLED = True  # Set to False to always call Ollama
+LLM_CACHE_PATH = DATA_DIR / "llm_cache.sqlite"
+LLM_CACHE_MAX_MB = 50  # Least recently used responses are evicted above this size
+
+# Bullet extraction configurations
+BULLET_CHUNK_TOKENS = None  # CVs longer than this are split into chunks (None = what fits in OLLAMA_NUM_CTX)
+BULLET_MAX_PARALLEL = 4  # Chunks sent to Ollama at once (match OLLAMA_NUM_PARALLEL on the server)
+
+# Result cache configurations (complete process_cv results)
+RESULT_CACHE_ENABLED = True
+RESULT_CACHE_BACKEND = "memory"  # "memory" (per process LRU) or "sqlite" (shared by workers on one host)
+RESULT_CACHE_MAX_ENTRIES = 256
+RESULT_CACHE_PATH = TEMP_DIR / "result_cache.sqlite"
+
+# PDF extraction configurations (runs in supervised worker processes)
+PDF_EXTRACT_TIMEOUT_SECONDS = 15  # Wall-clock limit per uploaded PDF
+PDF_EXTRACT_MEMORY_MB = 512  # Memory a worker may allocate per PDF on top of its start size
+PDF_MAX_PAGES = 20  # Only the first pages of longer PDFs are read
+PDF_EXTRACT_WORKERS = 2  # PDFs extracted at once
+PDF_QUARANTINE_PATH = DATA_DIR / "pdf_quarantine.jsonl"  # PDFs that failed extraction
+PDF_TEXT_CACHE_ENABLED = True  # Reuse the text of PDFs extracted before (uploads and ingestion)
+PDF_TEXT_CACHE_PATH = DATA_DIR / "pdf_text_cache.sqlite"
 
 # File configurations
 ALLOWED_PDF_EXTENSIONS = [".pdf"]
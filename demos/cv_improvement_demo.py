@@ -6,9 +6,10 @@ import sys
 from pathlib import Path
 
 # Add Rag directory to path
-sys.path.insert(0, str(Path(__file__).parent / "Rag"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "Rag"))
 
 from career_coach_matcher import CareerCoachMatcher
+from skill_matcher import get_skill_matcher
 
 
 def analyze_cv(user_cv_text: str, job_title: str = "Software Engineer"):
@@ -45,23 +46,20 @@ def analyze_cv(user_cv_text: str, job_title: str = "Software Engineer"):
     print("YOUR CV vs. SUCCESSFUL CVs")
     print(f"{'='*70}\n")
     
-    # Extract keywords from successful CVs
-    all_keywords = []
-    for cv in similar_cvs:
-        # Simple keyword extraction (you could make this more sophisticated)
-        words = cv.text.lower().split()
-        all_keywords.extend(words)
-    
-    # Count frequency
+    # Skills of the successful CVs (from their metadata, or matched in one pass)
     from collections import Counter
-    keyword_freq = Counter(all_keywords)
+    skill_matcher = get_skill_matcher()
+    skill_freq = Counter(
+        skill for cv in similar_cvs
+        for skill in skill_matcher.document_skills(cv.text, cv.metadata)
+    )
     
-    # Get user CV words
-    user_words = set(user_cv_text.lower().split())
+    # Get user CV skills
+    user_skills = skill_matcher.match(user_cv_text)
     
-    # Find common keywords in successful CVs that user is missing
-    common_keywords = [word for word, count in keyword_freq.most_common(30) 
-                      if count >= 3 and len(word) > 4 and word not in user_words]
+    # Find common skills in successful CVs that user is missing
+    common_keywords = [skill for skill, count in skill_freq.most_common(30)
+                      if count >= 2 and skill not in user_skills]
     
     # Display similar CVs
     print("📊 Top Similar CVs:\n")
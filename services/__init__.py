@@ -3,12 +3,23 @@ Services package for AI Career Coach
 Business logic and processing services
 """
 
-from .cv_analyzer import analyze_cv_improvements
-from .interview_generator import generate_interview_questions
-from .cv_processor import process_cv
+from .cv_analyzer import analyze_cv_improvements, analyze_cv_improvements_async
+from .interview_generator import generate_interview_questions, generate_interview_questions_async
+from .cv_processor import process_cv, process_cv_async, iter_process_cv, aiter_process_cv
+from .matcher_registry import get_matcher, matcher_lease, close_matcher, reload_matcher, get_registry_stats
 
 __all__ = [
     'analyze_cv_improvements',
+    'analyze_cv_improvements_async',
     'generate_interview_questions',
-    'process_cv'
+    'generate_interview_questions_async',
+    'process_cv',
+    'process_cv_async',
+    'iter_process_cv',
+    'aiter_process_cv',
+    'get_matcher',
+    'matcher_lease',
+    'close_matcher',
+    'reload_matcher',
+    'get_registry_stats'
 ]
@@ -5,8 +5,9 @@ Analyzes CVs and provides improvement suggestions using RAG
 
 import sys
 import os
+import asyncio
 from collections import Counter
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -14,16 +15,84 @@ parent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(parent_dir))
 sys.path.insert(0, str(parent_dir / "Rag"))
 
-from config import RAG_DEFAULT_RESULTS, RAG_MIN_SIMILARITY
+from services.matcher_registry import matcher_lease, acquire_matcher, release_matcher, resolve_query_inputs
+from skill_matcher import get_skill_matcher
+from config import RAG_DEFAULT_RESULTS, RAG_MIN_SIMILARITY, RAG_ADAPTIVE_SEARCH
 
+if TYPE_CHECKING:
+    from career_coach_matcher import QueryContext
 
-def get_matcher():
-    """Lazy load the matcher to avoid startup delays."""
-    from career_coach_matcher import CareerCoachMatcher
-    return CareerCoachMatcher()
+
+def _missing_skills(similar_cvs, cv_text: str, min_cvs: int = 2):
+    """Skills found in several similar CVs but not in the user's CV, most common first."""
+    skill_matcher = get_skill_matcher()
+    user_skills = skill_matcher.match_cached(cv_text)
+    
+    skill_freq = Counter(
+        skill for cv in similar_cvs
+        for skill in skill_matcher.document_skills(cv.text, cv.metadata)
+    )
+    return [
+        skill for skill, count in skill_freq.most_common()
+        if count >= min(min_cvs, len(similar_cvs)) and skill not in user_skills
+    ]
 
 
-def analyze_cv_improvements(cv_text: str, job_title: str, n_results: int = 5) -> str:
+def _build_improvement_report(similar_cvs, cv_text: str, job_title: str, term_index=None) -> str:
+    """
+    Build the markdown improvement report from the similar CVs.
+    
+    Missing keywords are the skills of the similar CVs the user's CV lacks,
+    followed by frequent terms from the offline term index (a sparse row
+    sum over the retrieved CV ids) when it is available.
+    """
+    if not similar_cvs:
+        return "⚠️ No similar CVs found in database. Try a different job title."
+    
+    # Build analysis report
+    report = f"# 📊 CV IMPROVEMENT ANALYSIS\n\n"
+    report += f"**Target Job:** {job_title}\n\n"
+    report += f"**Similar CVs Found:** {len(similar_cvs)}\n\n"
+    report += "---\n\n"
+    
+    # Show top similar CVs
+    report += "## 🎯 Top Matching CVs\n\n"
+    for i, cv in enumerate(similar_cvs[:3], 1):
+        category = cv.metadata.get('category', 'Unknown')
+        similarity = cv.similarity_score * 100
+        report += f"**{i}. {category}** - Match: {similarity:.1f}%\n"
+        report += f"   *Preview:* {cv.text[:150]}...\n\n"
+    
+    # Find missing keywords
+    common_keywords = _missing_skills(similar_cvs, cv_text)
+    if term_index is not None:
+        terms = term_index.keyword_gap([cv.id for cv in similar_cvs], cv_text, top_k=10)
+        common_keywords += [term for term in terms if term not in common_keywords]
+    
+    report += "---\n\n"
+    report += "## 💡 IMPROVEMENT SUGGESTIONS\n\n"
+    
+    report += "### 1️⃣ Keywords You Might Be Missing\n"
+    report += "*(These appear frequently in similar successful CVs)*\n\n"
+    for keyword in common_keywords[:10]:
+        report += f"- {keyword}\n"
+    
+    report += f"\n### 2️⃣ Best Matching Category\n"
+    if similar_cvs:
+        best_category = similar_cvs[0].metadata.get('category', 'Unknown')
+        report += f"Your CV is most similar to: **{best_category}**\n\n"
+    
+    report += "### 3️⃣ Quick Tips\n"
+    report += "- ✅ Add specific project examples with measurable results\n"
+    report += "- ✅ Use action verbs (developed, implemented, managed)\n"
+    report += "- ✅ Quantify achievements (increased by X%, reduced by Y%)\n"
+    report += "- ✅ Include relevant certifications and technical skills\n"
+    
+    return report
+
+
+def analyze_cv_improvements(cv_text: str, job_title: str, n_results: int = 5,
+                            query_context: Optional["QueryContext"] = None) -> str:
     """
     Analyze CV and provide improvement suggestions using RAG.
     
@@ -31,80 +100,63 @@ def analyze_cv_improvements(cv_text: str, job_title: str, n_results: int = 5) ->
         cv_text: Cleaned CV text content
         job_title: Target job title
         n_results: Number of similar CVs to analyze
+        query_context: Optional context from matcher.create_query_context()
+                       holding the precomputed query embeddings
     
     Returns:
         Formatted markdown report with improvement suggestions
     """
+    cv_text, job_title = resolve_query_inputs(cv_text, job_title, query_context)
+    
     if not cv_text or cv_text.strip() == "":
         return "❌ Please provide CV text to analyze."
     
-    if not job_title or job_title.strip() == "":
-        job_title = "Software Engineer"  # Default
-    
     try:
-        # Get matcher (lazy loading)
-        matcher = get_matcher()
-        
-        # Find similar CVs
-        similar_cvs = matcher.find_resumes_for_job(
-            job_title=job_title,
-            job_description=cv_text,
-            n_results=n_results,
-            min_score=RAG_MIN_SIMILARITY
-        )
-        
-        if not similar_cvs:
-            return "⚠️ No similar CVs found in database. Try a different job title."
+        # Get shared matcher (loaded once per process, kept open across a reload)
+        with matcher_lease() as matcher:
+            # Find similar CVs
+            similar_cvs = matcher.find_resumes_for_job(
+                job_title=job_title,
+                job_description=cv_text,
+                n_results=n_results,
+                min_score=RAG_MIN_SIMILARITY,
+                query_context=query_context,
+                adaptive=RAG_ADAPTIVE_SEARCH
+            )
         
-        # Build analysis report
-        report = f"# 📊 CV IMPROVEMENT ANALYSIS\n\n"
-        report += f"**Target Job:** {job_title}\n\n"
-        report += f"**Similar CVs Found:** {len(similar_cvs)}\n\n"
-        report += "---\n\n"
+            return _build_improvement_report(similar_cvs, cv_text, job_title, matcher.get_term_index("resumes"))
         
-        # Show top similar CVs
-        report += "## 🎯 Top Matching CVs\n\n"
-        for i, cv in enumerate(similar_cvs[:3], 1):
-            category = cv.metadata.get('category', 'Unknown')
-            similarity = cv.similarity_score * 100
-            report += f"**{i}. {category}** - Match: {similarity:.1f}%\n"
-            report += f"   *Preview:* {cv.text[:150]}...\n\n"
-        
-        # Extract keywords
-        all_keywords = []
-        for cv in similar_cvs:
-            words = cv.text.lower().split()
-            all_keywords.extend(words)
-        
-        keyword_freq = Counter(all_keywords)
-        user_words = set(cv_text.lower().split())
-        
-        # Find missing keywords (filter for meaningful words)
-        common_keywords = [
-            word for word, count in keyword_freq.most_common(30) 
-            if count >= 3 and len(word) > 4 and word not in user_words
-        ]
-        
-        report += "---\n\n"
-        report += "## 💡 IMPROVEMENT SUGGESTIONS\n\n"
-        
-        report += "### 1️⃣ Keywords You Might Be Missing\n"
-        report += "*(These appear frequently in similar successful CVs)*\n\n"
-        for keyword in common_keywords[:10]:
-            report += f"- {keyword}\n"
-        
-        report += f"\n### 2️⃣ Best Matching Category\n"
-        if similar_cvs:
-            best_category = similar_cvs[0].metadata.get('category', 'Unknown')
-            report += f"Your CV is most similar to: **{best_category}**\n\n"
-        
-        report += "### 3️⃣ Quick Tips\n"
-        report += "- ✅ Add specific project examples with measurable results\n"
-        report += "- ✅ Use action verbs (developed, implemented, managed)\n"
-        report += "- ✅ Quantify achievements (increased by X%, reduced by Y%)\n"
-        report += "- ✅ Include relevant certifications and technical skills\n"
+    except Exception as e:
+        return f"❌ Error analyzing CV: {str(e)}"
+
+
+async def analyze_cv_improvements_async(cv_text: str, job_title: str, n_results: int = 5,
+                                        query_context: Optional["QueryContext"] = None) -> str:
+    """
+    Async version of analyze_cv_improvements.
+    Encoding and the vector query run on the matcher's bounded executors.
+    """
+    cv_text, job_title = resolve_query_inputs(cv_text, job_title, query_context)
+    
+    if not cv_text or cv_text.strip() == "":
+        return "❌ Please provide CV text to analyze."
+    
+    try:
+        # Loading the shared matcher may block on first use
+        matcher = await asyncio.get_running_loop().run_in_executor(None, acquire_matcher)
+        try:
+            similar_cvs = await matcher.afind_resumes_for_job(
+                job_title=job_title,
+                job_description=cv_text,
+                n_results=n_results,
+                min_score=RAG_MIN_SIMILARITY,
+                query_context=query_context,
+                adaptive=RAG_ADAPTIVE_SEARCH
+            )
         
-        return report
+            return _build_improvement_report(similar_cvs, cv_text, job_title, matcher.get_term_index("resumes"))
+        finally:
+            release_matcher(matcher)
         
     except Exception as e:
         return f"❌ Error analyzing CV: {str(e)}"
@@ -5,76 +5,405 @@ Handles CV upload, extraction, cleaning, and analysis orchestration
 
 import os
 import sys
-from typing import Tuple, Optional
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Tuple, Optional
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from Backend.utils.pdf_reader import pdf_to_text
-from Backend.utils.bullet_extractor import extract_bullets_with_ollama
-from services.cv_analyzer import analyze_cv_improvements
-from services.interview_generator import generate_interview_questions
-from config import TEMP_DIR
+from Backend.utils.pdf_reader import extract_pdf_text
+from Backend.utils.bullet_extractor import stream_bullets_chunked, stream_bullets_chunked_async
+from services.cv_analyzer import analyze_cv_improvements, analyze_cv_improvements_async
+from services.interview_generator import generate_interview_questions, generate_interview_questions_async
+from services.matcher_registry import matcher_lease, acquire_matcher, release_matcher
+from services.pipeline import PipelineResult, Stage, aiter_stages, iter_stages
+from services.temp_files import create_request_path, ensure_janitor_started
+from services.result_cache import get_result_cache
+from config import PIPELINE_WORKERS
 
+# Shown in the analysis tabs until their stage finishes
+PENDING_IMPROVEMENTS = "*⏳ Comparing your CV with similar profiles...*"
+PENDING_INTERVIEW = "*⏳ Preparing interview questions...*"
 
-def process_cv(pdf_file, job_title: str) -> Tuple[str, Optional[str], str, str]:
+# Bounded executor shared by all process_cv calls
+_pipeline_executor = ThreadPoolExecutor(PIPELINE_WORKERS, thread_name_prefix="cv-pipeline")
+
+
+def _pdf_source(pdf_file):
+    """Get something extract_pdf_text accepts from an upload (path, bytes or file-like)."""
+    if isinstance(pdf_file, (str, bytes, bytearray, os.PathLike)) or hasattr(pdf_file, "read"):
+        return pdf_file
+    return pdf_file.name  # Gradio file object
+
+
+def _save_download(job_title: str, cleaned_bullets: str) -> str:
+    """Write the cleaned bullets to a per-request file and return its path."""
+    output_path = create_request_path("clean_bullets.txt")
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(f"Target Job: {job_title}\n\n{cleaned_bullets}")
+    return str(output_path)
+
+
+def _format_result(job_title: str, cleaned_bullets: str) -> str:
+    """Cleaned bullets with the job title context shown above them."""
+    return f"🎯 Target Job: {job_title}\n\n{'='*60}\n\n{cleaned_bullets}"
+
+
+def _stage_message(name: str, error: str) -> str:
+    """User-facing error message for a failed analysis stage."""
+    if name == "improvements":
+        return f"❌ Error analyzing CV: {error}"
+    return f"❌ Error generating questions: {error}"
+
+
+def _log_timings(timings: Dict[str, float]):
+    """Print per-stage timings and the time to first output."""
+    parts = [f"{name}={seconds * 1000:.0f}ms" for name, seconds in timings.items()]
+    print(f"DEBUG: Stage timings: {' '.join(parts)}")
+
+
+def _cached_result(pdf_source, job_title: str):
+    """
+    Result cache key and cached result of a request.
+
+    The cache is best-effort: the key is None when the cache is disabled or
+    the upload cannot be hashed, and a failing store (e.g. a locked SQLite
+    file) counts as a miss.
+    """
+    try:
+        cache = get_result_cache()
+        if cache is None:
+            return None, None
+        key = cache.make_key(pdf_source, job_title)
+    except Exception as e:
+        print(f"WARNING: Result cache lookup failed: {e}")
+        return None, None
+    try:
+        return key, cache.get(key)
+    except Exception as e:
+        print(f"WARNING: Result cache lookup failed: {e}")
+        return key, None
+
+
+def _store_result(key: Optional[str], cleaned_bullets: str, improvements: str, interview: str):
+    """
+    Cache a complete result (results with failed stages are not cached).
+    A failing store is logged and otherwise ignored.
+    """
+    if key is None or improvements.startswith("❌") or interview.startswith("❌"):
+        return
+    try:
+        get_result_cache().put(key, {
+            "cleaned_bullets": cleaned_bullets,
+            "improvements": improvements,
+            "interview": interview,
+        })
+    except Exception as e:
+        print(f"WARNING: Could not store the result in the cache: {e}")
+
+
+def _build_rag_query(cleaned_bullets: str, job_title: str):
+    """
+    Encode the CV queries once so both RAG stages share them.
+    Returns None on failure so each stage can still report its own error.
+    """
+    try:
+        with matcher_lease() as matcher:
+            return matcher.create_query_context(cleaned_bullets, job_title)
+    except Exception as e:
+        print(f"WARNING: Could not precompute query embeddings: {e}")
+        return None
+
+
+async def _build_rag_query_async(cleaned_bullets: str, job_title: str):
+    """Async version of _build_rag_query."""
+    try:
+        matcher = await asyncio.get_running_loop().run_in_executor(None, acquire_matcher)
+        try:
+            return await matcher.acreate_query_context(cleaned_bullets, job_title)
+        finally:
+            release_matcher(matcher)
+    except Exception as e:
+        print(f"WARNING: Could not precompute query embeddings: {e}")
+        return None
+
+
+def _with_query_context(service: Callable) -> Callable:
+    """Stage function calling a RAG service with the query context of the rag_query stage."""
+    if asyncio.iscoroutinefunction(service):
+        async def stage(cv_text: str, job_title: str, query_context):
+            return await service(cv_text, job_title, query_context=query_context)
+    else:
+        def stage(cv_text: str, job_title: str, query_context):
+            return service(cv_text, job_title, query_context=query_context)
+    return stage
+
+
+def _analysis_stages(job_title: str, cleaned_bullets: str, asynchronous: bool = False) -> List[Stage]:
+    """
+    Stages that run once the cleaned bullets are known, shared by process_cv
+    and process_cv_async. The download file and the CV query encoding are
+    independent; both RAG stages share the encoded query.
+
+    Args:
+        job_title: Target job title
+        cleaned_bullets: Cleaned CV bullets
+        asynchronous: Use the coroutine versions of the query and RAG stages
+    """
+    if asynchronous:
+        build_query, improvements, interview = (
+            _build_rag_query_async, analyze_cv_improvements_async, generate_interview_questions_async
+        )
+    else:
+        build_query, improvements, interview = (
+            _build_rag_query, analyze_cv_improvements, generate_interview_questions
+        )
+    return [
+        # Save for download
+        Stage("download", partial(_save_download, job_title, cleaned_bullets)),
+        Stage("rag_query", partial(build_query, cleaned_bullets, job_title)),
+        # Step 3 — RAG Analysis for improvements
+        Stage("improvements", partial(_with_query_context(improvements), cleaned_bullets, job_title),
+              deps=("rag_query",)),
+        # Step 4 — Generate interview questions
+        Stage("interview", partial(_with_query_context(interview), cleaned_bullets, job_title),
+              deps=("rag_query",)),
+    ]
+
+
+def _apply_stage(name: str, outcome: PipelineResult, outputs: Dict) -> bool:
+    """Copy a settled stage into the outputs; returns whether it is a shown output."""
+    if name not in outputs:
+        return False
+    if outcome.ok(name):
+        outputs[name] = outcome.results[name]
+    elif name != "download":
+        outputs[name] = _stage_message(name, outcome.errors[name])
+    return True
+
+
+def iter_process_cv(pdf_file, job_title: str, return_timings: bool = False) -> Iterator[Tuple]:
+    """
+    Main CV processing pipeline, streaming partial results (for the UI).
+    
+    The cleaned bullets are yielded while Ollama generates them: token by
+    token for short CVs, chunk by chunk for long CVs that are cleaned up in
+    parallel. After that, the download file, the improvement analysis and the
+    interview questions run as a dependency graph on a bounded executor and
+    each output is yielded as soon as its stage finishes. Each stage fails
+    on its own. Repeat requests for the same file and job title are answered
+    from the result cache.
+    
+    Args:
+        pdf_file: Uploaded PDF file (Gradio file object or path string)
+        job_title: Target job title
+        return_timings: Also yield per-stage timings (seconds) as a 5th element,
+            including "first_output" (time until the first bullet text)
+    
+    Yields:
+        Tuples of (cleaned_text, download_path, improvements, interview_questions),
+        each one more complete than the last
     """
-    Main CV processing pipeline.
+    timings: Dict[str, float] = {}
+
+    def emit(*output):
+        return output + (dict(timings),) if return_timings else output
+
+    if pdf_file is None:
+        yield emit("❌ Please upload a PDF file first.", None, "", "")
+        return
+    
+    if not job_title or job_title.strip() == "":
+        yield emit("❌ Please enter a job title.", None, "", "")
+        return
+
+    # Removes expired per-request download files in the background
+    ensure_janitor_started()
+
+    pdf_source = _pdf_source(pdf_file)
+    
+    print(f"DEBUG: PDF source = {pdf_source if isinstance(pdf_source, (str, os.PathLike)) else type(pdf_source).__name__}")
+    print(f"DEBUG: Job title = {job_title}")
+
+    started = time.perf_counter()
+    outputs = {"download": None, "improvements": PENDING_IMPROVEMENTS, "interview": PENDING_INTERVIEW}
+
+    # Same file + job title + corpus/model version → answer from the result cache
+    cache_key, cached = _cached_result(pdf_source, job_title)
+    if cached is not None:
+        timings["first_output"] = timings["total"] = time.perf_counter() - started
+        print(f"DEBUG: Result cache hit ({timings['total'] * 1000:.0f}ms)")
+        yield emit(_format_result(job_title, cached["cleaned_bullets"]),
+                   _save_download(job_title, cached["cleaned_bullets"]),
+                   cached["improvements"], cached["interview"])
+        return
+
+    try:
+        # Step 1 — Read PDF → raw text (in memory, no intermediate file)
+        raw_text = extract_pdf_text(pdf_source)
+        timings["pdf"] = time.perf_counter() - started
+
+        # Step 2 — Ollama cleanup → bullet points, shown as they are generated
+        # (long CVs are split into chunks that are cleaned up in parallel)
+        cleaned_bullets = ""
+        for chunk in stream_bullets_chunked(raw_text):
+            if not chunk:
+                continue
+            if "first_output" not in timings:
+                timings["first_output"] = time.perf_counter() - started
+                print(f"DEBUG: Time to first output: {timings['first_output'] * 1000:.0f}ms")
+            cleaned_bullets += chunk
+            yield emit(_format_result(job_title, cleaned_bullets), None,
+                       outputs["improvements"], outputs["interview"])
+        timings["bullets"] = time.perf_counter() - started - timings["pdf"]
+
+    except Exception as e:
+        error_msg = f"❌ Error processing CV: {str(e)}"
+        print(f"ERROR: {error_msg}")
+        import traceback
+        traceback.print_exc()
+        yield emit(error_msg, None, "", "")
+        return
+
+    result = _format_result(job_title, cleaned_bullets)
+
+    for name, outcome in iter_stages(_analysis_stages(job_title, cleaned_bullets), _pipeline_executor):
+        if not _apply_stage(name, outcome, outputs):
+            continue
+        timings.update(outcome.timings)
+        timings["total"] = time.perf_counter() - started
+        yield emit(result, outputs["download"], outputs["improvements"], outputs["interview"])
+
+    _store_result(cache_key, cleaned_bullets, outputs["improvements"], outputs["interview"])
+    _log_timings(timings)
+
+
+def process_cv(pdf_file, job_title: str, return_timings: bool = False) -> Tuple:
+    """
+    Main CV processing pipeline: runs iter_process_cv to completion.
     
     Args:
         pdf_file: Uploaded PDF file (Gradio file object or path string)
         job_title: Target job title
+        return_timings: Also return per-stage timings (seconds) as a 5th element
     
     Returns:
         Tuple of (cleaned_text, download_path, improvements, interview_questions)
     """
+    result = None
+    for result in iter_process_cv(pdf_file, job_title, return_timings):
+        pass
+    return result
+
+
+async def aiter_process_cv(pdf_file, job_title: str,
+                           return_timings: bool = False) -> AsyncIterator[Tuple]:
+    """
+    Async version of iter_process_cv.
+    
+    PDF parsing runs in a worker thread, Ollama is streamed through its async
+    HTTP client, and the stages after the bullets run as the same dependency
+    graph as in iter_process_cv, each output being yielded as soon as it is
+    ready. A request never holds a worker while it waits.
+    
+    Args:
+        pdf_file: Uploaded PDF file (Gradio file object or path string)
+        job_title: Target job title
+        return_timings: Also yield per-stage timings (seconds) as a 5th element,
+            including "first_output" (time until the first bullet text)
+    
+    Yields:
+        Tuples of (cleaned_text, download_path, improvements, interview_questions),
+        each one more complete than the last
+    """
+    timings: Dict[str, float] = {}
+
+    def emit(*output):
+        return output + (dict(timings),) if return_timings else output
+
     if pdf_file is None:
-        return "❌ Please upload a PDF file first.", None, "", ""
+        yield emit("❌ Please upload a PDF file first.", None, "", "")
+        return
     
     if not job_title or job_title.strip() == "":
-        return "❌ Please enter a job title.", None, "", ""
+        yield emit("❌ Please enter a job title.", None, "", "")
+        return
+
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    outputs = {"download": None, "improvements": PENDING_IMPROVEMENTS, "interview": PENDING_INTERVIEW}
 
     try:
-        # Ensure temp directory exists
-        TEMP_DIR.mkdir(exist_ok=True)
-        
-        # Temporary txt path
-        txt_path = TEMP_DIR / "cv_output.txt"
-
-        # Step 1 — Read PDF → raw text
-        pdf_path = pdf_file if isinstance(pdf_file, str) else pdf_file.name
-        
-        print(f"DEBUG: PDF path = {pdf_path}")
-        print(f"DEBUG: Job title = {job_title}")
-        
-        pdf_to_text(pdf_path, str(txt_path))
-
-        # Load raw text
-        with open(txt_path, "r", encoding="utf-8") as f:
-            raw_text = f.read()
-
-        # Step 2 — Ollama cleanup → bullet points
-        cleaned_bullets = extract_bullets_with_ollama(raw_text)
-        
-        # Add job title context to output
-        result = f"🎯 Target Job: {job_title}\n\n{'='*60}\n\n{cleaned_bullets}"
+        ensure_janitor_started()
+        pdf_source = _pdf_source(pdf_file)
 
-        # Save for download
-        output_path = TEMP_DIR / "clean_bullets.txt"
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(f"Target Job: {job_title}\n\n{cleaned_bullets}")
+        # Same file + job title + corpus/model version → answer from the result cache
+        cache_key, cached = await loop.run_in_executor(None, _cached_result, pdf_source, job_title)
+        if cached is not None:
+            output_path = await loop.run_in_executor(None, _save_download, job_title, cached["cleaned_bullets"])
+            timings["first_output"] = timings["total"] = time.perf_counter() - started
+            print(f"DEBUG: Result cache hit ({timings['total'] * 1000:.0f}ms)")
+            yield emit(_format_result(job_title, cached["cleaned_bullets"]), output_path,
+                       cached["improvements"], cached["interview"])
+            return
 
-        # Step 3 — RAG Analysis for improvements
-        improvement_analysis = analyze_cv_improvements(cleaned_bullets, job_title)
-        
-        # Step 4 — Generate interview questions
-        interview_questions = generate_interview_questions(cleaned_bullets, job_title)
+        # Step 1 — Read PDF → raw text (blocking parser, off the event loop)
+        raw_text = await loop.run_in_executor(None, extract_pdf_text, pdf_source)
+        timings["pdf"] = time.perf_counter() - started
+
+        # Step 2 — Ollama cleanup → bullet points, shown as they are generated
+        # (long CVs are split into chunks that are cleaned up in parallel)
+        cleaned_bullets = ""
+        async for chunk in stream_bullets_chunked_async(raw_text):
+            if not chunk:
+                continue
+            if "first_output" not in timings:
+                timings["first_output"] = time.perf_counter() - started
+                print(f"DEBUG: Time to first output: {timings['first_output'] * 1000:.0f}ms")
+            cleaned_bullets += chunk
+            yield emit(_format_result(job_title, cleaned_bullets), None,
+                       outputs["improvements"], outputs["interview"])
+        timings["bullets"] = time.perf_counter() - started - timings["pdf"]
 
-        return result, str(output_path), improvement_analysis, interview_questions
-        
     except Exception as e:
         error_msg = f"❌ Error processing CV: {str(e)}"
         print(f"ERROR: {error_msg}")
         import traceback
         traceback.print_exc()
-        return error_msg, None, "", ""
+        yield emit(error_msg, None, "", "")
+        return
+
+    result = _format_result(job_title, cleaned_bullets)
+
+    stages = _analysis_stages(job_title, cleaned_bullets, asynchronous=True)
+    async for name, outcome in aiter_stages(stages, _pipeline_executor):
+        if not _apply_stage(name, outcome, outputs):
+            continue
+        timings.update(outcome.timings)
+        timings["total"] = time.perf_counter() - started
+        yield emit(result, outputs["download"], outputs["improvements"], outputs["interview"])
+
+    await loop.run_in_executor(None, _store_result, cache_key, cleaned_bullets,
+                               outputs["improvements"], outputs["interview"])
+    _log_timings(timings)
+
+
+async def process_cv_async(pdf_file, job_title: str, return_timings: bool = False) -> Tuple:
+    """
+    Async version of process_cv: runs aiter_process_cv to completion.
+    
+    Args:
+        pdf_file: Uploaded PDF file (Gradio file object or path string)
+        job_title: Target job title
+        return_timings: Also return per-stage timings (seconds) as a 5th element
+    
+    Returns:
+        Tuple of (cleaned_text, download_path, improvements, interview_questions)
+    """
+    result = None
+    async for result in aiter_process_cv(pdf_file, job_title, return_timings):
+        pass
+    return result
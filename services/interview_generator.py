@@ -5,7 +5,8 @@ Generates role-specific interview questions using RAG
 
 import sys
 import os
-from typing import Optional
+import asyncio
+from typing import TYPE_CHECKING, Optional
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -13,16 +14,114 @@ parent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(parent_dir))
 sys.path.insert(0, str(parent_dir / "Rag"))
 
-from config import RAG_MIN_SIMILARITY
+from services.matcher_registry import matcher_lease, acquire_matcher, release_matcher, resolve_query_inputs
+from skill_matcher import get_skill_matcher
+from config import RAG_MIN_SIMILARITY, RAG_ADAPTIVE_SEARCH
 
+if TYPE_CHECKING:
+    from career_coach_matcher import QueryContext
 
-def get_matcher():
-    """Lazy load the matcher to avoid startup delays."""
-    from career_coach_matcher import CareerCoachMatcher
-    return CareerCoachMatcher()
+
+def _role_specific_from_skills(relevant_jobs) -> str:
+    """Role-specific questions from the skills of each job (used when no question index was built)."""
+    skill_matcher = get_skill_matcher()
+    section = ""
+    for i, job in enumerate(relevant_jobs[:2], 1):
+        section += f"### Scenario {i}:\n"
+        section += f"*Related to: {job.metadata.get('job_title', 'Unknown')}*\n\n"
+        
+        # Skills recorded at ingestion, or matched once and cached per job text
+        skills = sorted(skill_matcher.document_skills(job.text, job.metadata))
+        if skills:
+            section += f"- **Question:** Describe your experience with {', '.join(skills[:3])} related to this role\n"
+        else:
+            section += "- **Question:** Describe your experience related to this role\n"
+        section += "\n"
+    return section
+
+
+def _role_specific_from_index(relevant_jobs, question_index) -> str:
+    """Role-specific questions looked up by job id in the offline question index."""
+    merged = question_index.lookup([job.id for job in relevant_jobs])
+    if not merged["questions"]:
+        return _role_specific_from_skills(relevant_jobs)
+    
+    section = f"*Related to: {', '.join(dict.fromkeys(merged['titles']))}*\n\n"
+    for i, question in enumerate(merged["questions"], 1):
+        section += f"{i}. **{question}**\n"
+    if merged["skills"]:
+        section += f"\n**Skills to prepare:** {', '.join(merged['skills'][:8])}\n"
+    return section + "\n"
 
 
-def generate_interview_questions(cv_text: str, job_title: str, n_jobs: int = 3) -> str:
+def _build_interview_report(relevant_jobs, job_title: str, question_index=None) -> str:
+    """
+    Build the markdown interview preparation report from the relevant jobs.
+    
+    Role-specific questions come from the offline question index (a lookup
+    by job id) when it is available.
+    """
+    if not relevant_jobs:
+        return "⚠️ No relevant jobs found to generate questions."
+    
+    # Build interview questions report
+    report = f"# 🎤 INTERVIEW PREPARATION QUESTIONS\n\n"
+    report += f"**Target Job:** {job_title}\n\n"
+    report += "---\n\n"
+    
+    # General questions based on job
+    report += "## 📋 Common Interview Questions\n\n"
+    report += f"### For {job_title} Position:\n\n"
+    report += "1. **Tell me about yourself and your background**\n"
+    report += f"   - *Focus on: Your experience relevant to {job_title} role*\n\n"
+    
+    report += "2. **Why are you interested in this position?**\n"
+    report += f"   - *Highlight: Your passion for {job_title} work and company alignment*\n\n"
+    
+    report += "3. **What are your greatest strengths?**\n"
+    report += "   - *Use STAR method: Situation, Task, Action, Result*\n\n"
+    
+    report += "4. **Describe a challenging project you worked on**\n"
+    report += "   - *Emphasize: Problem-solving skills and technical expertise*\n\n"
+    
+    report += "5. **Where do you see yourself in 5 years?**\n"
+    report += f"   - *Connect: Your growth with {job_title} career path*\n\n"
+    
+    # Technical/role-specific questions based on job description
+    report += "---\n\n"
+    report += "## 🔧 Role-Specific Questions\n\n"
+    report += "*Based on similar job descriptions in our database:*\n\n"
+    
+    if question_index is not None:
+        report += _role_specific_from_index(relevant_jobs, question_index)
+    else:
+        report += _role_specific_from_skills(relevant_jobs)
+    
+    report += "---\n\n"
+    report += "## 💡 PREPARATION TIPS\n\n"
+    report += "### Before the Interview:\n"
+    report += "- ✅ Research the company thoroughly\n"
+    report += "- ✅ Prepare 3-4 STAR method examples\n"
+    report += "- ✅ Review your CV and be ready to explain gaps\n"
+    report += "- ✅ Prepare questions to ask the interviewer\n\n"
+    
+    report += "### During the Interview:\n"
+    report += "- ✅ Listen carefully to questions before answering\n"
+    report += "- ✅ Use specific examples from your experience\n"
+    report += "- ✅ Be honest about what you don't know\n"
+    report += "- ✅ Show enthusiasm for the role and company\n\n"
+    
+    report += "### Questions to Ask Them:\n"
+    report += "- What does success look like in this role?\n"
+    report += "- What are the team dynamics like?\n"
+    report += "- What are the biggest challenges facing the team?\n"
+    report += "- What opportunities for growth are available?\n"
+    
+    return report
+
+
+def generate_interview_questions(cv_text: str, job_title: str, n_jobs: int = 3,
+                                 query_context: Optional["QueryContext"] = None) -> str:
     """
     Generate interview questions based on job title using RAG.
     
@@ -30,89 +129,55 @@ def generate_interview_questions(cv_text: str, job_title: str, n_jobs: int = 3)
         cv_text: CV text content
         job_title: Target job title
         n_jobs: Number of job descriptions to analyze
+        query_context: Optional context from matcher.create_query_context()
+                       holding the precomputed query embeddings
     
     Returns:
         Formatted markdown report with interview questions and tips
     """
-    if not job_title or job_title.strip() == "":
-        job_title = "Software Engineer"
+    cv_text, job_title = resolve_query_inputs(cv_text, job_title, query_context)
     
     try:
-        # Get matcher
-        matcher = get_matcher()
-        
-        # Find relevant job descriptions
-        relevant_jobs = matcher.find_jobs_for_resume(
-            cv_text, 
-            n_results=n_jobs, 
-            min_score=RAG_MIN_SIMILARITY
-        )
-        
-        if not relevant_jobs:
-            return "⚠️ No relevant jobs found to generate questions."
-        
-        # Build interview questions report
-        report = f"# 🎤 INTERVIEW PREPARATION QUESTIONS\n\n"
-        report += f"**Target Job:** {job_title}\n\n"
-        report += "---\n\n"
-        
-        # General questions based on job
-        report += "## 📋 Common Interview Questions\n\n"
-        report += f"### For {job_title} Position:\n\n"
-        report += "1. **Tell me about yourself and your background**\n"
-        report += f"   - *Focus on: Your experience relevant to {job_title} role*\n\n"
-        
-        report += "2. **Why are you interested in this position?**\n"
-        report += f"   - *Highlight: Your passion for {job_title} work and company alignment*\n\n"
-        
-        report += "3. **What are your greatest strengths?**\n"
-        report += "   - *Use STAR method: Situation, Task, Action, Result*\n\n"
-        
-        report += "4. **Describe a challenging project you worked on**\n"
-        report += "   - *Emphasize: Problem-solving skills and technical expertise*\n\n"
-        
-        report += "5. **Where do you see yourself in 5 years?**\n"
-        report += f"   - *Connect: Your growth with {job_title} career path*\n\n"
-        
-        # Technical/role-specific questions based on job description
-        report += "---\n\n"
-        report += "## 🔧 Role-Specific Questions\n\n"
-        report += "*Based on similar job descriptions in our database:*\n\n"
+        # Get shared matcher (loaded once per process, kept open across a reload)
+        with matcher_lease() as matcher:
+            # Find relevant job descriptions
+            relevant_jobs = matcher.find_jobs_for_resume(
+                cv_text, 
+                n_results=n_jobs, 
+                min_score=RAG_MIN_SIMILARITY,
+                query_context=query_context,
+                adaptive=RAG_ADAPTIVE_SEARCH
+            )
         
-        for i, job in enumerate(relevant_jobs[:2], 1):
-            job_desc = job.text[:300]
-            report += f"### Scenario {i}:\n"
-            report += f"*Related to: {job.metadata.get('job_title', 'Unknown')}*\n\n"
-            
-            # Extract key skills/topics from job description
-            keywords = ['experience', 'skills', 'requirements', 'responsibilities']
-            for keyword in keywords:
-                if keyword.lower() in job_desc.lower():
-                    report += f"- **Question:** Describe your {keyword} related to this role\n"
-                    break
-            report += "\n"
+            return _build_interview_report(relevant_jobs, job_title, matcher.get_question_index())
         
-        report += "---\n\n"
-        report += "## 💡 PREPARATION TIPS\n\n"
-        report += "### Before the Interview:\n"
-        report += "- ✅ Research the company thoroughly\n"
-        report += "- ✅ Prepare 3-4 STAR method examples\n"
-        report += "- ✅ Review your CV and be ready to explain gaps\n"
-        report += "- ✅ Prepare questions to ask the interviewer\n\n"
-        
-        report += "### During the Interview:\n"
-        report += "- ✅ Listen carefully to questions before answering\n"
-        report += "- ✅ Use specific examples from your experience\n"
-        report += "- ✅ Be honest about what you don't know\n"
-        report += "- ✅ Show enthusiasm for the role and company\n\n"
-        
-        report += "### Questions to Ask Them:\n"
-        report += "- What does success look like in this role?\n"
-        report += "- What are the team dynamics like?\n"
-        report += "- What are the biggest challenges facing the team?\n"
-        report += "- What opportunities for growth are available?\n"
+    except Exception as e:
+        return f"❌ Error generating questions: {str(e)}"
+
+
+async def generate_interview_questions_async(cv_text: str, job_title: str, n_jobs: int = 3,
+                                             query_context: Optional["QueryContext"] = None) -> str:
+    """
+    Async version of generate_interview_questions.
+    Encoding and the vector query run on the matcher's bounded executors.
+    """
+    cv_text, job_title = resolve_query_inputs(cv_text, job_title, query_context)
+    
+    try:
+        # Loading the shared matcher may block on first use
+        matcher = await asyncio.get_running_loop().run_in_executor(None, acquire_matcher)
+        try:
+            relevant_jobs = await matcher.afind_jobs_for_resume(
+                cv_text, 
+                n_results=n_jobs, 
+                min_score=RAG_MIN_SIMILARITY,
+                query_context=query_context,
+                adaptive=RAG_ADAPTIVE_SEARCH
+            )
         
-        return report
+            return _build_interview_report(relevant_jobs, job_title, matcher.get_question_index())
+        finally:
+            release_matcher(matcher)
         
     except Exception as e:
         return f"❌ Error generating questions: {str(e)}"
@@ -0,0 +1,241 @@
+"""
+Matcher Registry
+Process-wide, thread-safe access to one shared CareerCoachMatcher
+"""
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
+from pathlib import Path
+
+# Add parent directory to path for imports
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(parent_dir / "Rag"))
+
+from config import (
+    RAG_VECTOR_BACKEND, EMBEDDING_BACKEND,
+    EMBEDDING_MICRO_BATCHING, EMBEDDING_MAX_BATCH_SIZE, EMBEDDING_MAX_WAIT_MS
+)
+
+if TYPE_CHECKING:
+    from career_coach_matcher import QueryContext
+
+DEFAULT_JOB_TITLE = "Software Engineer"
+
+
+class MatcherRegistry:
+    """
+    Holds a single CareerCoachMatcher per process.
+
+    The matcher (embedding model + ChromaDB client) is created on first use
+    and handed out to every caller afterwards, so all services and Gradio
+    worker threads share one loaded model.
+
+    Callers that may overlap a reload() or close() take a lease (lease() or
+    acquire()/release()). A replaced matcher is only closed once its last
+    lease is released, so in-flight requests finish on the matcher they
+    started with.
+    """
+
+    def __init__(self, factory: Optional[Callable] = None):
+        """
+        Initialize an empty registry.
+
+        Args:
+            factory: Optional callable that builds the matcher
+                     (defaults to CareerCoachMatcher with the configured backends)
+        """
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._matcher = None
+        self._leases: Dict[int, int] = {}  # id(matcher) -> active leases
+        self._retired: Dict[int, object] = {}  # Replaced matchers waiting for their leases
+        self.load_count = 0
+        self.reuse_count = 0
+        self.close_count = 0
+        self.last_load_seconds = 0.0
+        self.total_load_seconds = 0.0
+
+    def _create(self):
+        """Build a new matcher instance."""
+        if self._factory is not None:
+            return self._factory()
+        from career_coach_matcher import CareerCoachMatcher
+        return CareerCoachMatcher(
+            backend=RAG_VECTOR_BACKEND,
+            embedding_backend=EMBEDDING_BACKEND,
+            micro_batching=EMBEDDING_MICRO_BATCHING,
+            max_batch_size=EMBEDDING_MAX_BATCH_SIZE,
+            max_wait_ms=EMBEDDING_MAX_WAIT_MS
+        )
+
+    def _load_locked(self):
+        """Load the matcher. Caller must hold the lock."""
+        start = time.perf_counter()
+        matcher = self._create()
+        elapsed = time.perf_counter() - start
+        self._retire_locked()
+        self._matcher = matcher
+
+        self.load_count += 1
+        self.last_load_seconds = elapsed
+        self.total_load_seconds += elapsed
+        print(f"✓ Shared matcher loaded in {elapsed:.2f}s (load #{self.load_count})")
+
+    def _close_matcher_locked(self, matcher):
+        """Close a matcher that is no longer handed out. Caller must hold the lock."""
+        close = getattr(matcher, "close", None)
+        if close is not None:
+            close()
+        self.close_count += 1
+
+    def _retire_locked(self):
+        """
+        Stop handing out the current matcher; it is closed now if no lease
+        holds it, otherwise when the last lease is released. Caller must hold the lock.
+        """
+        matcher, self._matcher = self._matcher, None
+        if matcher is None:
+            return
+        if self._leases.get(id(matcher)):
+            self._retired[id(matcher)] = matcher
+        else:
+            self._close_matcher_locked(matcher)
+
+    def _get_locked(self):
+        if self._matcher is None:
+            self._load_locked()
+        else:
+            self.reuse_count += 1
+        return self._matcher
+
+    def get(self):
+        """
+        Return the shared matcher, loading it on first use.
+        Not protected against a concurrent reload(); use lease() in request handlers.
+        """
+        with self._lock:
+            return self._get_locked()
+
+    def acquire(self):
+        """Return the shared matcher and keep it open until release() is called."""
+        with self._lock:
+            matcher = self._get_locked()
+            self._leases[id(matcher)] = self._leases.get(id(matcher), 0) + 1
+            return matcher
+
+    def release(self, matcher):
+        """Release a lease taken with acquire(); closes a replaced matcher after its last lease."""
+        with self._lock:
+            key = id(matcher)
+            remaining = self._leases.get(key, 0) - 1
+            if remaining > 0:
+                self._leases[key] = remaining
+                return
+            self._leases.pop(key, None)
+            retired = self._retired.pop(key, None)
+            if retired is not None:
+                self._close_matcher_locked(retired)
+
+    @contextmanager
+    def lease(self):
+        """Context manager around acquire() / release()."""
+        matcher = self.acquire()
+        try:
+            yield matcher
+        finally:
+            self.release(matcher)
+
+    def close(self):
+        """Release the shared matcher. The next get() loads a fresh one."""
+        with self._lock:
+            self._retire_locked()
+
+    def reload(self):
+        """
+        Load a new matcher and hand it out from now on. The previous one is
+        closed once the requests holding a lease on it have finished.
+        """
+        with self._lock:
+            self._load_locked()
+            return self._matcher
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether a matcher is currently held."""
+        return self._matcher is not None
+
+    def stats(self) -> Dict:
+        """Get load/reuse counters for monitoring."""
+        with self._lock:
+            return {
+                "loaded": self._matcher is not None,
+                "active_leases": sum(self._leases.values()),
+                "retired_waiting": len(self._retired),
+                "load_count": self.load_count,
+                "reuse_count": self.reuse_count,
+                "close_count": self.close_count,
+                "last_load_seconds": round(self.last_load_seconds, 3),
+                "total_load_seconds": round(self.total_load_seconds, 3),
+            }
+
+
+# Process-wide registry used by all services
+_registry = MatcherRegistry()
+
+
+def get_matcher():
+    """Get the process-wide shared matcher (loaded once, on first use)."""
+    return _registry.get()
+
+
+def matcher_lease():
+    """Context manager holding the shared matcher open across a reload."""
+    return _registry.lease()
+
+
+def acquire_matcher():
+    """Get the shared matcher with a lease (pair with release_matcher)."""
+    return _registry.acquire()
+
+
+def release_matcher(matcher):
+    """Release a lease taken with acquire_matcher()."""
+    _registry.release(matcher)
+
+
+def close_matcher():
+    """Release the shared matcher and its model/database handles."""
+    _registry.close()
+
+
+def reload_matcher():
+    """Reload the shared matcher, e.g. after re-ingesting the collections."""
+    return _registry.reload()
+
+
+def get_registry_stats() -> Dict:
+    """Get load-time and reuse counters of the shared matcher."""
+    return _registry.stats()
+
+
+def resolve_query_inputs(cv_text: str, job_title: str,
+                         query_context: Optional["QueryContext"] = None) -> Tuple[str, str]:
+    """
+    CV text and job title for a RAG service call.
+
+    Missing values are taken from the query context, and an empty job
+    title falls back to DEFAULT_JOB_TITLE.
+
+    Returns:
+        (cv_text, job_title)
+    """
+    if query_context is not None:
+        cv_text = cv_text or query_context.cv_text
+        job_title = job_title or query_context.job_title
+    if not job_title or job_title.strip() == "":
+        job_title = DEFAULT_JOB_TITLE
+    return cv_text, job_title
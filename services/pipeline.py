@@ -0,0 +1,212 @@
+"""
+Stage Pipeline
+Runs processing stages as a small dependency graph on a bounded executor
+"""
+
+import asyncio
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+@dataclass
+class Stage:
+    """
+    One unit of work; func receives the results of deps, in order.
+    aiter_stages() awaits coroutine functions instead of using the executor.
+    """
+    name: str
+    func: Callable[..., Any]
+    deps: Tuple[str, ...] = ()
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of a pipeline run."""
+    results: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)  # seconds per stage
+    total_seconds: float = 0.0
+
+    def ok(self, name: str) -> bool:
+        """Whether a stage finished without error."""
+        return name in self.results
+
+
+def _check_stages(stages: List[Stage]) -> Dict[str, Stage]:
+    """Stages by name; raises ValueError for unknown dependencies."""
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        unknown = [dep for dep in stage.deps if dep not in by_name]
+        if unknown:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s): {unknown}")
+    return by_name
+
+
+def _ready_stages(pending: Dict[str, Stage], outcome: PipelineResult) -> Iterator[Tuple[Stage, Optional[list]]]:
+    """
+    Take the stages that can be decided now out of pending.
+
+    Yields (stage, args) for stages whose dependencies all finished and
+    (stage, None) for stages that are skipped because a dependency failed
+    (already recorded in outcome.errors).
+    """
+    for name, stage in list(pending.items()):
+        failed = [dep for dep in stage.deps if dep in outcome.errors]
+        if failed:
+            outcome.errors[name] = f"skipped: dependency '{failed[0]}' failed"
+            del pending[name]
+            yield stage, None
+        elif all(dep in outcome.results for dep in stage.deps):
+            del pending[name]
+            yield stage, [outcome.results[dep] for dep in stage.deps]
+
+
+def _record_failure(outcome: PipelineResult, name: str, error: Exception):
+    outcome.errors[name] = str(error)
+    print(f"ERROR: Stage '{name}' failed: {error}")
+    traceback.print_exception(type(error), error, error.__traceback__)
+
+
+def run_stages(stages: List[Stage], executor: ThreadPoolExecutor) -> PipelineResult:
+    """
+    Run stages as soon as their dependencies have finished.
+
+    Independent stages run concurrently, so the total time is the critical
+    path rather than the sum of the stages. A failing stage only affects
+    the stages that depend on it: those are skipped and reported as errors.
+
+    Args:
+        stages: Stages to run (dependencies must refer to stage names in the list)
+        executor: Bounded executor to run the stages on
+
+    Returns:
+        PipelineResult with per-stage results, errors and timings
+    """
+    outcome = PipelineResult()
+    for _ in iter_stages(stages, executor, outcome):
+        pass
+    return outcome
+
+
+def iter_stages(stages: List[Stage], executor: ThreadPoolExecutor,
+                outcome: PipelineResult = None) -> Iterator[Tuple[str, PipelineResult]]:
+    """
+    Run stages like run_stages(), yielding each stage as soon as it settles.
+
+    Lets callers show partial results while slower stages are still running.
+
+    Args:
+        stages: Stages to run (dependencies must refer to stage names in the list)
+        executor: Bounded executor to run the stages on
+        outcome: Result object to fill in (a new one by default)
+
+    Yields:
+        (stage name, outcome so far) once the stage finished, failed or was skipped
+    """
+    outcome = outcome if outcome is not None else PipelineResult()
+    pending = _check_stages(stages)
+    running = {}
+    started = time.perf_counter()
+
+    def timed(stage: Stage, args: list):
+        stage_start = time.perf_counter()
+        try:
+            return stage.func(*args)
+        finally:
+            outcome.timings[stage.name] = time.perf_counter() - stage_start
+
+    while pending or running:
+        # Skip stages whose dependencies failed; submit the ready ones
+        for stage, args in _ready_stages(pending, outcome):
+            if args is None:
+                yield stage.name, outcome
+            else:
+                running[executor.submit(timed, stage, args)] = stage.name
+
+        if not running:
+            if pending:
+                raise ValueError(f"Dependency cycle between stages: {sorted(pending)}")
+            break
+
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = running.pop(future)
+            try:
+                outcome.results[name] = future.result()
+            except Exception as e:
+                _record_failure(outcome, name, e)
+            outcome.total_seconds = time.perf_counter() - started
+            yield name, outcome
+
+    outcome.total_seconds = time.perf_counter() - started
+
+
+async def aiter_stages(stages: List[Stage], executor: Optional[ThreadPoolExecutor] = None,
+                       outcome: PipelineResult = None) -> AsyncIterator[Tuple[str, PipelineResult]]:
+    """
+    Async version of iter_stages() for callers running on an event loop.
+
+    Coroutine functions are awaited on the loop; other stage functions run
+    on the executor (the loop's default executor if None), so no stage
+    blocks the loop.
+
+    Args:
+        stages: Stages to run (dependencies must refer to stage names in the list)
+        executor: Executor for the blocking stages
+        outcome: Result object to fill in (a new one by default)
+
+    Yields:
+        (stage name, outcome so far) once the stage finished, failed or was skipped
+    """
+    outcome = outcome if outcome is not None else PipelineResult()
+    pending = _check_stages(stages)
+    running = {}
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+
+    async def timed(stage: Stage, args: list):
+        stage_start = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(stage.func):
+                return await stage.func(*args)
+            return await loop.run_in_executor(executor, stage.func, *args)
+        finally:
+            outcome.timings[stage.name] = time.perf_counter() - stage_start
+
+    try:
+        while pending or running:
+            for stage, args in _ready_stages(pending, outcome):
+                if args is None:
+                    yield stage.name, outcome
+                else:
+                    running[asyncio.ensure_future(timed(stage, args))] = stage.name
+
+            if not running:
+                if pending:
+                    raise ValueError(f"Dependency cycle between stages: {sorted(pending)}")
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = running.pop(task)
+                try:
+                    outcome.results[name] = task.result()
+                except Exception as e:
+                    _record_failure(outcome, name, e)
+                outcome.total_seconds = time.perf_counter() - started
+                yield name, outcome
+    finally:
+        # Abandoned iteration (e.g. the client went away): do not leave stages running
+        for task in running:
+            task.cancel()
+
+    outcome.total_seconds = time.perf_counter() - started
+
+
+def format_timings(outcome: PipelineResult) -> str:
+    """One-line summary of stage timings for logging."""
+    parts = [f"{name}={seconds * 1000:.0f}ms" for name, seconds in outcome.timings.items()]
+    return f"total={outcome.total_seconds * 1000:.0f}ms " + " ".join(parts)
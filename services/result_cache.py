@@ -0,0 +1,246 @@
+"""
+Result Cache
+End-to-end cache of process_cv results keyed by uploaded file content,
+normalized job title and corpus/model version
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Add parent directory to path for imports
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(parent_dir / "Rag"))
+
+from config import (
+    EMBEDDING_MODEL, EMBEDDING_BACKEND,
+    RESULT_CACHE_ENABLED, RESULT_CACHE_BACKEND, RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_PATH,
+)
+from Backend.utils.bullet_extractor import BULLET_PROMPT_VERSION
+from Backend.utils.ollama_client import get_ollama_client
+
+# Bump when the reports built from a result change format
+RESULT_FORMAT_VERSION = "1"
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def hash_upload(source) -> str:
+    """
+    SHA-256 of an uploaded PDF.
+
+    Args:
+        source: Path, raw bytes or binary file-like object (position is restored)
+
+    Returns:
+        Hex digest of the file content
+    """
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+    elif hasattr(source, "read"):
+        position = source.tell()
+        for block in iter(lambda: source.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+        source.seek(position)
+    else:
+        with open(os.fspath(source), "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def normalize_job_title(job_title: str) -> str:
+    """Case- and whitespace-insensitive form of a job title."""
+    return re.sub(r"\s+", " ", job_title).strip().lower()
+
+
+class MemoryResultStore:
+    """In-process LRU store."""
+
+    def __init__(self, max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, value: Dict, version: str):
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def purge(self, version: str) -> int:
+        """Remove entries of other versions; returns how many were removed."""
+        with self._lock:
+            stale = [key for key, (entry_version, _) in self._entries.items() if entry_version != version]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteResultStore:
+    """SQLite store, shared by all worker processes on one host."""
+
+    def __init__(self, path: str = RESULT_CACHE_PATH, max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self.path = str(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")  # Readers in other workers do not block writers
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, version TEXT NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return json.loads(row[0])
+
+    def put(self, key: str, value: Dict, version: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, version, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), version, time.time())
+            )
+            # Keep only the most recently used entries
+            self._conn.execute(
+                "DELETE FROM results WHERE key NOT IN "
+                "(SELECT key FROM results ORDER BY last_access DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def purge(self, version: str) -> int:
+        """Remove entries of other versions; returns how many were removed."""
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM results WHERE version != ?", (version,)).rowcount
+            self._conn.commit()
+            return removed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+class ResultCache:
+    """
+    Cache in front of process_cv.
+
+    Keys combine the uploaded file hash, the normalized job title and a
+    version string of the models, prompt and corpus. The corpus part is the
+    collection stats generation, which changes whenever the Chroma
+    collections are (re-)ingested; entries of older versions are purged
+    when that happens.
+    """
+
+    def __init__(self, store=None):
+        """
+        Args:
+            store: MemoryResultStore or SqliteResultStore (defaults to RESULT_CACHE_BACKEND)
+        """
+        if store is None:
+            store = SqliteResultStore() if RESULT_CACHE_BACKEND == "sqlite" else MemoryResultStore()
+        self.store = store
+        self._stats = None
+        self._version = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def version(self) -> str:
+        """Current model/prompt/corpus version; purges older entries when it changed."""
+        with self._lock:
+            if self._stats is None:
+                from collection_stats import CollectionStats
+                self._stats = CollectionStats()
+            self._stats.refresh()
+
+            llm = get_ollama_client()
+            version = (
+                f"{RESULT_FORMAT_VERSION}|{llm.model}|{json.dumps(llm.cache_options, sort_keys=True)}|"
+                f"prompt-{BULLET_PROMPT_VERSION}|{EMBEDDING_MODEL}@{EMBEDDING_BACKEND}|"
+                f"corpus-{self._stats.generation}"
+            )
+            if version != self._version:
+                self.invalidations += int(self.store.purge(version) > 0)
+            self._version = version
+            return version
+
+    def make_key(self, pdf_source, job_title: str) -> str:
+        """Build the cache key of a request."""
+        digest = hashlib.sha256()
+        for part in (hash_upload(pdf_source), normalize_job_title(job_title), self.version()):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Look up a cached result."""
+        value = self.store.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: Dict):
+        """Store a result under the current version."""
+        self.store.put(key, value, self._version or self.version())
+
+    def stats(self) -> Dict:
+        """Get hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.store).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "entries": len(self.store),
+            "version": self._version,
+        }
+
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Get the process-wide result cache (None if disabled)."""
+    global _cache
+    if not RESULT_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache()
+        return _cache
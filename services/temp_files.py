@@ -0,0 +1,127 @@
+"""
+Per-Request Temp Files
+Unique download paths per request plus a TTL-based janitor that removes
+expired request directories
+"""
+
+import os
+import shutil
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import TEMP_DIR, TEMP_FILE_TTL_SECONDS, TEMP_JANITOR_INTERVAL_SECONDS
+
+# Request artifacts live in their own subdirectory so the janitor never
+# touches other files kept in TEMP_DIR
+REQUESTS_DIR = TEMP_DIR / "requests"
+
+
+def create_request_path(filename: str) -> Path:
+    """
+    Get a unique path for a per-request artifact.
+
+    Each request gets its own directory, so the file keeps a readable name
+    for download while concurrent users never share a path.
+
+    Args:
+        filename: File name shown to the user (e.g. "clean_bullets.txt")
+
+    Returns:
+        Path inside a fresh request directory
+    """
+    request_dir = REQUESTS_DIR / f"{int(time.time())}_{uuid.uuid4().hex}"
+    request_dir.mkdir(parents=True, exist_ok=True)
+    return request_dir / filename
+
+
+def cleanup_expired(directory: Path = REQUESTS_DIR, ttl_seconds: float = TEMP_FILE_TTL_SECONDS) -> int:
+    """
+    Remove request entries older than the TTL.
+
+    Args:
+        directory: Directory holding request folders/files
+        ttl_seconds: Maximum age based on last modification time
+
+    Returns:
+        Number of entries removed
+    """
+    if not directory.exists():
+        return 0
+
+    cutoff = time.time() - ttl_seconds
+    removed = 0
+    for entry in directory.iterdir():
+        try:
+            if entry.stat().st_mtime >= cutoff:
+                continue
+            if entry.is_dir():
+                shutil.rmtree(entry)
+            else:
+                entry.unlink()
+            removed += 1
+        except FileNotFoundError:
+            continue  # Removed concurrently
+        except OSError as e:
+            print(f"WARNING: Could not remove temp entry {entry}: {e}")
+    return removed
+
+
+class TempFileJanitor:
+    """Background thread that periodically removes expired request files."""
+
+    def __init__(self, directory: Path = REQUESTS_DIR, ttl_seconds: float = TEMP_FILE_TTL_SECONDS,
+                 interval_seconds: float = TEMP_JANITOR_INTERVAL_SECONDS):
+        """
+        Args:
+            directory: Directory to clean
+            ttl_seconds: Maximum age of an entry
+            interval_seconds: Time between cleanup passes
+        """
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.interval_seconds = interval_seconds
+        self.removed_total = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> int:
+        """Run one cleanup pass."""
+        removed = cleanup_expired(self.directory, self.ttl_seconds)
+        self.removed_total += removed
+        return removed
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval_seconds)
+
+    def start(self):
+        """Start the background thread (no-op if running)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="temp-janitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+_janitor = TempFileJanitor()
+_janitor_lock = threading.Lock()
+
+
+def ensure_janitor_started():
+    """Start the process-wide janitor on first use."""
+    with _janitor_lock:
+        _janitor.start()